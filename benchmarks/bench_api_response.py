@@ -0,0 +1,98 @@
+"""
+Requests per second of a /schedule/ cache hit answered through the response model, as it was before (the cached
+schedules are loaded, converted with as_dict, then validated and serialized by FastAPI), against the cached encoded
+response sent as an EncodedJSONResponse. Both routes run on the same app, in process, under concurrent requests.
+
+Usage: python -m benchmarks.bench_api_response
+"""
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from src.api.models.schedule_request import ScheduleRequest
+from src.api.models.schedule_response import ScheduleResponse
+from src.api.responses import EncodedJSONResponse
+from src.lib.cache.ttl_cache import Cache
+from src.lib.scraper.schedule import ScheduleGroup
+
+from benchmarks.utils import make_schedule_group
+
+SIZES: tuple[int, ...] = (10, 50, 200)  # Courses per year.
+YEARS: int = 4
+REQUESTS: int = 200
+CONCURRENCY: int = 16
+BODY: dict = {"course_name": "Licenciatura Sintetica", "course_semester": 1, "course_years": 0}
+
+
+def make_app(cache: Cache) -> FastAPI:
+    """
+    Creates an app with both versions of the /schedule/ route, served from the given cache.
+    """
+    app: FastAPI = FastAPI()
+
+    @app.post("/model/", response_model=ScheduleResponse)
+    async def with_model(body: ScheduleRequest) -> ScheduleResponse:
+        schedules: ScheduleGroup = cache.get(key=body.cache_key)
+
+        return ScheduleResponse(
+            course_name=body.course_name,
+            course_date=body.course_date,
+            schedules=schedules.as_dict(),
+            shifts=schedules.shifts
+        )
+
+    @app.post("/encoded/", response_model=ScheduleResponse)
+    async def encoded(body: ScheduleRequest) -> EncodedJSONResponse:
+        encoded_schedules: bytes = cache.get(key=f"{body.cache_key}.json")
+        return EncodedJSONResponse(ScheduleResponse.encode(body.course_name, body.course_date, encoded_schedules))
+
+    return app
+
+
+async def load(client: httpx.AsyncClient, path: str) -> float:
+    """
+    Sends the requests to a route, at most CONCURRENCY at a time, returning the requests per second.
+    """
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def request() -> None:
+        async with semaphore:
+            response: httpx.Response = await client.post(path, json=BODY)
+            response.raise_for_status()
+
+    await request()  # Warm up.
+
+    start: float = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(REQUESTS)))
+
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def run() -> None:
+    courses: int
+    for courses in SIZES:
+        group: ScheduleGroup = make_schedule_group(YEARS, courses, course_name=BODY["course_name"])
+        key: str = ScheduleRequest(**BODY).cache_key
+
+        cache: Cache = Cache()
+        cache.set(key, group)
+        cache.set(f"{key}.json", ScheduleResponse.encode_schedules(group))
+
+        transport: httpx.ASGITransport = httpx.ASGITransport(app=make_app(cache))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            before: float = await load(client, "/model/")
+            after: float = await load(client, "/encoded/")
+
+        events: int = sum(len(schedule.get_events()) for schedule in group.years.values())
+        print(f"{events:>6} events | model {before:8.1f} req/s | encoded {after:8.1f} req/s | {after / before:6.1f}x")
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Wall time of building every format one after the other against a BundleBuilder on a thread pool and on a process
+pool. Builders are CPU bound, so threads only help as much as the builders release the GIL, and processes only help
+when there are spare cores (the schedule is also pickled to each worker), the results depend on the machine.
+
+Usage: python -m benchmarks.bench_bundle
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable
+
+from src.lib.builder.builder_factory import BuilderFactory
+from src.lib.builder.bundle.bundle_builder import BundleBuilder
+from src.lib.builder.ical.ical_builder import IcalBuilder
+from src.lib.builder.json.json_builder import JsonBuilder
+from src.lib.builder.xlsx.xlsx_builder import XlsxBuilder
+from src.lib.scraper.schedule import Schedule
+
+from benchmarks.utils import make_schedule_group
+
+YEARS: int = 4
+COURSES: int = 100  # Per year.
+FORMATS: list[str] = ["xlsx", "ics", "json"]
+
+
+def measure_once(func: Callable[[], bytes]) -> tuple[float, int]:
+    """
+    Runs a build once, returning how long it took and the size of the result.
+    """
+    start: float = time.perf_counter()
+    size: int = len(func())
+    return time.perf_counter() - start, size
+
+
+def main() -> None:
+    schedules: list[Schedule] = list(make_schedule_group(YEARS, COURSES).years.values())
+    print(f"{sum(len(schedule.get_events()) for schedule in schedules)} events, {os.cpu_count()} cores")
+
+    factory: BuilderFactory = BuilderFactory()
+    factory.register_builder("xlsx", XlsxBuilder)
+    factory.register_builder("ics", IcalBuilder)
+    factory.register_builder("json", JsonBuilder)
+
+    elapsed, size = measure_once(lambda: b"".join(factory.create(fmt, schedule=schedules).build() for fmt in FORMATS))
+    print(f"sequential      {elapsed * 1000:8.1f} ms | {size / 1024:8.1f} KiB (uncompressed)")
+
+    executors: dict[str, Callable[[], Executor]] = {
+        "threads": lambda: ThreadPoolExecutor(max_workers=len(FORMATS)),
+        "processes": lambda: ProcessPoolExecutor(
+            max_workers=len(FORMATS), mp_context=multiprocessing.get_context("spawn")
+        ),
+    }
+
+    name: str
+    make: Callable[[], Executor]
+    for name, make in executors.items():
+        with make() as executor:
+            # The first bundle also starts the workers.
+            BundleBuilder(schedules, FORMATS, factory, executor=executor).build()
+
+            elapsed, size = measure_once(lambda: BundleBuilder(schedules, FORMATS, factory, executor=executor).build())
+            print(f"bundle {name:<9}{elapsed * 1000:8.1f} ms | {size / 1024:8.1f} KiB (zip)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Memory and time measurements for the event model over large schedule groups.
+
+Usage: python -m benchmarks.bench_event
+"""
+
+from src.lib.scraper.interval_index import IntervalIndex
+from src.lib.scraper.schedule import ScheduleGroup
+
+from benchmarks.utils import make_schedule_group, measure_memory, measure_time
+
+SIZES: tuple[int, ...] = (100, 1_000, 5_000)  # Courses per year.
+YEARS: int = 4
+
+
+def main() -> None:
+    courses: int
+    for courses in SIZES:
+        group: ScheduleGroup
+        group, allocated = measure_memory(lambda: make_schedule_group(YEARS, courses))
+        event_count: int = sum(len(schedule.get_events()) for schedule in group.years.values())
+
+        build_time: float = measure_time(lambda: make_schedule_group(YEARS, courses), repeat=3)
+        as_dict_time: float = measure_time(group.as_dict)
+        collisions_time: float = measure_time(
+            lambda: [IntervalIndex(events)
+                     for schedule in group.years.values() for events in schedule.schedule.values()]
+        )
+
+        print(f"{event_count:>8} events | {allocated / event_count:8.1f} B/event | "
+              f"build {build_time * 1000:9.2f} ms | as_dict {as_dict_time * 1000:9.2f} ms | "
+              f"collisions {collisions_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
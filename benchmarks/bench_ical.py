@@ -0,0 +1,34 @@
+"""
+Build time of the streaming iCalendar writer against the icalendar object model, over growing schedules.
+
+Usage: python -m benchmarks.bench_ical
+"""
+
+from src.lib.builder.ical.ical_builder import IcalBuilder
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+
+from benchmarks.utils import make_schedule_group, measure_time
+
+SIZES: tuple[int, ...] = (10, 100, 1_000)  # Courses per year.
+YEARS: int = 4
+
+
+def main() -> None:
+    courses: int
+    for courses in SIZES:
+        group: ScheduleGroup = make_schedule_group(YEARS, courses)
+        schedules: list[Schedule] = list(group.years.values())
+        builder: IcalBuilder = IcalBuilder(schedules)
+
+        event_count: int = len(builder.schedule.get_events())
+        repeat: int = 5 if event_count < 10_000 else 2
+
+        writer_time: float = measure_time(builder.build, repeat=repeat)
+        icalendar_time: float = measure_time(lambda: builder.to_calendar().to_ical(), repeat=repeat)
+
+        print(f"{event_count:>7} events | IcalWriter {writer_time * 1000:9.1f} ms | "
+              f"icalendar {icalendar_time * 1000:9.1f} ms | {icalendar_time / writer_time:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
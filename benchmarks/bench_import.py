@@ -0,0 +1,80 @@
+"""
+Startup time of the entry points, measured as the import time of their modules on a fresh interpreter, along with
+the slowest packages they import according to python -X importtime. Importing the API routes also creates the
+scraper (and its browser), so an API worker is represented by the modules the routes import.
+
+Usage: python -m benchmarks.bench_import
+"""
+
+import subprocess
+import sys
+
+MODULES: dict[str, str] = {
+    "cli": "src.cli.shifter",
+    "main": "src.main",
+    "worker": ", ".join((
+        "fastapi",
+        "src.api.models.convert_request",
+        "src.api.models.schedule_response",
+        "src.api.models.solve_response",
+        "src.api.responses",
+        "src.lib.builder.builder_factory",
+        "src.lib.builder.bundle.bundle_builder",
+        "src.lib.cache.ttl_cache",
+        "src.lib.scraper.scraper",
+        "src.lib.solver.shift_solver",
+    )),
+}
+REPEAT: int = 5
+TOP: int = 5
+HEAVY: tuple[str, ...] = ("selenium", "xlsxwriter", "icalendar", "pytz")  # Only needed to scrape or to build.
+
+
+def import_time(modules: str) -> tuple[int, list[tuple[int, str]], list[str]]:
+    """
+    Imports modules on a fresh interpreter.
+    :return: The total import time in microseconds, the cumulative time of each imported package (at any depth) and
+        the heavy packages that were imported. The imports of the interpreter startup are left out.
+    """
+    result: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modules}"],
+        capture_output=True, text=True, check=True,
+    )
+
+    lines: list[tuple[int, str]] = []
+
+    line: str
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            lines.append((int(cumulative), name[1:]))  # The name is indented by its depth.
+
+    # The startup imports (site, encodings, ...) come first, up to the last top level import that isn't requested.
+    requested: set[str] = {module.strip().split(".")[0] for module in modules.split(",")}
+    start: int = max(
+        (i + 1 for i, (_, name) in enumerate(lines) if not name.startswith(" ") and name.split(".")[0] not in requested),
+        default=0,
+    )
+    lines = lines[start:]
+
+    total: int = sum(cumulative for cumulative, name in lines if not name.startswith(" "))
+    packages: list[tuple[int, str]] = [(cumulative, name.strip()) for cumulative, name in lines if "." not in name]
+    heavy: list[str] = [name.strip() for _, name in lines if name.strip() in HEAVY]
+
+    return total, sorted(packages, reverse=True), heavy
+
+
+def main() -> None:
+    name: str
+    modules: str
+    for name, modules in MODULES.items():
+        runs: list[tuple[int, list[tuple[int, str]], list[str]]] = [import_time(modules) for _ in range(REPEAT)]
+        total, packages, heavy = min(runs)
+
+        print(f"{name:<7} {total / 1000:8.1f} ms | heavy: {', '.join(heavy) or 'none'} | slowest: " + ", ".join(
+            f"{package} {time / 1000:.1f} ms" for time, package in packages[:TOP]
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Encoding time of the schedule json encoder against the previous json.dumps path (ScheduleEvent.as_dict, datetimes
+formatted by a default function), for both backends, and of a /schedule/ response built through the Pydantic model
+against one assembled from the cached encoded schedules.
+
+Usage: python -m benchmarks.bench_json
+"""
+
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+import src.lib.builder.json.schedule_encoder as schedule_encoder
+from src.api.models.schedule_response import ScheduleResponse
+from src.lib.builder.json.schedule_encoder import ScheduleEncoder
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+
+from benchmarks.utils import make_schedule_group, measure_time
+
+SIZES: tuple[int, ...] = (10, 100, 1_000)  # Courses per year.
+YEARS: int = 4
+COURSE_NAME: str = "Licenciatura Sintetica"
+COURSE_DATE: str = "01-11-2023"
+
+
+def serialize_unknown_obj(obj: Any) -> str:
+    """
+    The default function of the previous encoding, datetimes are formatted as HH:MM.
+    """
+    if isinstance(obj, datetime):
+        return obj.time().strftime("%H:%M")
+
+    return str(obj)
+
+
+def as_dict(schedule: Schedule) -> dict:
+    """
+    The events of each weekday as dictionaries, as the previous encoding obtained them.
+    """
+    return {weekday: [event.as_dict() for event in schedule.schedule[weekday]] for weekday in schedule.weekdays}
+
+
+def previous_response(group: ScheduleGroup) -> bytes:
+    """
+    The previous /schedule/ response, the model is built, validated and serialized by FastAPI.
+    """
+    model: ScheduleResponse = ScheduleResponse(
+        course_name=COURSE_NAME,
+        course_date=COURSE_DATE,
+        schedules={year: as_dict(schedule) for year, schedule in group.years.items()},
+        shifts=group.shifts,
+    )
+    return json.dumps(jsonable_encoder(model), ensure_ascii=False, separators=(",", ":")).encode("utf8")
+
+
+def main() -> None:
+    orjson: Any = schedule_encoder.orjson
+    print(f"orjson {'installed' if orjson is not None else 'not installed'}")
+
+    courses: int
+    for courses in SIZES:
+        group: ScheduleGroup = make_schedule_group(YEARS, courses)
+        schedule: Schedule = group.years[1]
+        repeat: int = 5 if courses < 1_000 else 2
+
+        previous: float = measure_time(
+            lambda: json.dumps(
+                as_dict(schedule), indent=4, default=serialize_unknown_obj, ensure_ascii=False
+            ).encode("utf8"),
+            repeat=repeat,
+        )
+
+        timings: dict[str, float] = {}
+
+        backend: str
+        for backend in ("stdlib", "orjson"):
+            if backend == "orjson" and orjson is None:
+                continue
+
+            schedule_encoder.orjson = orjson if backend == "orjson" else None
+            timings[backend] = measure_time(lambda: ScheduleEncoder().encode(schedule), repeat=repeat)
+            timings[f"{backend} pretty"] = measure_time(
+                lambda: ScheduleEncoder(pretty=True).encode(schedule), repeat=repeat
+            )
+
+        schedule_encoder.orjson = orjson
+
+        print(f"{len(schedule.get_events()):>6} events | json.dumps {previous * 1000:8.1f} ms | " + " | ".join(
+            f"{name} {elapsed * 1000:7.1f} ms ({previous / elapsed:4.1f}x)" for name, elapsed in timings.items()
+        ))
+
+        encoded_schedules: bytes = ScheduleResponse.encode_schedules(group)
+
+        model_time: float = measure_time(lambda: previous_response(group), repeat=repeat)
+        cached_time: float = measure_time(
+            lambda: ScheduleResponse.encode(COURSE_NAME, COURSE_DATE, encoded_schedules), repeat=repeat
+        )
+
+        print(f"{'':>6} response (4 years) | model {model_time * 1000:8.1f} ms | "
+              f"cached {cached_time * 1000:7.3f} ms | {model_time / cached_time:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
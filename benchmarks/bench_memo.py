@@ -0,0 +1,79 @@
+"""
+Time of repeated convert requests with the builder memoization cleared before each request (cold) and kept between
+requests (warm). Every request loads the cached schedules again, as the API does, so the memoized values are found by
+the content of the schedules rather than by their identity. Each request builds every format, the time spent only
+merging and laying out the schedules (what is memoized) is measured on its own too.
+
+Usage: python -m benchmarks.bench_memo
+"""
+
+import pickle
+from typing import Callable
+
+from src.lib.builder.ical.ical_builder import IcalBuilder
+from src.lib.builder.json.json_builder import JsonBuilder
+from src.lib.builder.memo import LAYOUTS, MERGED_SCHEDULES, get_memo_stats, get_merged_schedule
+from src.lib.builder.xlsx.sheet_layout import get_sheet_layout
+from src.lib.builder.xlsx.xlsx_builder import XlsxBuilder
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+
+from benchmarks.utils import make_schedule_group, measure_time
+
+SIZES: tuple[int, ...] = (10, 50, 200)  # Courses per year.
+YEARS: int = 4
+REQUESTS: int = 5
+
+
+def convert(cached: bytes) -> None:
+    """
+    Loads the schedules, as a cache hit would, and builds them in every format.
+    """
+    schedules: list[Schedule] = list(pickle.loads(cached).years.values())
+
+    XlsxBuilder(schedules).build()
+    JsonBuilder(schedules).build()
+    IcalBuilder(schedules).build()
+
+
+def prepare(cached: bytes) -> None:
+    """
+    Loads the schedules, then merges and lays them out, as the builders do.
+    """
+    schedules: list[Schedule] = list(pickle.loads(cached).years.values())
+    get_sheet_layout(get_merged_schedule(schedules))
+
+
+def clear() -> None:
+    """
+    Clears the memoized values.
+    """
+    MERGED_SCHEDULES.clear()
+    LAYOUTS.clear()
+
+
+def main() -> None:
+    courses: int
+    for courses in SIZES:
+        group: ScheduleGroup = make_schedule_group(YEARS, courses)
+        cached: bytes = pickle.dumps(group)
+
+        load: float = measure_time(lambda: pickle.loads(cached), repeat=REQUESTS)
+
+        events: int = sum(len(schedule.get_events()) for schedule in group.years.values())
+        print(f"{events:>6} events (loading {load * 1000:.1f} ms)")
+
+        name: str
+        request: Callable[[bytes], None]
+        for name, request in (("merge + layout", prepare), ("every format", convert)):
+            cold: float = measure_time(lambda: (clear(), request(cached)), repeat=REQUESTS)
+
+            request(cached)
+            warm: float = measure_time(lambda: request(cached), repeat=REQUESTS)
+
+            print(f"  {name:<15} cold {cold * 1000:8.1f} ms | warm {warm * 1000:8.1f} ms | {cold / warm:4.2f}x")
+
+    print(get_memo_stats())
+
+
+if __name__ == "__main__":
+    main()
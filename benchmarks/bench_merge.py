@@ -0,0 +1,88 @@
+"""
+Output size and time of Schedule.get_as_dict and merge_schedules against their previous implementations, which
+shared a single list between every weekday (so every event was listed on every weekday) and copied the events one
+by one into a schedule with hard-coded weekdays. Their results are tested in tests/test_merge.py.
+
+Usage: python -m benchmarks.bench_merge
+"""
+
+import json
+from datetime import datetime
+from typing import Any
+
+from src.lib.builder.utils import merge_schedules
+from src.lib.scraper.event import ScheduleEvent
+from src.lib.scraper.schedule import Schedule
+
+from benchmarks.utils import make_university, measure_time
+
+SIZES: tuple[int, ...] = (1, 5, 25)  # Groups of 4 years * 25 courses.
+
+
+def previous_get_as_dict(schedule: Schedule) -> dict:
+    """
+    The previous Schedule.get_as_dict.
+    """
+    as_dict: dict = dict.fromkeys(schedule.weekdays, list())
+
+    weekday: str
+    for weekday in schedule.schedule:
+        event: ScheduleEvent
+        for event in schedule.schedule[weekday]:
+            as_dict[weekday].append(event.as_dict())
+
+    return as_dict
+
+
+def previous_merge_schedules(schedules: list[Schedule]) -> Schedule:
+    """
+    The previous merge_schedules.
+    """
+    weekdays: list[str] = ["Segunda-Feira", "Terça-Feira", "Quarta-Feira", "Quinta-Feira", "Sexta-Feira", "Sábado"]
+
+    final_schedule: Schedule = Schedule(weekdays=weekdays)
+
+    schedule: Schedule
+    for schedule in schedules:
+
+        event: ScheduleEvent
+        for event in schedule.get_events():
+            final_schedule.add_event(event)
+
+    return final_schedule
+
+
+def serialize_unknown_obj(obj: Any) -> str:
+    """
+    Formats the datetimes of the events as HH:MM.
+    """
+    return obj.time().strftime("%H:%M") if isinstance(obj, datetime) else str(obj)
+
+
+def main() -> None:
+    groups: int
+    for groups in SIZES:
+        schedules: list[Schedule] = [
+            schedule for group in make_university(groups) for schedule in group.years.values()
+        ]
+        merged: Schedule = merge_schedules(schedules)
+
+        repeat: int = 5 if groups < 25 else 2
+
+        previous_merge: float = measure_time(lambda: previous_merge_schedules(schedules), repeat=repeat)
+        current_merge: float = measure_time(lambda: merge_schedules(schedules), repeat=repeat)
+
+        previous_size: int = len(json.dumps(previous_get_as_dict(merged), default=serialize_unknown_obj))
+        current_size: int = len(json.dumps(merged.get_as_dict(), default=serialize_unknown_obj))
+
+        previous_dict: float = measure_time(lambda: previous_get_as_dict(merged), repeat=repeat)
+        current_dict: float = measure_time(merged.get_as_dict, repeat=repeat)
+
+        print(f"{len(merged.get_events()):>6} events, {len(schedules)} schedules")
+        print(f"  merge_schedules   previous {previous_merge * 1000:9.1f} ms | current {current_merge * 1000:9.1f} ms")
+        print(f"  get_as_dict       previous {previous_dict * 1000:9.1f} ms | current {current_dict * 1000:9.1f} ms")
+        print(f"  get_as_dict json  previous {previous_size / 1024:9.1f} KiB | current {current_size / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Query times of the indexed Schedule (filter, events_in_room, events_between) over a large merged schedule,
+compared with a full scan of every weekday list.
+
+Usage: python -m benchmarks.bench_schedule
+"""
+
+from src.lib.builder.utils import merge_schedules
+from src.lib.scraper.event import Location, ScheduleEvent
+from src.lib.scraper.schedule import Schedule
+
+from benchmarks.utils import make_university, measure_time
+
+GROUPS: int = 50  # 50 groups * 4 years * 25 courses * 6 shifts = 30k events.
+
+
+def scan_filter(schedule: Schedule, shifts: dict[str, list[str]]) -> Schedule:
+    """
+    Reference implementation, filters by scanning every event.
+    """
+    shifts = {course.lower(): course_shifts for course, course_shifts in shifts.items()}
+    result: Schedule = Schedule(schedule.weekdays)
+
+    event: ScheduleEvent
+    for events in schedule.schedule.values():
+        for event in events:
+            if event.body.name in shifts and event.body.shift in shifts[event.body.name]:
+                result.add_event(event)
+
+    return result
+
+
+def main() -> None:
+    schedule: Schedule = merge_schedules(
+        [schedule for group in make_university(GROUPS) for schedule in group.years.values()]
+    )
+    print(f"{len(schedule.get_events())} events")
+
+    shifts: dict[str, list[str]] = {f"Unidade Curricular Sintetica {course}": ["T1", "PL2"] for course in range(2)}
+    location: Location = schedule.get_events()[0].body.location
+
+    queries: dict = {
+        "full scan filter": lambda: scan_filter(schedule, shifts),
+        "Schedule.filter": lambda: schedule.filter(shifts),
+        "full scan by room": lambda: [e for e in schedule.get_events() if e.body.location == location],
+        "Schedule.events_in_room": lambda: schedule.events_in_room(location),
+        "full scan by time": lambda: [e for e in schedule.get_events() if 600 <= e.start < 660],
+        "Schedule.events_between": lambda: schedule.events_between(600, 660),
+        "Schedule.get_course_names": schedule.get_course_names,
+        "Schedule.get_shifts_from_courses": schedule.get_shifts_from_courses,
+    }
+
+    for name, query in queries.items():
+        print(f"  {name:<35} {measure_time(query) * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Measures the shift solver on synthetic schedules with a growing number of courses and shifts.
+
+Usage: python -m benchmarks.bench_solver
+"""
+
+from benchmarks.utils import make_schedule, measure_time
+from src.lib.scraper.schedule import Schedule
+from src.lib.solver.shift_solver import Objective, ShiftSolver
+
+CASES: list[tuple[int, int]] = [(4, 3), (6, 3), (6, 4), (8, 3), (8, 4), (10, 4), (10, 5)]
+OBJECTIVES: list[tuple[Objective, ...]] = [
+    (Objective.DAYS, Objective.END),
+    (Objective.END,),
+    (Objective.LAST, Objective.DAYS),
+]
+
+
+def main() -> None:
+    courses: int
+    shifts_per_type: int
+    for courses, shifts_per_type in CASES:
+        schedule: Schedule = make_schedule(courses, shifts_per_type=shifts_per_type, seed=1)
+
+        objectives: tuple[Objective, ...]
+        for objectives in OBJECTIVES:
+            solver: ShiftSolver = ShiftSolver(schedule)
+            elapsed: float = measure_time(lambda: solver.solve(objectives, limit=5), repeat=3)
+            names: str = ",".join(objective.value for objective in objectives)
+            truncated: str = "  (truncated)" if solver.truncated else ""
+            print(
+                f"{courses:>2} courses x {shifts_per_type} shifts/type  {names:<10} {elapsed * 1000:8.1f} ms{truncated}"
+            )
+
+
+if __name__ == "__main__":
+    main()
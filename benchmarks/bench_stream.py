@@ -0,0 +1,72 @@
+"""
+Time to first byte and peak memory of Builder.build against Builder.stream, for a big multi-year export in every
+format. The chunks of the stream are consumed and dropped, as a response would do.
+
+Usage: python -m benchmarks.bench_stream
+"""
+
+import time
+from typing import Callable, Iterator
+
+from src.lib.builder.builder import Builder
+from src.lib.builder.ical.ical_builder import IcalBuilder
+from src.lib.builder.json.json_builder import JsonBuilder
+from src.lib.builder.xlsx.xlsx_builder import XlsxBuilder
+from src.lib.scraper.schedule import Schedule
+
+from benchmarks.utils import make_schedule_group, measure_peak_memory
+
+YEARS: int = 4
+COURSES: int = 250  # Per year.
+
+
+def first_byte_and_total(chunks: Callable[[], Iterator[bytes]]) -> tuple[float, float, int]:
+    """
+    Consumes the chunks of a build, measuring when the first one arrived and when the last one did.
+    """
+    start: float = time.perf_counter()
+    first: float = 0
+    size: int = 0
+
+    chunk: bytes
+    for chunk in chunks():
+        if not first:
+            first = time.perf_counter() - start
+
+        size += len(chunk)
+
+    return first, time.perf_counter() - start, size
+
+
+def main() -> None:
+    schedules: list[Schedule] = list(make_schedule_group(YEARS, COURSES).years.values())
+    print(f"{sum(len(schedule.get_events()) for schedule in schedules)} events")
+
+    factories: dict[str, Callable[[], Builder]] = {
+        "json": lambda: JsonBuilder(schedules),
+        "ics": lambda: IcalBuilder(schedules),
+        "xlsx": lambda: XlsxBuilder(schedules),
+        "xlsx (constant_memory)": lambda: XlsxBuilder(schedules, constant_memory=True),
+    }
+
+    name: str
+    factory: Callable[[], Builder]
+    for name, factory in factories.items():
+        print(name)
+
+        methods: dict[str, Callable[[Builder], Callable[[], Iterator[bytes]]]] = {
+            "build": lambda builder: lambda: iter([builder.build()]),
+            "stream": lambda builder: builder.stream,
+        }
+
+        method: str
+        for method, chunks in methods.items():
+            first, total, size = first_byte_and_total(chunks(factory()))
+            _, peak = measure_peak_memory(lambda: first_byte_and_total(chunks(factory())))
+
+            print(f"  {method:<7} first byte {first * 1000:8.1f} ms | total {total * 1000:8.1f} ms | "
+                  f"{size / 1024:8.1f} KiB | {peak / 1024 / 1024:6.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Memory per event and query times of the columnar ScheduleTable against the object based ScheduleGroup, over a
+synthetic university with more than 100k events.
+
+Usage: python -m benchmarks.bench_table
+"""
+
+import src.lib.scraper.schedule_table as schedule_table
+from src.lib.scraper.event import Weekday
+from src.lib.scraper.schedule import ScheduleGroup
+from src.lib.scraper.schedule_table import ScheduleTable
+
+from benchmarks.utils import make_university, measure_memory, measure_time
+
+GROUPS: int = 200  # 200 groups * 4 years * 25 courses * 6 shifts = 120k events.
+
+
+def main() -> None:
+    groups: list[ScheduleGroup]
+    groups, groups_allocated = measure_memory(lambda: make_university(GROUPS))
+    table: ScheduleTable
+    table, table_allocated = measure_memory(lambda: ScheduleTable.from_schedule_groups(*groups))
+
+    event_count: int = len(table)
+    print(f"{event_count} events")
+    print(f"ScheduleGroup: {groups_allocated / event_count:8.1f} B/event")
+    print(f"ScheduleTable: {table_allocated / event_count:8.1f} B/event (including dictionaries)")
+
+    shifts: dict[str, list[str]] = {
+        f"Unidade Curricular Sintetica {course}": ["T1", "TP2", "PL1"] for course in range(0, 25, 2)
+    }
+
+    queries: dict = {
+        "Schedule.filter (every group and year)": lambda: [
+            schedule.filter(shifts) for group in groups for schedule in group.years.values()
+        ],
+        "ScheduleTable.select(shifts)": lambda: table.select(shifts=shifts),
+        "ScheduleTable.select(weekday, starts_after)": lambda: table.select(weekday=Weekday.MONDAY, starts_after=720),
+        "ScheduleTable.group_by_course": table.group_by_course,
+        "ScheduleTable.conflicts": table.conflicts,
+        "ScheduleTable.to_schedule_group": lambda: table.to_schedule_group(groups[0].course_name),
+    }
+
+    backends: list[tuple[str, object]] = [("numpy", schedule_table.np), ("python", None)]
+
+    backend: str
+    for backend, module in backends:
+        if backend == "numpy" and module is None:
+            continue
+
+        schedule_table.np = module
+        print(f"\nBackend: {backend}")
+
+        for name, query in queries.items():
+            print(f"  {name:<45} {measure_time(query, repeat=3) * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
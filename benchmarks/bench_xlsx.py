@@ -0,0 +1,62 @@
+"""
+Build time, peak memory and output size of the xlsx builder for a single year, a whole course (4 years) and a whole
+department (every year of several courses), with and without the constant_memory mode. The department is also built
+as a single workbook with a sheet per course, against a separate build per course.
+
+Usage: python -m benchmarks.bench_xlsx
+"""
+
+from src.lib.builder.xlsx.xlsx_builder import XlsxBuilder
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+
+from benchmarks.utils import make_schedule_group, make_university, measure_peak_memory, measure_time
+
+DEPARTMENT_GROUPS: int = 8
+
+
+def main() -> None:
+    course: ScheduleGroup = make_schedule_group(4, courses=8)
+    department: list[ScheduleGroup] = make_university(DEPARTMENT_GROUPS, courses=8)
+
+    cases: dict[str, list[Schedule]] = {
+        "1 year": [course.years[1]],
+        "4 years": list(course.years.values()),
+        f"department ({DEPARTMENT_GROUPS} courses)": [
+            schedule for group in department for schedule in group.years.values()
+        ],
+    }
+
+    name: str
+    schedules: list[Schedule]
+    for name, schedules in cases.items():
+        event_count: int = sum(len(schedule.get_events()) for schedule in schedules)
+        print(f"{name}: {event_count} events")
+
+        constant_memory: bool
+        for constant_memory in (False, True):
+            content: bytes
+            content, peak = measure_peak_memory(
+                lambda: XlsxBuilder(schedules, constant_memory=constant_memory).build()
+            )
+            elapsed: float = measure_time(
+                lambda: XlsxBuilder(schedules, constant_memory=constant_memory).build(), repeat=3
+            )
+
+            mode: str = "constant_memory" if constant_memory else "in_memory"
+            print(f"  {mode:<16} {elapsed * 1000:8.1f} ms | {len(content) / 1024:8.1f} KiB | "
+                  f"{peak / 1024 / 1024:6.1f} MiB peak")
+
+    sheets: dict[str, list[Schedule]] = {group.course_name: list(group.years.values()) for group in department}
+    print(f"department, a sheet per course ({len(sheets)} sheets)")
+
+    one_workbook: float = measure_time(lambda: XlsxBuilder(sheets).build(), repeat=3)
+    one_per_course: float = measure_time(
+        lambda: [XlsxBuilder(schedules).build() for schedules in sheets.values()], repeat=3
+    )
+
+    print(f"  one workbook     {one_workbook * 1000:8.1f} ms")
+    print(f"  one per course   {one_per_course * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
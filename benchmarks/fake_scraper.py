@@ -0,0 +1,88 @@
+import time
+from typing import Optional
+
+from src.lib.exceptions import CourseNameDoesNotExistException, YearOutOfBoundsException
+from src.lib.scraper.parser import ScheduleParser
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+from src.lib.scraper.scraper import ScheduleScraper
+from src.lib.tracing.tracer import TRACER
+
+from benchmarks.fixtures.pages import load_corpus
+
+
+class FakeScheduleScraper(ScheduleScraper):
+    """
+    This class is a scraper that serves the saved pages of the fixture corpus instead of browsing the schedules
+    portal, so everything past the browser (parsing, caching, building) can be measured without a network or Firefox.
+    The pages go through the same parser as scraped ones, missing courses and years raise the same exceptions and the
+    same spans are traced.
+
+    :param pages: Pages of each year of each course, the fixture corpus by default.
+    :type pages: Optional[dict[str, dict[int, str]]]
+    :param latency: Seconds each year takes to be 'scraped', to stand in for the browser.
+    :type latency: float
+    """
+
+    def __init__(self, pages: Optional[dict[str, dict[int, str]]] = None, latency: float = 0.0) -> None:
+        super().__init__()
+        self.pages: dict[str, dict[int, str]] = pages if pages is not None else load_corpus()
+        self.latency: float = latency
+        self.scrapes: int = 0  # Number of years served.
+
+    def warm_up(self) -> None:
+        pass
+
+    def get_courses(self) -> list[str]:
+        return list(self.pages)
+
+    def get_single(
+        self, year: int, date_str: str, formatted: bool, parser: ScheduleParser, course_name: str = ""
+    ) -> Optional[str | Schedule]:
+        with TRACER.span("scraper.get_single", year=year):
+            page: Optional[str] = self.pages.get(course_name, {}).get(year)
+
+            if page is None:
+                raise YearOutOfBoundsException(f"The course doesn't have an year {year}.")
+
+            if self.latency:
+                time.sleep(self.latency)
+
+            self.scrapes += 1
+
+            if formatted:
+                try:
+                    return parser.parse(page)
+
+                except IndexError:
+                    return None
+
+            return page
+
+    @TRACER.traced("scraper.get")
+    def get(
+        self,
+        course_name: str,
+        parser: ScheduleParser,
+        date_str: Optional[str] = None,
+        year: Optional[int] = None,
+        formatted: bool = True,
+    ) -> Optional[ScheduleGroup]:
+        if course_name not in self.pages:
+            raise CourseNameDoesNotExistException(f"Course '{course_name}' does not exist.")
+
+        result: ScheduleGroup = ScheduleGroup(course_name=course_name)
+        years: list[int] = [year] if year else sorted(self.pages[course_name])
+
+        y: int
+        for y in years:
+            content: Optional[str | Schedule] = self.get_single(y, date_str or "", formatted, parser, course_name)
+
+            if content is None:
+                return None
+
+            result.add_event_to_year(y, content)
+
+        return result
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,34 @@
+"""
+Writes the corpus of saved schedule pages, checking that each page parses back into the events of the schedule it was
+rendered from (in the order of the page, which is by starting time). The pages are committed, this only needs to run again if the corpus changes.
+
+Usage: python -m benchmarks.fixtures.generate
+"""
+
+from src.lib.scraper.parser import ScheduleParser
+from src.lib.scraper.schedule import Schedule
+
+from benchmarks.fixtures.pages import (
+    PAGES_DIR, SIZES, YEARS, course_name_of, make_page_schedule, page_path, render_schedule_page
+)
+
+
+def main() -> None:
+    PAGES_DIR.mkdir(exist_ok=True)
+    parser: ScheduleParser = ScheduleParser()
+
+    size: str
+    for size in SIZES:
+        for year in range(1, YEARS + 1):
+            schedule: Schedule = make_page_schedule(size, year)
+            page: str = render_schedule_page(schedule, course_name_of(size), year)
+
+            if sorted(map(repr, parser.parse(page).get_events())) != sorted(map(repr, schedule.get_events())):
+                raise RuntimeError(f"The {size} page of year {year} doesn't parse back into its schedule.")
+
+            page_path(size, year).write_text(page, encoding="utf-8")
+            print(f"  {page_path(size, year).name:<20} {len(schedule.get_events()):5} events {len(page):9} bytes")
+
+
+if __name__ == "__main__":
+    main()
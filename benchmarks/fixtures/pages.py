@@ -0,0 +1,157 @@
+"""
+Schedule pages shaped like the ones of the schedules portal, as read by ScheduleParser: a header table with the
+weekdays, a header table with the time of the first row and a content table with a row per half hour, a cell per
+weekday and a block per event starting on that row. The corpus is a set of such pages saved under 'pages/', a
+synthetic course per size with a page per year, so the benchmarks read the same html on every run and machine.
+"""
+
+import html
+from pathlib import Path
+
+from src.lib.scraper.event import ScheduleEvent
+from src.lib.scraper.schedule import Schedule
+from src.lib.scraper.utils import minutes_to_str
+
+from benchmarks.utils import make_schedule
+
+PAGES_DIR: Path = Path(__file__).parent / "pages"
+
+SIZES: dict[str, int] = {"small": 4, "medium": 10, "large": 25}  # Courses per year.
+YEARS: int = 3
+ROW_MINUTES: int = 30
+ROW_HEIGHT: int = 60  # Pixels, a block taller than 200 pixels is a two-hour event.
+
+
+def course_name_of(size: str) -> str:
+    """
+    :return: Name of the course of the pages of a size.
+    :rtype: str
+    """
+    return f"Licenciatura Sintetica {size.title()}"
+
+
+def make_page_schedule(size: str, year: int) -> Schedule:
+    """
+    :return: The schedule of a page of the corpus.
+    :rtype: Schedule
+    """
+    return make_schedule(SIZES[size], seed=list(SIZES).index(size) * YEARS + year)
+
+
+def render_event(event: ScheduleEvent) -> str:
+    """
+    :return: The block of an event, its title is the body of the event and its height gives its duration.
+    :rtype: str
+    """
+    height: int = ROW_HEIGHT * event.length // ROW_MINUTES - 4
+    title: str = html.escape(event_title(event), quote=True)
+
+    return (
+        f'<div class="rsApt rsAptSimple" style="height:{height}px;width:100%;" title="{title}">'
+        f'<div class="rsAptOut"><div class="rsAptMid"><div class="rsAptIn"><div class="rsAptContent">'
+        f"{title}</div></div></div></div></div>"
+    )
+
+
+def event_title(event: ScheduleEvent) -> str:
+    """
+    :return: The title of the block of an event, as the portal writes it ('Course [Campus - Building - Room] Shift').
+    :rtype: str
+    """
+    location = event.body.location
+    building: str = location.building.replace("CP", "Edificio ")
+    return f"{event.body.name.title()} [{location.campus} - {building} - {location.room}] {event.body.shift}"
+
+
+def render_schedule_table(schedule: Schedule) -> str:
+    """
+    Renders the scheduler of a schedule, the part of the page that is parsed.
+    :param schedule: The schedule.
+    :type schedule: Schedule
+    :return: The html of the scheduler.
+    :rtype: str
+    """
+    starting_time, ending_time = schedule.get_starting_and_ending_time()
+    starting_time = starting_time if starting_time is not None else 8 * 60
+    ending_time = ending_time if ending_time is not None else starting_time + ROW_MINUTES
+
+    starting: dict[tuple[str, int], list[ScheduleEvent]] = {}
+
+    weekday: str
+    for weekday in schedule.weekdays:
+        event: ScheduleEvent
+        for event in schedule.get_events_from_weekday(weekday):
+            starting.setdefault((weekday, event.start), []).append(event)
+
+    weekdays: str = "".join(
+        f'<th><div class="rsDateWrap"><a href="#" class="rsDateHeader">{html.escape(weekday)}</a></div></th>'
+        for weekday in schedule.weekdays
+    )
+    times: str = "".join(
+        f"<tr><th><div>{minutes_to_str(minutes)}</div></th></tr>"
+        for minutes in range(starting_time, ending_time, ROW_MINUTES)
+    )
+    rows: str = "".join(
+        "<tr>" + "".join(
+            '<td><div class="rsWrap">' +
+            "".join(render_event(event) for event in starting.get((weekday, minutes), ())) +
+            "</div></td>"
+            for weekday in schedule.weekdays
+        ) + "</tr>\n"
+        for minutes in range(starting_time, ending_time, ROW_MINUTES)
+    )
+
+    return (
+        '<div class="RadScheduler">\n'
+        f'<table class="rsHorizontalHeaderTable"><tr>{weekdays}</tr></table>\n'
+        f'<table class="rsVerticalHeaderTable">{times}</table>\n'
+        f'<table class="rsContentTable">\n{rows}</table>\n'
+        "</div>"
+    )
+
+
+def render_schedule_page(schedule: Schedule, course_name: str, year: int) -> str:
+    """
+    Renders the page of the portal showing the schedule of a year of a course.
+    :param schedule: The schedule.
+    :type schedule: Schedule
+    :param course_name: Name of the course.
+    :type course_name: str
+    :param year: The year.
+    :type year: int
+    :return: The html of the page.
+    :rtype: str
+    """
+    return (
+        "<!DOCTYPE html>\n<html lang=\"pt\">\n<head><meta charset=\"utf-8\">"
+        f"<title>Horarios - {html.escape(course_name)} - {year}</title></head>\n<body>\n"
+        f"<h2>{html.escape(course_name)} - {year}.º Ano</h2>\n"
+        f"{render_schedule_table(schedule)}\n</body>\n</html>\n"
+    )
+
+
+def page_path(size: str, year: int) -> Path:
+    """
+    :return: Path of a saved page of the corpus.
+    :rtype: Path
+    """
+    return PAGES_DIR / f"{size}_year{year}.html"
+
+
+def load_page(size: str, year: int) -> str:
+    """
+    :return: A saved page of the corpus.
+    :rtype: str
+    """
+    return page_path(size, year).read_text(encoding="utf-8")
+
+
+def load_corpus() -> dict[str, dict[int, str]]:
+    """
+    :return: Every saved page, by course name and year.
+    :rtype: dict[str, dict[int, str]]
+    """
+    return {
+        course_name_of(size): {year: load_page(size, year) for year in range(1, YEARS + 1)}
+        for size in SIZES
+    }
@@ -0,0 +1,386 @@
+"""
+Load test of the api over a local socket. By default the api is started on a process of its own, with the fake
+scraper serving the fixture corpus (and a given scrape latency) and a fresh cache, so the cache, serialization and
+builders are measured without a browser; --url targets a server that is already running instead.
+
+A number of concurrent clients replay a traffic mix of '/courses', '/schedule/' cache hits and misses and
+'/schedule/convert/' in each format, the courses are drawn from a Zipf distribution (a few popular courses, a long
+tail of others). Hits are requests of the first semester, whose schedules are cached before the run, misses are of
+the second one, each year of each course once, until they run out. Whether a '/schedule/' request was actually
+scraped is told by its Server-Timing header.
+
+Throughput and the 50th, 95th and 99th latency percentiles are reported per endpoint.
+
+Usage: python -m benchmarks.load_test [--duration 30] [--concurrency 16] [--courses 200] [--scrape-latency 0.2]
+    [--mix courses=1,hit=6,miss=1,json=2,ics=1,xlsx=1] [--output load.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import socket
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+import httpx
+
+from benchmarks.fixtures.pages import SIZES, YEARS, load_corpus
+
+API_PREFIX: str = "/api/v1/shifter"
+DEFAULT_MIX: str = "courses=1,hit=6,miss=1,json=2,ics=1,xlsx=1"
+CONVERT_FORMATS: tuple[str, ...] = ("json", "ics", "xlsx", "all")
+
+# Shifts picked by the convert requests, the courses and shifts every page of the corpus has.
+CONVERT_SHIFTS: dict[str, list[str]] = {
+    f"Unidade Curricular Sintetica {course}": ["T1", "TP1", "PL2"] for course in range(min(SIZES.values()))
+}
+
+Operation = Callable[[httpx.AsyncClient], Any]
+"""
+Coroutine function sending a request of the traffic mix, returning the response.
+"""
+
+
+def make_pages(courses: int) -> dict[str, dict[int, str]]:
+    """
+    Names a number of courses after the fixture corpus, the pages of each size are shared by a third of them.
+    :param courses: Number of courses.
+    :type courses: int
+    :return: Pages of each year of each course.
+    :rtype: dict[str, dict[int, str]]
+    """
+    corpus: list[dict[int, str]] = list(load_corpus().values())
+    return {f"Licenciatura Carga {course:04d}": corpus[course % len(corpus)] for course in range(courses)}
+
+
+def serve(host: str, port: int, pages: dict[str, dict[int, str]], scrape_latency: float, cache_db: str) -> None:
+    """
+    Runs the api with the fake scraper and a fresh cache, until the process is terminated. The first semester of
+    every course is cached beforehand, each distinct page is only parsed once.
+    """
+    import uvicorn
+
+    from benchmarks.fake_scraper import FakeScheduleScraper
+    from src.api.models.schedule_request import ScheduleRequest
+    from src.api.routes import shifter
+    from src.api.server import app
+    from src.lib.cache.ttl_cache import Cache
+    from src.lib.scraper.schedule import Schedule, ScheduleGroup
+
+    shifter.scraper = FakeScheduleScraper(pages, latency=scrape_latency)
+    shifter.cache = Cache(cache_db)
+
+    parsed: dict[str, Schedule] = {}
+
+    course: str
+    for course, years in pages.items():
+        group: ScheduleGroup = ScheduleGroup(course_name=course)
+
+        for year, page in years.items():
+            if page not in parsed:
+                parsed[page] = shifter.parser.parse(page)
+
+            group.add_event_to_year(year, parsed[page])
+
+        shifter.cache.set(ScheduleRequest(course_name=course, course_semester=1, course_years=0).cache_key, group)
+
+    uvicorn.run(app, host=host, port=port, log_level="warning", access_log=False)
+
+
+def free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def zipf_sampler(items: list[Any], exponent: float, rng: random.Random) -> Callable[[], Any]:
+    """
+    :return: A function drawing an item, the k-th one with a probability proportional to 1 / k ** exponent.
+    :rtype: Callable[[], Any]
+    """
+    cumulative: list[float] = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, len(items) + 1)))
+    return lambda: rng.choices(items, cum_weights=cumulative)[0]
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    :return: The nearest-rank percentile of sorted values.
+    :rtype: float
+    """
+    return sorted_values[max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))]
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    """
+    This class gathers the outcome of the requests of an endpoint.
+    """
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, duration: float) -> dict[str, float]:
+        """
+        :param duration: Seconds the load test ran for.
+        :type duration: float
+        :return: Number of requests and errors, throughput (requests per second) and latency percentiles (ms).
+        :rtype: dict[str, float]
+        """
+        latencies: list[float] = sorted(self.latencies)
+
+        if not latencies:
+            return {"requests": 0, "errors": self.errors, "throughput": 0.0}
+
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "throughput": len(latencies) / duration,
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+        }
+
+
+class TrafficMix:
+    """
+    This class draws the requests of the load test, by the weight of each kind of request.
+
+    :param courses: Names of the courses, most popular first.
+    :type courses: list[str]
+    :param weights: Weight of each kind of request (courses, hit, miss and the convert formats).
+    :type weights: dict[str, float]
+    :param exponent: Exponent of the Zipf distribution of the courses.
+    :type exponent: float
+    :param seed: Seed of the draws.
+    :type seed: int
+    """
+
+    def __init__(self, courses: list[str], weights: dict[str, float], exponent: float, seed: int) -> None:
+        self.__rng: random.Random = random.Random(seed)
+        self.__course: Callable[[], str] = zipf_sampler(courses, exponent, self.__rng)
+        self.__misses: Iterator[tuple[str, int]] = itertools.cycle(
+            (course, years) for course in courses for years in range(YEARS + 1)
+        )
+
+        self.__operations: dict[str, Operation] = {
+            "courses": self.courses,
+            "hit": self.hit,
+            "miss": self.miss,
+            **{fmt: self.__make_convert(fmt) for fmt in CONVERT_FORMATS},
+        }
+        unknown: set[str] = set(weights) - set(self.__operations)
+
+        if unknown:
+            raise ValueError(f"Unknown requests on the traffic mix: {', '.join(sorted(unknown))}.")
+
+        self.__names: list[str] = [name for name, weight in weights.items() if weight > 0]
+        self.__weights: list[float] = [weights[name] for name in self.__names]
+
+    def draw(self) -> Operation:
+        return self.__operations[self.__rng.choices(self.__names, weights=self.__weights)[0]]
+
+    @staticmethod
+    async def courses(client: httpx.AsyncClient) -> tuple[str, httpx.Response]:
+        return "GET /courses", await client.get(f"{API_PREFIX}/courses")
+
+    async def hit(self, client: httpx.AsyncClient) -> tuple[str, httpx.Response]:
+        body: dict[str, Any] = {"course_name": self.__course(), "course_semester": 1, "course_years": 0}
+        return "POST /schedule/", await client.post(f"{API_PREFIX}/schedule/", json=body)
+
+    async def miss(self, client: httpx.AsyncClient) -> tuple[str, httpx.Response]:
+        course, years = next(self.__misses)
+        body: dict[str, Any] = {"course_name": course, "course_semester": 2, "course_years": years}
+        return "POST /schedule/", await client.post(f"{API_PREFIX}/schedule/", params={"wait": "true"}, json=body)
+
+    def __make_convert(self, fmt: str) -> Operation:
+        async def convert(client: httpx.AsyncClient) -> tuple[str, httpx.Response]:
+            request: dict[str, Any] = {
+                "body": {"course_name": self.__course(), "course_semester": 1, "course_years": 0},
+                "shifts": {str(year): CONVERT_SHIFTS for year in range(1, YEARS + 1)},
+                "fmt": fmt,
+            }
+            return f"POST /schedule/convert/ ({fmt})", await client.post(f"{API_PREFIX}/schedule/convert/", json=request)
+
+        return convert
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """
+    :param mix: The weight of each kind of request, like 'courses=1,hit=6'.
+    :type mix: str
+    :return: The weights, by kind of request.
+    :rtype: dict[str, float]
+    """
+    return {name.strip(): float(weight) for name, weight in (entry.split("=") for entry in mix.split(",") if entry)}
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline: float = time.monotonic() + timeout
+
+    while True:
+        try:
+            await client.get(f"{API_PREFIX}/health")
+            return
+
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+
+            await asyncio.sleep(0.1)
+
+
+async def warm_up(client: httpx.AsyncClient, courses: list[str]) -> None:
+    """
+    Scrapes the first semester of every course, so its requests are cache hits.
+    """
+    course: str
+    for course in courses:
+        body: dict[str, Any] = {"course_name": course, "course_semester": 1, "course_years": 0}
+        response: httpx.Response = await client.post(f"{API_PREFIX}/schedule/", params={"wait": "true"}, json=body)
+        response.raise_for_status()
+
+
+async def run_load(
+        url: str,
+        mix: TrafficMix,
+        courses: list[str],
+        duration: float,
+        concurrency: int,
+        warm: bool) -> tuple[dict[str, EndpointStats], float]:
+    """
+    Runs the load test, each client sends its next request as soon as the previous one is answered.
+    :param warm: Whether to scrape the first semester of every course before the test, unless the server did.
+    :return: The outcome of the requests by endpoint, and the seconds the test ran for.
+    :rtype: tuple[dict[str, EndpointStats], float]
+    """
+    stats: dict[str, EndpointStats] = {}
+    limits: httpx.Limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120.0) as client:
+        await wait_until_up(client)
+
+        if warm:
+            await warm_up(client, courses)
+
+        deadline: float = time.monotonic() + duration
+
+        async def user() -> None:
+            while time.monotonic() < deadline:
+                operation: Operation = mix.draw()
+                start: float = time.perf_counter()
+
+                try:
+                    endpoint, response = await operation(client)
+                    await response.aread()
+
+                except httpx.TransportError as e:
+                    stats.setdefault(f"transport error ({type(e).__name__})", EndpointStats()).errors += 1
+                    continue
+
+                elapsed: float = time.perf_counter() - start
+
+                if endpoint == "POST /schedule/":  # Told apart by whether the schedule had to be scraped.
+                    scraped: bool = "scraper.get" in response.headers.get("server-timing", "")
+                    endpoint = f"{endpoint} ({'miss' if scraped else 'hit'})"
+
+                endpoint_stats: EndpointStats = stats.setdefault(endpoint, EndpointStats())
+                endpoint_stats.latencies.append(elapsed)
+                endpoint_stats.errors += response.status_code >= 400
+
+        started: float = time.monotonic()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    return stats, time.monotonic() - started
+
+
+def report(stats: dict[str, EndpointStats], duration: float) -> dict[str, dict[str, float]]:
+    """
+    Prints the summary of each endpoint, and of every request.
+    :return: The summaries, by endpoint.
+    :rtype: dict[str, dict[str, float]]
+    """
+    total: EndpointStats = EndpointStats(
+        [latency for endpoint in stats.values() for latency in endpoint.latencies],
+        sum(endpoint.errors for endpoint in stats.values()),
+    )
+    summaries: dict[str, dict[str, float]] = {name: stats[name].summary(duration) for name in sorted(stats)}
+    summaries["total"] = total.summary(duration)
+
+    print(f"\n  {'endpoint':<36}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+
+    name: str
+    summary: dict[str, float]
+    for name, summary in summaries.items():
+        print(
+            f"  {name:<36}{summary['requests']:>9}{summary['errors']:>8}{summary['throughput']:>9.1f}"
+            f"{summary.get('p50', 0):>10.1f}{summary.get('p95', 0):>10.1f}{summary.get('p99', 0):>10.1f}"
+        )
+
+    return summaries
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="api to load, one is started with the fake scraper by default")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to send requests for (default: 30)")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients (default: 16)")
+    parser.add_argument("--courses", type=int, default=200, help="number of courses (default: 200)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="exponent of the course popularity (default: 1.1)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weight of each request (default: {DEFAULT_MIX})")
+    parser.add_argument("--scrape-latency", type=float, default=0.2, help="seconds each year takes to scrape")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the traffic (default: 0)")
+    parser.add_argument("--output", help="file the summaries are written to, as json")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    pages: dict[str, dict[int, str]] = make_pages(arguments.courses)
+    courses: list[str] = list(pages)
+
+    try:
+        mix: TrafficMix = TrafficMix(courses, parse_mix(arguments.mix), arguments.zipf, arguments.seed)
+
+    except ValueError as e:
+        parser.error(f"invalid --mix: {e}")
+
+    url: Optional[str] = arguments.url
+    server: Optional[multiprocessing.Process] = None
+
+    with tempfile.TemporaryDirectory() as directory:
+        if url is None:
+            host: str = "127.0.0.1"
+            port: int = free_port(host)
+            url = f"http://{host}:{port}"
+
+            server = multiprocessing.Process(
+                target=serve,
+                args=(host, port, pages, arguments.scrape_latency, os.path.join(directory, "cache.db")),
+                daemon=True,
+            )
+            server.start()
+
+        print(f"Loading {url} for {arguments.duration:g}s with {arguments.concurrency} clients, mix {arguments.mix}")
+
+        try:
+            stats, duration = asyncio.run(
+                run_load(url, mix, courses, arguments.duration, arguments.concurrency, warm=server is None)
+            )
+
+        finally:
+            if server is not None:
+                server.terminate()
+                server.join()
+
+    summaries: dict[str, dict[str, float]] = report(stats, duration)
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump({"arguments": vars(arguments), "duration": duration, "endpoints": summaries}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Local stand-in for the schedules portal, serving the fixture corpus through the same elements the scraper drives:
+the course dropdown items, the search bar and button, the year radio buttons, the date input, the expand checkbox and
+the scheduler tables. Each form submit is a GET of the same page, like the postbacks of the portal, so a browser can
+go back and forth between the steps. Responses can be delayed and made to fail, to load test the scraping path.
+
+Point shifter at it with SHIFTER_SCRAPER_URL=http://127.0.0.1:<port>/ (or ScheduleScraper(url=...)).
+
+Usage: python -m benchmarks.portal_stub [--port 8765] [--latency 0.2] [--jitter 0.1] [--failure-rate 0.05]
+"""
+
+import argparse
+import html
+import random
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import src.lib.scraper.elements as elements
+
+from benchmarks.fixtures.pages import load_corpus
+
+# Names of the form fields, the scraper finds the inputs by their ids.
+YEAR_INPUT: str = "dataAnoCurricular"  # Shared by the year radio buttons.
+DATE_INPUT: str = "dataWeekSelect"
+EXPAND_INPUT: str = "chkMostraExpandido"
+
+
+def scheduler_of(page: str) -> str:
+    """
+    :return: The scheduler of a saved schedule page, the part of it that is parsed.
+    :rtype: str
+    """
+    start: int = page.index('<div class="RadScheduler">')
+    return page[start:page.rindex("</body>")]
+
+
+class PortalStub:
+    """
+    This class runs a local http server mimicking the schedules portal, on a thread of its own, until it is closed.
+
+    :param pages: Pages of each year of each course, the fixture corpus by default.
+    :type pages: Optional[dict[str, dict[int, str]]]
+    :param host: Address the server listens on.
+    :type host: str
+    :param port: Port the server listens on, 0 picks a free one.
+    :type port: int
+    :param latency: Seconds each response is delayed by.
+    :type latency: float
+    :param jitter: Up to these many seconds are randomly added to the latency of each response.
+    :type jitter: float
+    :param failure_rate: Fraction of the responses that are a 503 error page, as an overloaded portal would send.
+    :type failure_rate: float
+    :param seed: Seed of the jitter and failures, keeps a run repeatable.
+    :type seed: Optional[int]
+    """
+
+    def __init__(
+            self,
+            pages: Optional[dict[str, dict[int, str]]] = None,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            failure_rate: float = 0.0,
+            seed: Optional[int] = None) -> None:
+        self.pages: dict[str, dict[int, str]] = pages if pages is not None else load_corpus()
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.failure_rate: float = failure_rate
+        self.requests: int = 0
+        self.failures: int = 0
+
+        self.__random: random.Random = random.Random(seed)
+        self.__lock: threading.Lock = threading.Lock()
+        self.__server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), self.__make_handler())
+        self.__server.daemon_threads = True
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        :return: Url of the schedules page of the stub.
+        :rtype: str
+        """
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "PortalStub":
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name="portal-stub", daemon=True)
+        self.__thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self.__server.serve_forever()
+
+    def close(self) -> None:
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+
+        self.__server.server_close()
+
+    def __enter__(self) -> "PortalStub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def delay(self) -> bool:
+        """
+        Draws the delay and the outcome of a response, then waits for the delay.
+        :return: Whether the response fails.
+        :rtype: bool
+        """
+        with self.__lock:
+            self.requests += 1
+            delay: float = self.latency + (self.__random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fails: bool = self.failure_rate > 0 and self.__random.random() < self.failure_rate
+            self.failures += fails
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return fails
+
+    def render(self, query: dict[str, str]) -> str:
+        """
+        Renders the schedules page in the state given by the fields of the submitted form: the search form only, then
+        the options of the searched course, then its schedule once a year, a valid date and the expand checkbox are
+        submitted. An unknown course is searched as if nothing was typed.
+        :param query: The fields of the form.
+        :type query: dict[str, str]
+        :return: The html of the page.
+        :rtype: str
+        """
+        course_name: str = query.get(elements.search_bar, "")
+        years: dict[int, str] = self.pages.get(course_name, {}) if query.get("search") else {}
+        year: Optional[int] = int(query[YEAR_INPUT]) if query.get(YEAR_INPUT, "").isdigit() else None
+        date_str: str = query.get(DATE_INPUT, "")
+        expanded: bool = EXPAND_INPUT in query
+
+        courses: str = "".join(f'<li class="rcbItem">{html.escape(name)}</li>' for name in self.pages)
+        options: str = ""
+        scheduler: str = ""
+
+        if years:
+            radios: str = "".join(
+                f'<input type="radio" id="{elements.year_to_id[y]}" name="{YEAR_INPUT}" value="{y}"'
+                f'{" checked" if y == year else ""}><label for="{elements.year_to_id[y]}">{y}º Ano</label>'
+                for y in sorted(years) if y in elements.year_to_id
+            )
+            options = (
+                f'<input type="hidden" name="search" value="1">'
+                f'<div class="years">{radios}</div>'
+                f'<input type="text" id="{elements.date_bar}" name="{DATE_INPUT}" value="{html.escape(date_str)}">'
+                f'<input type="checkbox" id="{elements.expand_check}" name="{EXPAND_INPUT}"'
+                f'{" checked" if expanded else ""} onclick="this.form.submit()">'
+                f'<label for="{elements.expand_check}">Mostrar expandido</label>'
+            )
+
+            if year in years and expanded and self.is_valid_date(date_str):
+                scheduler = scheduler_of(years[year])
+
+        return (
+            "<!DOCTYPE html>\n<html lang=\"pt\">\n<head><meta charset=\"utf-8\"><title>Horários</title></head>\n"
+            "<body>\n<form method=\"get\" action=\"\">\n"
+            f'<div class="RadComboBox"><div class="rcbSlide"><ul class="rcbList">{courses}</ul></div></div>\n'
+            f'<input type="text" name="{elements.search_bar}" value="{html.escape(course_name)}">\n'
+            f'<button type="submit" id="{elements.search_button}" name="search" value="1">Pesquisar</button>\n'
+            f"{options}\n</form>\n{scheduler}\n</body>\n</html>\n"
+        )
+
+    @staticmethod
+    def is_valid_date(date_str: str) -> bool:
+        """
+        :return: Whether a date has the format of the date input (dd-mm-YYYY).
+        :rtype: bool
+        """
+        try:
+            datetime.strptime(date_str.strip(), "%d-%m-%Y")
+            return True
+
+        except ValueError:
+            return False
+
+    def __make_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub: PortalStub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version: str = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                fails: bool = stub.delay()
+                query: dict[str, str] = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+
+                status: HTTPStatus = HTTPStatus.SERVICE_UNAVAILABLE if fails else HTTPStatus.OK
+                content: bytes = (
+                    b"<!DOCTYPE html><html><body><h1>Service Unavailable</h1></body></html>"
+                    if fails else stub.render(query).encode()
+                )
+
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format: str, *args) -> None:  # Each request would be logged to stderr.
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds each response is delayed by")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to these many seconds added to each delay")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of responses that are a 503")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the jitter and failures")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    stub: PortalStub = PortalStub(
+        host=arguments.host,
+        port=arguments.port,
+        latency=arguments.latency,
+        jitter=arguments.jitter,
+        failure_rate=arguments.failure_rate,
+        seed=arguments.seed,
+    )
+    print(f"Serving {len(stub.pages)} courses on {stub.url}, run shifter with SHIFTER_SCRAPER_URL={stub.url}")
+
+    try:
+        stub.serve_forever()
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        stub.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Repeatable timings of the whole pipeline past the browser, over the saved pages of the fixture corpus (small, medium
+and large courses): parsing a page, scraping a course with the fake scraper, the Schedule queries used by the api,
+the cache and every builder. No network or browser is needed.
+
+The results are written as json, along with the commit and the python version, so the runs of two commits can be
+compared with --compare, which prints the change of the median time of each benchmark.
+
+Usage: python -m benchmarks.suite [--output results.json] [--repeat 10] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+from typing import Any, Callable, Optional
+
+from src.lib.builder.builder_factory import BuilderFactory
+from src.lib.builder.memo import LAYOUTS, MERGED_SCHEDULES
+from src.lib.cache.ttl_cache import Cache
+from src.lib.scraper.parser import ScheduleParser
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+
+from benchmarks.fake_scraper import FakeScheduleScraper
+from benchmarks.fixtures.pages import SIZES, course_name_of, load_corpus
+from benchmarks.utils import measure_times
+
+FORMATS: tuple[str, ...] = ("json", "ics", "xlsx")
+
+Benchmark = tuple[Callable[[], Any], Optional[Callable[[], Any]]]
+"""
+A function to time and the setup run before each of its runs.
+"""
+
+
+def clear_memo() -> None:
+    """
+    Forgets the merged schedules and layouts memoized by the builders, so every build starts cold.
+    """
+    MERGED_SCHEDULES.clear()
+    LAYOUTS.clear()
+
+
+def get_commit() -> Optional[str]:
+    """
+    :return: The commit of the working tree, None if it isn't a git repository.
+    :rtype: Optional[str]
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_benchmarks(size: str, corpus: dict[str, dict[int, str]], cache: Cache) -> dict[str, Benchmark]:
+    """
+    Creates the benchmarks of a size of the corpus.
+    :param size: The size.
+    :type size: str
+    :param corpus: The pages of the corpus.
+    :type corpus: dict[str, dict[int, str]]
+    :param cache: Cache used by the cache benchmarks.
+    :type cache: Cache
+    :return: The benchmarks, by name.
+    :rtype: dict[str, Benchmark]
+    """
+    parser: ScheduleParser = ScheduleParser()
+    scraper: FakeScheduleScraper = FakeScheduleScraper(corpus)
+    factory: BuilderFactory = BuilderFactory.with_defaults(load_entry_points=False)
+
+    course_name: str = course_name_of(size)
+    group: ScheduleGroup = scraper.get(course_name, parser)
+    schedule: Schedule = group.years[1]
+
+    # Half the shifts of every course, like a student picking theirs.
+    shifts: dict[str, list[str]] = {
+        course: course_shifts[::2] for course, course_shifts in schedule.get_shifts_from_courses().items()
+    }
+    selected: list[Schedule] = [year.filter(shifts) for year in group.years.values()]
+    cache_key: str = f"{course_name}.benchmark"
+    cache.set(cache_key, group)
+
+    benchmarks: dict[str, Benchmark] = {
+        "parse": (lambda: parser.parse(corpus[course_name][1]), None),
+        "scrape": (lambda: scraper.get(course_name, parser), None),
+        "schedule.filter": (lambda: schedule.filter(shifts), None),
+        # The interval indexes are kept on the schedule, they are dropped so that each run builds them again.
+        "schedule.get_collisions": (
+            lambda: [schedule.get_collisions(day) for day in schedule.weekdays],
+            schedule._interval_indexes.clear,
+        ),
+        "schedule.get_as_dict": (schedule.get_as_dict, None),
+        "cache.set": (lambda: cache.set(cache_key, group), None),
+        "cache.get": (lambda: cache.get(cache_key), None),
+    }
+
+    fmt: str
+    for fmt in FORMATS:
+        benchmarks[f"build.{fmt}"] = (
+            lambda fmt=fmt: factory.create(fmt, schedule=selected).build(),
+            clear_memo,
+        )
+
+    return benchmarks
+
+
+def run(repeat: int) -> dict[str, Any]:
+    """
+    Runs every benchmark of every size of the corpus.
+    :param repeat: Number of runs of each benchmark.
+    :type repeat: int
+    :return: The results, along with what they were measured on.
+    :rtype: dict[str, Any]
+    """
+    corpus: dict[str, dict[int, str]] = load_corpus()
+    results: dict[str, dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache: Cache = Cache(os.path.join(directory, "cache.db"))
+
+        size: str
+        for size in SIZES:
+            name: str
+            benchmark: Benchmark
+            for name, benchmark in make_benchmarks(size, corpus, cache).items():
+                func, setup = benchmark
+                func()  # Warming up, the first run imports modules and fills caches outside the measured code.
+
+                times: list[float] = measure_times(func, repeat, setup)
+                results[f"{name}[{size}]"] = {
+                    "best": min(times),
+                    "median": statistics.median(times),
+                    "runs": len(times),
+                }
+                print(f"  {name + '[' + size + ']':<35} {statistics.median(times) * 1000:10.3f} ms")
+
+        del cache
+
+    return {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> None:
+    """
+    Prints the change of the median time of each benchmark measured on both runs.
+    """
+    print(f"\n{'':<37}{baseline.get('commit') or 'baseline':>13}{current.get('commit') or 'current':>13}  change")
+
+    name: str
+    result: dict[str, float]
+    for name, result in current["results"].items():
+        previous: Optional[dict[str, float]] = baseline["results"].get(name)
+
+        if previous is None:
+            continue
+
+        change: float = (result["median"] - previous["median"]) / previous["median"] * 100
+        print(f"  {name:<35}{previous['median'] * 1000:10.3f} ms{result['median'] * 1000:10.3f} ms  {change:+6.1f}%")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default="benchmark-results.json", help="file the results are written to")
+    parser.add_argument("--repeat", type=int, default=10, help="runs of each benchmark (default: 10)")
+    parser.add_argument("--compare", metavar="BASELINE", help="results of a previous run to compare with")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    results: dict[str, Any] = run(arguments.repeat)
+
+    with open(arguments.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+    print(f"\nResults written to {arguments.output}")
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as file:
+            compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
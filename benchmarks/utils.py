@@ -0,0 +1,204 @@
+import gc
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+from src.lib.scraper.event import ScheduleEvent, WEEKDAY_LABELS
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+
+WEEKDAYS: list[str] = list(WEEKDAY_LABELS[:5])
+SHIFT_TYPES: tuple[str, ...] = ("T", "TP", "PL")
+
+
+def make_event_body(course: int, shift: str, room: int) -> str:
+    """
+    Builds an event body string with the same format as the 'title' attribute found on the schedules page.
+    :param course: Index of the course, used to build its name.
+    :type course: int
+    :param shift: Shift of the event (T1, TP2, ...).
+    :type shift: str
+    :param room: Index of the room.
+    :type room: int
+    :return: Body string ready to be parsed by ScheduleBody.from_string.
+    :rtype: str
+    """
+    return f"Unidade Curricular Sintetica {course} [Gualtar - Edificio {room % 16} - {room // 16}.{room % 7:02d}] {shift}"
+
+
+def make_schedule(courses: int, shifts_per_type: int = 2, seed: int = 0) -> Schedule:
+    """
+    Generates a synthetic schedule, every course gets a number of shifts of each type, every shift gets a single
+    event of one or two hours between 08:00 and 20:00.
+    :param courses: Number of courses on the schedule.
+    :type courses: int
+    :param shifts_per_type: Number of shifts of each type (T, TP, PL) per course.
+    :type shifts_per_type: int
+    :param seed: Seed for the random generator, keeps the output repeatable.
+    :type seed: int
+    :return: The generated schedule.
+    :rtype: Schedule
+    """
+    rng: random.Random = random.Random(seed)
+    schedule: Schedule = Schedule(list(WEEKDAYS))
+
+    for course in range(courses):
+        for shift_type in SHIFT_TYPES:
+            for shift_number in range(1, shifts_per_type + 1):
+                duration: int = rng.choice((60, 120))
+                start: int = rng.randrange(8 * 60, 20 * 60 - duration + 1, 30)
+
+                schedule.add_event(
+                    ScheduleEvent.build(
+                        body=make_event_body(course, f"{shift_type}{shift_number}", rng.randrange(64)),
+                        start=start,
+                        duration=duration,
+                        weekday=rng.choice(WEEKDAYS),
+                    )
+                )
+
+    return schedule
+
+
+def make_schedule_group(
+    years: int, courses: int, shifts_per_type: int = 2, seed: int = 0, course_name: str = "Licenciatura Sintetica"
+) -> ScheduleGroup:
+    """
+    Generates a synthetic schedule group with a schedule per year.
+    :param years: Number of years on the group.
+    :type years: int
+    :param courses: Number of courses per year.
+    :type courses: int
+    :param shifts_per_type: Number of shifts of each type per course.
+    :type shifts_per_type: int
+    :param seed: Seed for the random generator.
+    :type seed: int
+    :param course_name: Name of the course of the group.
+    :type course_name: str
+    :return: The generated schedule group.
+    :rtype: ScheduleGroup
+    """
+    group: ScheduleGroup = ScheduleGroup(course_name=course_name)
+
+    for year in range(1, years + 1):
+        group.add_event_to_year(year, make_schedule(courses, shifts_per_type, seed + year))
+
+    return group
+
+
+def make_university(groups: int, years: int = 4, courses: int = 25) -> list[ScheduleGroup]:
+    """
+    Generates a synthetic set of schedule groups, one per course of the university.
+    :param groups: Number of schedule groups.
+    :type groups: int
+    :param years: Number of years per group.
+    :type years: int
+    :param courses: Number of courses per year.
+    :type courses: int
+    :return: The generated schedule groups.
+    :rtype: list[ScheduleGroup]
+    """
+    return [
+        make_schedule_group(years, courses, seed=group * years, course_name=f"Licenciatura Sintetica {group}")
+        for group in range(groups)
+    ]
+
+
+def measure_time(func: Callable[[], Any], repeat: int = 5) -> float:
+    """
+    Runs a function several times and returns the best wall time.
+    :param func: Function to measure.
+    :type func: Callable[[], Any]
+    :param repeat: Number of runs.
+    :type repeat: int
+    :return: Best time in seconds.
+    :rtype: float
+    """
+    best: float = float("inf")
+
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def measure_times(
+    func: Callable[[], Any], repeat: int = 5, setup: Optional[Callable[[], Any]] = None
+) -> list[float]:
+    """
+    Runs a function several times and returns the wall time of every run, the setup runs before each run and isn't
+    measured. The garbage collector is disabled during the runs, so a collection doesn't land on a single run.
+    :param func: Function to measure.
+    :type func: Callable[[], Any]
+    :param repeat: Number of runs.
+    :type repeat: int
+    :param setup: Function run before each run, such as one clearing a memo.
+    :type setup: Optional[Callable[[], Any]]
+    :return: Time of each run in seconds.
+    :rtype: list[float]
+    """
+    times: list[float] = []
+    was_enabled: bool = gc.isenabled()
+
+    try:
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+
+            gc.collect()
+            gc.disable()
+
+            start: float = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+
+            if was_enabled:
+                gc.enable()
+
+    finally:
+        if was_enabled:
+            gc.enable()
+
+    return times
+
+
+def measure_memory(func: Callable[[], Any]) -> tuple[Any, int]:
+    """
+    Runs a function and measures the memory still allocated by its result.
+    :param func: Function to measure.
+    :type func: Callable[[], Any]
+    :return: A tuple with the result of the function and the allocated bytes.
+    :rtype: tuple[Any, int]
+    """
+    tracemalloc.start()
+
+    try:
+        result: Any = func()
+        current, _ = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return result, current
+
+
+def measure_peak_memory(func: Callable[[], Any]) -> tuple[Any, int]:
+    """
+    Runs a function and measures the highest amount of memory allocated while it ran.
+    :param func: Function to measure.
+    :type func: Callable[[], Any]
+    :return: A tuple with the result of the function and the peak allocated bytes.
+    :rtype: tuple[Any, int]
+    """
+    tracemalloc.start()
+
+    try:
+        result: Any = func()
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return result, peak
@@ -0,0 +1,130 @@
+"""
+Runs shifter as several server processes sharing a cache, along with a single scraper service process that owns the
+browser and is the only writer of the cache. The servers only read the cache, so the requests that don't need a scrape
+(cached schedules, conversions, solving) are spread across every core, while there's still a single browser. The scrape
+jobs are kept by the scraper service too, so a job submitted to one server can be polled through any of them.
+
+Usage: python -m src.api.cluster [--workers 4] [--host 127.0.0.1] [--port 8000] [--cache debug.db]
+    [--scraper-address /run/shifter/scraper.sock]
+
+The scraper service listens on a unix socket that only the user running shifter can connect to, by default in a
+private temporary directory.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Optional
+
+SCRAPER_SOCKET_NAME: str = "scraper.sock"
+STARTUP_TIMEOUT: float = 30  # Seconds to wait for the scraper service to listen.
+
+
+def run_scraper_service(address: str, cache_db: str) -> None:
+    """
+    Runs the scraper service until the process is terminated, with the scraper and parser the servers would have used
+    (same url and idle timeout).
+    :param address: Path of the unix socket to listen on.
+    :type address: str
+    :param cache_db: Path of the shared cache database.
+    :type cache_db: str
+    """
+    from src.api.scraper_factory import create_parser, create_scraper
+    from src.lib.cache.ttl_cache import Cache
+    from src.lib.scraper.scraper_service import ScraperService
+
+    service: ScraperService = ScraperService(create_scraper(), create_parser(), Cache(cache_db, shared=True), address)
+
+    async def serve() -> None:
+        # Terminating the process cancels the service, which shuts the browser down instead of leaving it running.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        await service.serve_forever()
+
+    try:
+        asyncio.run(serve())
+
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+def wait_for_service(address: str, process: multiprocessing.Process) -> None:
+    """
+    Waits for the scraper service to accept connections.
+    :raises RuntimeError: If the service exits or doesn't listen in time.
+    """
+    deadline: float = time.monotonic() + STARTUP_TIMEOUT
+
+    while True:
+        try:
+            with socket.socket(socket.AF_UNIX) as sock:
+                sock.connect(address)
+
+            return
+
+        except OSError:
+            if not process.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError(f"The scraper service didn't start listening on '{address}'.")
+
+            time.sleep(0.1)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="server processes (default: cpus)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on (default: 8000)")
+    parser.add_argument(
+        "--cache",
+        default=os.environ.get("SHIFTER_CACHE_DB", "debug.db"),
+        help="path of the shared cache (default: debug.db)"
+    )
+    parser.add_argument(
+        "--scraper-address",
+        default=None,
+        help="unix socket path of the scraper service, in a directory only the user can access "
+             "(default: a private temporary directory)"
+    )
+    arguments: argparse.Namespace = parser.parse_args()
+
+    import uvicorn
+
+    # Created readable by the user only, so no one else can reach the socket.
+    private_dir: Optional[str] = tempfile.mkdtemp(prefix="shifter-") if arguments.scraper_address is None else None
+    address: str = arguments.scraper_address or os.path.join(private_dir, SCRAPER_SOCKET_NAME)
+
+    service: multiprocessing.Process = multiprocessing.Process(
+        target=run_scraper_service,
+        args=(address, arguments.cache),
+        name="shifter-scraper-service",
+    )
+    service.start()
+
+    # Terminating the process exits it, instead of killing it, so the service and the socket are cleaned up.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+    try:
+        wait_for_service(address, service)
+
+        # Read by the routes of each server process, which then hand the scrapes to the service.
+        os.environ["SHIFTER_SCRAPER_ADDRESS"] = address
+        os.environ["SHIFTER_CACHE_DB"] = arguments.cache
+
+        uvicorn.run("src.api.server:app", host=arguments.host, port=arguments.port, workers=arguments.workers)
+
+    finally:
+        service.terminate()
+        service.join()
+
+        if private_dir is not None:
+            shutil.rmtree(private_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import time
+import uuid
+from typing import Any, Awaitable, Callable, MutableMapping, Optional
+
+from src.lib.metrics.registry import REGISTRY, Counter, Histogram
+from src.lib.tracing.tracer import TRACER, Span, Trace
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+REQUESTS: Counter = REGISTRY.counter(
+    "shifter_requests_total", "Http requests answered, by route and status.", ("method", "route", "status")
+)
+REQUEST_SECONDS: Histogram = REGISTRY.histogram(
+    "shifter_request_seconds", "Time spent answering http requests, until the whole body is sent.", ("method", "route")
+)
+
+
+class MetricsMiddleware:
+    """
+    This class is an ASGI middleware that counts and times the http requests, labelled by the path of their route
+    (e.g. '/api/v1/shifter/jobs/{job_id}') so the labels don't grow with the requests. Requests pass straight through
+    while the metrics are disabled.
+
+    :param app: The wrapped application.
+    :type app: ASGIApp
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not REGISTRY.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start: float = time.perf_counter()
+        status: int = 500  # Unless a response is started.
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+
+        finally:
+            route: Any = scope.get("route")  # Set by the router once the request is matched.
+            path: str = getattr(route, "path", "unmatched")
+
+            REQUESTS.inc(method=scope["method"], route=path, status=status)
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method=scope["method"], route=path)
+
+
+def get_header(scope: Scope, name: bytes) -> Optional[str]:
+    """
+    :return: The value of a request header, given its name in lowercase, None if it wasn't sent.
+    :rtype: Optional[str]
+    """
+    key: bytes
+    value: bytes
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+
+    return None
+
+
+class TracingMiddleware:
+    """
+    This class is an ASGI middleware that runs each http request inside a trace, whose spans are the stages of the
+    request. The id of the request is the X-Request-ID header sent by the client, or a new one, and the trace of the
+    client is continued if it sent a W3C traceparent header. The response carries the id of the request, the
+    traceparent of its span and a Server-Timing header with the time of every stage that ended before the response
+    started (the chunks of a streamed response are built afterwards). Requests pass straight through while the
+    tracer is disabled.
+
+    :param app: The wrapped application.
+    :type app: ASGIApp
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not TRACER.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        request_id: str = get_header(scope, b"x-request-id") or uuid.uuid4().hex
+
+        trace: Trace
+        with TRACER.trace(request_id, get_header(scope, b"traceparent")) as trace:
+            with TRACER.span("http.request", method=scope["method"], path=scope["path"]) as span:
+                span: Span
+
+                async def send_with_headers(message: Message) -> None:
+                    if message["type"] == "http.response.start":
+                        timing: str = trace.server_timing()
+                        total: str = f"total;dur={span.duration:.2f}"
+
+                        message["headers"] = [
+                            *message.get("headers", []),
+                            (b"x-request-id", request_id.encode("latin-1")),
+                            (b"traceparent", span.traceparent.encode("latin-1")),
+                            (b"server-timing", (f"{timing}, {total}" if timing else total).encode("latin-1")),
+                        ]
+
+                    await send(message)
+
+                await self.app(scope, receive, send_with_headers)
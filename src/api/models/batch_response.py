@@ -0,0 +1,75 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from src.api.models.job_response import JobResponse
+from src.api.models.schedule_response import ScheduleResponse
+from src.lib.builder.json.schedule_encoder import dumps
+
+
+class BatchItemResponse(BaseModel):
+    """
+    This is a model class that represents the outcome of one of the requests of a batch, in the same order.
+
+    :param status_code: The status the request would have been answered with on its own (200, 202, 400, 404, ...).
+    :type status_code: int
+    :param error: Why the schedule couldn't be obtained, if it couldn't.
+    :type error: Optional[str]
+    :param job: The scrape job of the schedule, if it isn't cached yet.
+    :type job: Optional[JobResponse]
+    :param result: The schedule, if it was obtained.
+    :type result: Optional[ScheduleResponse]
+    """
+
+    status_code: int
+    error: Optional[str] = None
+    job: Optional[JobResponse] = None
+    result: Optional[ScheduleResponse] = None
+
+    @staticmethod
+    def encode(
+            status_code: int,
+            error: Optional[str] = None,
+            job: Optional[bytes] = None,
+            result: Optional[bytes] = None) -> bytes:
+        """
+        Encodes an item as json, the same document FastAPI would send for the equivalent model.
+        :param status_code: The status of the request.
+        :type status_code: int
+        :param error: Why the schedule couldn't be obtained.
+        :type error: Optional[str]
+        :param job: The scrape job, already encoded by JobResponse.encode.
+        :type job: Optional[bytes]
+        :param result: The schedule, already encoded by ScheduleResponse.encode.
+        :type result: Optional[bytes]
+        :return: The json document, encoded in utf-8.
+        :rtype: bytes
+        """
+        return (
+            b'{"status_code":' + dumps(status_code) +
+            b',"error":' + dumps(error) +
+            b',"job":' + (job if job is not None else b"null") +
+            b',"result":' + (result if result is not None else b"null") + b"}"
+        )
+
+
+class BatchResponse(BaseModel):
+    """
+    This is a model class that represents the response body of a response to '/schedules/batch'.
+
+    :param results: The outcome of each request, in the order they were given.
+    :type results: list[BatchItemResponse]
+    """
+
+    results: list[BatchItemResponse]
+
+    @staticmethod
+    def encode(results: list[bytes]) -> bytes:
+        """
+        Encodes a response as json, the same document FastAPI would send for the equivalent model.
+        :param results: The items, already encoded by BatchItemResponse.encode.
+        :type results: list[bytes]
+        :return: The json document, encoded in utf-8.
+        :rtype: bytes
+        """
+        return b'{"results":[' + b",".join(results) + b"]}"
@@ -1,5 +1,6 @@
 from enum import Enum
 from functools import cached_property
+from typing import Annotated
 
 from pydantic import BaseModel, Field
 
@@ -10,6 +11,13 @@ class Format(str, Enum):
     XSLX = 'xlsx'
     ICS = 'ics'
     JSON = 'json'
+    ALL = 'all'  # Every format, bundled into a zip archive.
+
+
+class Layout(str, Enum):
+    MERGED = 'merged'  # Every year on the same sheet.
+    YEAR = 'year'  # A sheet per year.
+    COURSE = 'course'  # A sheet per course.
 
 
 class ConvertRequest(BaseModel):
@@ -20,10 +28,30 @@ class ConvertRequest(BaseModel):
     :type body: str
     :param shifts: The semester of the requested course.
     :type shifts: int
-    :param fmt: The year/years to fetch.
-    :type fmt: int
+    :param fmt: The format to convert to, several formats (or 'all') are bundled into a zip archive, at least one.
+    :type fmt: Format | list[Format]
+    :param layout: How the schedules are split into sheets, only used by the xlsx format.
+    :type layout: Layout
+    :param pretty: Whether to indent the document, only used by the json format.
+    :type pretty: bool
     """
 
     body: ScheduleRequest
     shifts: dict[int, dict[str, list[str]]]
-    fmt: Format = Format.JSON
+    fmt: Format | Annotated[list[Format], Field(min_length=1)] = Format.JSON  # An empty list is rejected.
+    layout: Layout = Layout.MERGED
+    pretty: bool = False
+
+    @property
+    def formats(self) -> list[Format]:
+        """
+        Class property representing the requested formats, without repetitions and with 'all' expanded.
+        :return: The formats.
+        :rtype: list[Format]
+        """
+        requested: list[Format] = self.fmt if isinstance(self.fmt, list) else [self.fmt]
+
+        if Format.ALL in requested:
+            return [fmt for fmt in Format if fmt is not Format.ALL]
+
+        return list(dict.fromkeys(requested))
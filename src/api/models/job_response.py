@@ -0,0 +1,50 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from src.api.models.schedule_response import ScheduleResponse
+from src.lib.builder.json.schedule_encoder import dumps
+from src.lib.jobs.job_queue import JobStatus
+
+
+class JobResponse(BaseModel):
+    """
+    This is a model class that represents the response body of a response to '/jobs/{job_id}', and of a request to
+    '/schedule/' whose schedule has to be scraped first.
+
+    :param job_id: The id of the job.
+    :type job_id: str
+    :param status: The state of the job.
+    :type status: JobStatus
+    :param error: Why the job failed, if it did.
+    :type error: Optional[str]
+    :param result: The requested schedule, once the job is done.
+    :type result: Optional[ScheduleResponse]
+    """
+
+    job_id: str
+    status: JobStatus
+    error: Optional[str] = None
+    result: Optional[ScheduleResponse] = None
+
+    @staticmethod
+    def encode(job_id: str, status: JobStatus, error: Optional[str] = None, result: Optional[bytes] = None) -> bytes:
+        """
+        Encodes a response as json, the same document FastAPI would send for the equivalent model.
+        :param job_id: The id of the job.
+        :type job_id: str
+        :param status: The state of the job.
+        :type status: JobStatus
+        :param error: Why the job failed, if it did.
+        :type error: Optional[str]
+        :param result: The requested schedule, already encoded by ScheduleResponse.encode.
+        :type result: Optional[bytes]
+        :return: The json document, encoded in utf-8.
+        :rtype: bytes
+        """
+        return (
+            b'{"job_id":' + dumps(job_id) +
+            b',"status":' + dumps(status.value) +
+            b',"error":' + dumps(error) +
+            b',"result":' + (result if result is not None else b"null") + b"}"
+        )
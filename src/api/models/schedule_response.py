@@ -1,5 +1,8 @@
 from pydantic import BaseModel, Field
 
+from src.lib.builder.json.schedule_encoder import ScheduleEncoder, format_datetime
+from src.lib.scraper.schedule import ScheduleGroup
+
 
 class ScheduleResponse(BaseModel):
     """
@@ -20,3 +23,42 @@ class ScheduleResponse(BaseModel):
 
     schedules: dict[int, dict]
     shifts: dict[int, dict[str, list[str]]]
+
+    @staticmethod
+    def encode_schedules(schedules: ScheduleGroup) -> bytes:
+        """
+        Encodes the fields of the response that depend on the schedules only (schedules and shifts), as a json
+        fragment. The fragment can be cached along with the schedules and reused by every response.
+        :param schedules: The schedules of the course.
+        :type schedules: ScheduleGroup
+        :return: The encoded fields, without the surrounding braces.
+        :rtype: bytes
+        """
+        encoder: ScheduleEncoder = ScheduleEncoder(format_time=format_datetime)
+
+        return (
+            b'"schedules":' + encoder.dumps(encoder.group_to_primitives(schedules)) +
+            b',"shifts":' + encoder.dumps({str(year): shifts for year, shifts in schedules.shifts.items()})
+        )
+
+    @staticmethod
+    def encode(course_name: str, course_date: str, encoded_schedules: bytes) -> bytes:
+        """
+        Encodes a response as json, the same document FastAPI would send for the equivalent model, without building
+        or validating the model.
+        :param course_name: The name of the requested course.
+        :type course_name: str
+        :param course_date: The date from which the schedule was fetched.
+        :type course_date: str
+        :param encoded_schedules: The fields obtained from encode_schedules.
+        :type encoded_schedules: bytes
+        :return: The json document, encoded in utf-8.
+        :rtype: bytes
+        """
+        encoder: ScheduleEncoder = ScheduleEncoder()
+
+        return (
+            b'{"course_name":' + encoder.dumps(course_name) +
+            b',"course_date":' + encoder.dumps(course_date) +
+            b"," + encoded_schedules + b"}"
+        )
@@ -0,0 +1,29 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.api.models.schedule_request import ScheduleRequest
+from src.lib.solver.shift_solver import Objective
+
+
+class SolveRequest(BaseModel):
+    """
+    This is a model class that represents the body of a POST request to '/schedule/solve/'.
+
+    :param body: The schedule to solve.
+    :type body: ScheduleRequest
+    :param year: The year of the schedule to solve.
+    :type year: int
+    :param courses: The courses to take, every course of the year by default.
+    :type courses: list[str], optional
+    :param objectives: The objectives used to rank the selections, compared in order.
+    :type objectives: list[Objective]
+    :param limit: Maximum number of selections to return.
+    :type limit: int
+    """
+
+    body: ScheduleRequest
+    year: int = Field(ge=1, le=4)
+    courses: Optional[list[str]] = None
+    objectives: list[Objective] = [Objective.DAYS, Objective.END]
+    limit: int = Field(default=10, ge=1, le=100)
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+
+class SolveResponse(BaseModel):
+    """
+    This is a model class that represents the response body of a response to '/schedule/solve/'.
+
+    :param objectives: The objectives used to rank the selections, in order.
+    :type objectives: list[str]
+    :param solutions: The selections, best first, in the same format as the shifts of a ConvertRequest year.
+    :type solutions: list[dict[str, list[str]]]
+    :param scores: The value of each objective for each of the selections.
+    :type scores: list[list[int]]
+    :param truncated: Whether the search ran out of its budget, the selections may then not be the best ones.
+    :type truncated: bool
+    """
+
+    objectives: list[str]
+    solutions: list[dict[str, list[str]]]
+    scores: list[list[int]]
+    truncated: bool = False
@@ -0,0 +1,31 @@
+from typing import Any
+
+from fastapi.responses import Response
+
+from src.lib.builder.json.schedule_encoder import dumps
+
+
+class EncodedJSONResponse(Response):
+    """
+    This class is a json response that is sent as is. FastAPI doesn't validate nor serialize a returned Response
+    against the response_model of the route, which keeps documenting it on the OpenAPI schema. The content must
+    already be valid for that model, either as json compatible values or as the already encoded document.
+
+    :param content: The body of the response, encoded bytes are sent unchanged.
+    :type content: Any
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """
+        Encodes the body of the response, with orjson when it is installed.
+        :param content: The body of the response.
+        :type content: Any
+        :return: The encoded body.
+        :rtype: bytes
+        """
+        if isinstance(content, bytes):
+            return content
+
+        return dumps(content)
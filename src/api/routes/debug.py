@@ -0,0 +1,76 @@
+import asyncio
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response
+
+from src.lib.profiling.profiler import ProfileFormat, ProfileSession
+
+router: APIRouter = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+)
+
+# The debug endpoints are disabled unless an admin token is set, requests must send it as a bearer token.
+ADMIN_TOKEN: Optional[str] = os.environ.get("SHIFTER_ADMIN_TOKEN") or None
+MAX_PROFILE_SECONDS: int = 60
+
+profile_lock: asyncio.Lock = asyncio.Lock()  # A single profile runs at a time.
+
+
+def check_admin(authorization: Optional[str]) -> None:
+    """
+    This auxiliary function rejects the requests that don't carry the admin token, as if the endpoint didn't exist
+    when there's no admin token.
+    """
+    if ADMIN_TOKEN is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    scheme, _, token = (authorization or "").partition(" ")
+
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="An admin token is required.")
+
+
+@router.get("/profile", response_class=Response)
+async def profile(
+        seconds: float = Query(default=10, gt=0, le=MAX_PROFILE_SECONDS),
+        fmt: ProfileFormat = ProfileFormat.COLLAPSED,
+        authorization: Optional[str] = Header(default=None)) -> Response:
+    """
+    This function handles the GET requests to /debug/profile, it profiles the worker for a number of seconds while
+    it keeps serving requests. A collapsed profile samples every thread (the event loop and the scrapes), a pstats
+    profile traces every call of the event loop thread.
+
+    :param seconds: How long to profile for.
+    :type seconds: float
+    :param fmt: The output of the profile.
+    :type fmt: ProfileFormat
+    :param authorization: The admin token, as 'Bearer <token>'.
+    :type authorization: Optional[str]
+    """
+    check_admin(authorization)
+
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running.")
+
+    async with profile_lock:
+        session: ProfileSession = ProfileSession(fmt)
+        session.start()
+
+        try:
+            await asyncio.sleep(seconds)
+
+        finally:
+            content: bytes = session.stop()
+
+    if fmt is ProfileFormat.COLLAPSED:
+        return Response(content=content, media_type="text/plain")
+
+    return Response(
+        content=content,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": 'attachment; filename="profile.pstats"'}
+    )
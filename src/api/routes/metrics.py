@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+
+from src.lib.metrics.registry import CONTENT_TYPE, REGISTRY
+
+router: APIRouter = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics() -> Response:
+    """
+    This function is the handler for GET requests to '/metrics', the metrics of the process in the text exposition
+    format read by Prometheus.
+    """
+    if not REGISTRY.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+
+    return Response(content=REGISTRY.expose(), media_type=CONTENT_TYPE)
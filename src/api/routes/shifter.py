@@ -1,67 +1,365 @@
-from typing import Optional
-
-from fastapi import APIRouter, HTTPException, Response
-
-from src.api.models.convert_request import ConvertRequest
+import asyncio
+import os
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import Executor
+from typing import Annotated, Any, AsyncIterator, Optional
+
+from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import HttpUrl
+
+from src.api.models.batch_response import BatchItemResponse, BatchResponse
+from src.api.models.convert_request import ConvertRequest, Format, Layout
+from src.api.models.job_response import JobResponse
 from src.api.models.schedule_request import ScheduleRequest
 from src.api.models.schedule_response import ScheduleResponse
+from src.api.models.solve_request import SolveRequest
+from src.api.models.solve_response import SolveResponse
+from src.api.responses import EncodedJSONResponse
+from src.api.scraper_factory import create_parser, create_scraper
+from src.api.utils import env_flag, is_public_host
 
 from src.lib.builder.builder import Builder
 from src.lib.builder.builder_factory import BuilderFactory
-from src.lib.builder.ical.ical_builder import IcalBuilder
-from src.lib.builder.json.json_builder import JsonBuilder
-from src.lib.builder.xlsx.xlsx_builder import XlsxBuilder
+from src.lib.builder.bundle.bundle_builder import BundleBuilder, make_executor
+from src.lib.builder.utils import split_by_course
 
 from src.lib.cache.ttl_cache import Cache
 
-from src.lib.exceptions import YearOutOfBoundsException, CourseNameDoesNotExistException
+from src.lib.exceptions import YearOutOfBoundsException, CourseNameDoesNotExistException, ScraperServiceException
+
+from src.lib.jobs.job_queue import Job, JobQueue, JobStatus
+
+from src.lib.metrics.registry import REGISTRY, CallbackMetric
 
 from src.lib.scraper.parser import ScheduleParser
 from src.lib.scraper.schedule import ScheduleGroup, Schedule
 from src.lib.scraper.scraper import ScheduleScraper
+from src.lib.scraper.scraper_service import ScraperClient
+
+from src.lib.solver.shift_solver import ShiftSolver, Solution
+
+from src.lib.tracing.tracer import TRACER
 
 router: APIRouter = APIRouter(
     prefix="/shifter",
     tags=["shifter"],
 )
 
-scraper: ScheduleScraper = ScheduleScraper(is_headless=True)  # Scraper
-parser: ScheduleParser = ScheduleParser()  # Parser
-cache: Cache = Cache("debug.db")  # Cache
+# Whether to start the browser as the server starts instead of on the first scrape.
+SCRAPER_WARM_UP: bool = env_flag("SHIFTER_SCRAPER_WARM_UP")
+
+# Socket of the scraper service, when the server is one of several processes. The service then does every scrape and
+# every write to the shared cache, this process only reads it.
+SCRAPER_ADDRESS: Optional[str] = os.environ.get("SHIFTER_SCRAPER_ADDRESS")
+CACHE_DB: str = os.environ.get("SHIFTER_CACHE_DB", "debug.db")
+
+scraper: ScheduleScraper = create_scraper()  # Scraper, its browser is only started once needed
+parser: ScheduleParser = create_parser()  # Parser
+scraper_client: Optional[ScraperClient] = ScraperClient(SCRAPER_ADDRESS) if SCRAPER_ADDRESS else None
+cache: Cache = Cache(CACHE_DB, shared=scraper_client is not None)  # Cache
+
+builder_factory: BuilderFactory = BuilderFactory.with_defaults()  # Builder
+
+bundle_executor: Optional[Executor] = None  # Runs the builders of a bundle, created on the first bundle request.
+notifications: set[asyncio.Task] = set()  # Callbacks waiting for a job of the scraper service to finish.
+
+SSE_KEEP_ALIVE: float = 15  # Seconds between the comments that keep an idle event stream open.
+CALLBACK_TIMEOUT: float = 10  # Seconds to wait for the url notified once a job finishes.
+MAX_BATCH_SIZE: int = 32  # Requests of a batch, each one may take a scrape job.
+
+
+def get_bundle_executor() -> Executor:
+    """
+    This auxiliary function obtains the executor shared by every bundle request, creating it if needed.
+    """
+    global bundle_executor
+
+    if bundle_executor is None:
+        bundle_executor = make_executor(len(builder_factory.keys))
+
+    return bundle_executor
+
+
+def startup() -> None:
+    """
+    This auxiliary function starts the browser of the scraper in the background if warming up is enabled, so the
+    server starts accepting requests right away.
+    """
+    if SCRAPER_WARM_UP and scraper_client is None:
+        threading.Thread(target=scraper.warm_up, name="scraper-warm-up", daemon=True).start()
+
+
+def shutdown() -> None:
+    """
+    This auxiliary function releases the resources of the router, the browser of the scraper and the bundle workers.
+    """
+    job_queue.close()
+    scraper.close()
 
-builder_factory: BuilderFactory = BuilderFactory()  # Builder
-builder_factory.register_builder("xlsx", XlsxBuilder)
-builder_factory.register_builder("ics", IcalBuilder)
-builder_factory.register_builder("json", JsonBuilder)
+    task: asyncio.Task
+    for task in notifications:
+        task.cancel()
 
+    if bundle_executor is not None:
+        bundle_executor.shutdown(cancel_futures=True)
 
-def cached_get(
+
+async def scrape_schedules(body: ScheduleRequest) -> Optional[ScheduleGroup]:
+    """
+    This auxiliary function runs a scrape job, the browser is used on another thread so the server keeps answering
+    requests meanwhile. The schedules are saved to the cache from the event loop, which owns the cache connection.
+    With a scraper service, the service scrapes and saves the schedules, which are then read from the cache.
+    """
+    if scraper_client is not None:
+        with TRACER.span("scraper.get", service=SCRAPER_ADDRESS):
+            found: bool = await scraper_client.scrape(
+                body.cache_key, body.course_name, body.actual_year, body.course_date
+            )
+
+        return cache.get(key=body.cache_key, default=None) if found else None
+
+    schedules: Optional[ScheduleGroup] = await asyncio.to_thread(
+        scraper.get,
+        course_name=body.course_name,
+        year=body.actual_year,
+        date_str=body.course_date,
+        parser=parser
+    )
+
+    if schedules is not None:  # No schedule was found for the given date.
+        cache.set(body.cache_key, schedules)  # Only saving to cache if result is not None.
+        cache.delete(f"{body.cache_key}.json")  # The encoding of the previous schedules, if any.
+
+    return schedules
+
+
+class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """
+    This class refuses the redirects of a callback url, which could lead to an address that wasn't checked.
+    """
+
+    def redirect_request(self, *args, **kwargs) -> None:
+        return None
+
+
+callback_opener: urllib.request.OpenerDirector = urllib.request.build_opener(NoRedirectHandler)
+
+
+def post_callback(url: str, content: bytes) -> None:
+    """
+    This auxiliary function sends a json document to a url, an unreachable url is ignored. The host is checked again
+    as it is sent, since what it resolves to may have changed since the url was accepted.
+    """
+    host: Optional[str] = urllib.parse.urlsplit(url).hostname
+
+    if host is None or not is_public_host(host):
+        return
+
+    callback: urllib.request.Request = urllib.request.Request(
+        url, data=content, headers={"Content-Type": "application/json"}, method="POST"
+    )
+
+    try:
+        with callback_opener.open(callback, timeout=CALLBACK_TIMEOUT):
+            pass
+
+    except OSError:  # The client is no longer listening.
+        pass
+
+
+async def notify_callbacks(job: Job) -> None:
+    """
+    This auxiliary function sends a finished job, as a JobResponse, to every url given along with its requests, at
+    the same time. The job queue runs it apart from its worker, so a slow url doesn't hold up the next scrapes.
+    """
+    if job.callbacks:
+        content: bytes = encode_job(job)
+        await asyncio.gather(*(asyncio.to_thread(post_callback, url, content) for url in job.callbacks))
+
+
+# Schedules missing from the cache are scraped by a single worker, since there's a single browser.
+job_queue: JobQueue = JobQueue(scrape_schedules, workers=1, on_finish=notify_callbacks)
+
+REGISTRY.register(CallbackMetric(
+    "shifter_jobs_active", "Scrape jobs pending or running.", (), lambda: {(): len(job_queue)}
+))
+
+
+def from_service_job(job: Job) -> Job:
+    """
+    This auxiliary function turns a scrape job of the scraper service into a job of this process, whose payload is
+    its request and whose result is its schedule, read from the cache.
+    """
+    job.payload = ScheduleRequest.model_validate(job.payload)
+    job.result = cache.get(key=job.key, default=None) if job.is_finished and job.result else None
+
+    return job
+
+
+async def submit_job(body: ScheduleRequest, callback_url: Optional[str] = None) -> Job:
+    """
+    This auxiliary function queues the scrape job of a schedule. With a scraper service the job is kept by the
+    service, so it can be looked up through any server process, and the url is notified by this process.
+    :raises ScraperServiceException: If the scraper service can't be reached.
+    """
+    if scraper_client is None:
+        return job_queue.submit(body.cache_key, body, callback_url=callback_url)
+
+    job: Job = from_service_job(await scraper_client.submit(
+        body.cache_key, body.course_name, body.actual_year, body.course_date, body.model_dump(mode="json")
+    ))
+
+    if callback_url is not None:
+        task: asyncio.Task = asyncio.get_running_loop().create_task(notify_when_finished(job, callback_url))
+        notifications.add(task)
+        task.add_done_callback(notifications.discard)
+
+    return job
+
+
+async def find_job(job_id: str) -> Optional[Job]:
+    """
+    This auxiliary function obtains the current state of a scrape job, None if it doesn't exist.
+    :raises ScraperServiceException: If the scraper service can't be reached.
+    """
+    if scraper_client is None:
+        return job_queue.get(job_id)
+
+    job: Optional[Job] = await scraper_client.get_job(job_id)
+
+    return from_service_job(job) if job is not None else None
+
+
+async def wait_finished(job: Job) -> Job:
+    """
+    This auxiliary function waits for a scrape job to finish, the job is returned as it was if it was forgotten.
+    :return: The job in its final state.
+    :rtype: Job
+    :raises ScraperServiceException: If the scraper service can't be reached.
+    """
+    if scraper_client is None:
+        await job.finished.wait()
+        return job
+
+    finished: Optional[Job] = await scraper_client.wait_job(job.id)
+
+    return from_service_job(finished) if finished is not None else job
+
+
+async def notify_when_finished(job: Job, url: str) -> None:
+    """
+    This auxiliary function sends a job of the scraper service to a url once it finishes, as a JobResponse.
+    """
+    try:
+        content: bytes = encode_job(await wait_finished(job))
+
+    except ScraperServiceException:  # The notification is lost, as the ones of a failed post.
+        return
+
+    await asyncio.to_thread(post_callback, url, content)
+
+
+@TRACER.traced("cached_get")
+async def cached_get(
         body: ScheduleRequest,
         cache_obj: Cache,
-        scraper_obj: ScheduleScraper,
-        parser_obj: ScheduleParser) -> Optional[ScheduleGroup]:
-    schedules: Optional[ScheduleGroup]
+        queue_obj: JobQueue) -> Optional[ScheduleGroup]:
     """
-    This auxiliary function requests a schedule from the cache and from the web if not present in cache.
-    TODO: Turn this into a decorator over another function that runs on the endpoints.    
+    This auxiliary function requests a schedule from the cache and from the web if not present in cache, through the
+    scrape job of the schedule, which is shared with any other request of the same schedule.
+    TODO: Turn this into a decorator over another function that runs on the endpoints.
     """
-
     if cache_obj.has(key=body.cache_key):  # If value is already cached we use it.
-        schedules = cache_obj.get(key=body.cache_key)
+        return cache_obj.get(key=body.cache_key)
 
-    else:  # Otherwise we scrape the schedule and built the response from it.
+    # Otherwise we scrape the schedule and built the response from it.
+    return await queue_obj.wait(queue_obj.submit(body.cache_key, body))
 
-        schedules = scraper_obj.get(
-            course_name=body.course_name,
-            year=body.actual_year,
-            date_str=body.course_date,
-            parser=parser_obj
-        )
 
-        if schedules is not None:  # No schedule was found for the given date.
-            cache_obj.set(body.cache_key, schedules)  # Only saving to cache if result is not None.
+def schedule_error(body: ScheduleRequest, error: Optional[Exception] = None) -> HTTPException:
+    """
+    This auxiliary function obtains the http error of a schedule that couldn't be obtained.
+    :param body: The request of the schedule.
+    :type body: ScheduleRequest
+    :param error: The error raised while obtaining the schedule, None if there's no schedule for the given date.
+    :type error: Optional[Exception]
+    :return: The http error.
+    :rtype: HTTPException
+    """
+    if error is None:  # No schedule was found for the given date.
+        return HTTPException(status_code=404,
+                             detail=f"No schedule found for '{body.course_name}' at '{body.course_date}'.")
+
+    if isinstance(error, YearOutOfBoundsException):  # The provided course_years does not exist for the course.
+        return HTTPException(status_code=400,
+                             detail=f"The course '{body.course_name}' doesn't have an year '{body.course_years}'.")
+
+    if isinstance(error, CourseNameDoesNotExistException):  # Somehow the course name doesn't exist.
+        return HTTPException(status_code=404, detail=f"The course '{body.course_name}' does not exist.")
+
+    return HTTPException(status_code=500, detail=f"The schedule of '{body.course_name}' could not be obtained.")
+
+
+def get_encoded_schedules(body: ScheduleRequest, schedules: ScheduleGroup) -> bytes:
+    """
+    This auxiliary function obtains the encoded schedules of a response, which are cached along with the schedules.
+    The encoding is stored as seen at the same time as the schedules, so both expire together, and it is deleted
+    whenever the schedules are scraped again.
+    """
+    encoded_key: str = f"{body.cache_key}.json"
+    encoded_schedules: Optional[bytes] = cache.get(key=encoded_key, default=None)
+
+    if encoded_schedules is None:
+        encoded_schedules = ScheduleResponse.encode_schedules(schedules)
+        last_seen: Optional[int] = cache.get_last_seen(body.cache_key)
+
+        if last_seen is not None:  # Otherwise the schedules expired meanwhile, the encoding would outlive them.
+            if scraper_client is not None:  # Only the scraper service writes to a shared cache.
+                scraper_client.set_soon(encoded_key, encoded_schedules, last_seen)
+
+            else:
+                cache.set(encoded_key, encoded_schedules, last_seen)
+
+    return encoded_schedules
 
-    return schedules
+
+def encode_job(job: Job) -> bytes:
+    """
+    This auxiliary function encodes the state of a scrape job as a JobResponse, with the schedule once it is done.
+    """
+    body: ScheduleRequest = job.payload
+
+    if not job.is_finished:
+        return JobResponse.encode(job.id, job.status)
+
+    if job.error is not None or job.result is None:
+        return JobResponse.encode(job.id, JobStatus.FAILED, error=schedule_error(body, job.error).detail)
+
+    return JobResponse.encode(job.id, job.status, result=ScheduleResponse.encode(
+        body.course_name, body.course_date, get_encoded_schedules(body, job.result)
+    ))
+
+
+@router.get("/health")
+async def get_health() -> dict[str, bool]:
+    """
+    This function is the handler for GET requests to '/health', it never starts the browser of the scraper.
+    :return: Whether the browser is running and, if so, whether it responds.
+    :rtype: dict[str, bool]
+    """
+    if scraper_client is not None:  # The browser is the one of the scraper service.
+        try:
+            return await scraper_client.get_health()
+
+        except ScraperServiceException:
+            return {"scraper_running": False, "scraper_healthy": False}
+
+    running: bool = scraper.is_running
+
+    return {"scraper_running": running, "scraper_healthy": running and scraper.is_healthy()}
 
 
 @router.get("/courses")
@@ -74,53 +372,223 @@ async def get_course_names() -> list[str]:
     if cache.has(key="courses"):
         return cache.get(key="courses")
 
-    course_name_list: list[str] = scraper.get_courses()
+    if scraper_client is not None:
+        try:
+            return await scraper_client.get_courses()
+
+        except ScraperServiceException:
+            raise HTTPException(status_code=503, detail="The course names could not be obtained.")
+
+    # The scraper may be busy with a scrape on another thread, the server keeps answering requests meanwhile.
+    course_name_list: list[str] = await asyncio.to_thread(scraper.get_courses)
     cache.set("courses", course_name_list)
 
     return course_name_list
 
 
-@router.post("/schedule/", response_model=ScheduleResponse)
-async def fetch_schedule(body: ScheduleRequest) -> ScheduleResponse:
+@router.post("/schedule/", response_model=ScheduleResponse, responses={202: {"model": JobResponse}})
+async def fetch_schedule(
+        body: ScheduleRequest,
+        request: Request,
+        wait: bool = False,
+        callback_url: Optional[HttpUrl] = None) -> EncodedJSONResponse:
     """
     This function represents the API endpoint '/schedule/' for POST requests.
     The server must receive as the body a JSON object compliant with ScheduleRequest.
+    A schedule that isn't cached yet has to be scraped, which takes a while, so the request is answered right away
+    with the scrape job (202), whose state is found at its Location. Requests of a schedule already being scraped
+    share its job.
 
     :param body: The body (as json) received from the client.
     :type body: ScheduleRequest
+    :param request: The http request.
+    :type request: Request
+    :param wait: Whether to wait for the schedule to be scraped, instead of answering with its job.
+    :type wait: bool
+    :param callback_url: Url to send the job to once it finishes, as a JobResponse, its host must be public.
+    :type callback_url: Optional[HttpUrl]
     """
 
     body.course_name = body.course_name.strip()
 
-    try:
+    # The server would otherwise post to its own internal network on behalf of the client.
+    if callback_url is not None and not await asyncio.to_thread(is_public_host, callback_url.host):
+        raise HTTPException(status_code=400, detail="The callback url must be of a public host.")
 
-        schedules: Optional[ScheduleGroup] = cached_get(
-            body=body,
-            cache_obj=cache,
-            scraper_obj=scraper,
-            parser_obj=parser
-        )
+    # The encoded schedules are cached along with them, a cache hit skips building and validating the response.
+    encoded_schedules: Optional[bytes] = cache.get(key=f"{body.cache_key}.json", default=None)
+
+    if encoded_schedules is None:
+
+        if not wait and not cache.has(key=body.cache_key):  # The schedule is scraped in the background.
+            try:
+                job: Job = await submit_job(body, callback_url=str(callback_url) if callback_url is not None else None)
+
+            except ScraperServiceException:
+                raise HTTPException(status_code=503, detail=f"The schedule of '{body.course_name}' can't be scraped.")
+
+            return EncodedJSONResponse(
+                JobResponse.encode(job.id, job.status),
+                status_code=202,
+                headers={"Location": str(request.url_for("get_job", job_id=job.id))}
+            )
+
+        try:
+
+            schedules: Optional[ScheduleGroup] = await cached_get(
+                body=body,
+                cache_obj=cache,
+                queue_obj=job_queue
+            )
+
+        except (YearOutOfBoundsException, CourseNameDoesNotExistException) as e:
+            raise schedule_error(body, e)
 
         if schedules is None:  # No schedule was found for the given date.
-            raise HTTPException(status_code=404,
-                                detail=f"No schedule found for '{body.course_name}' at '{body.course_date}'.")
+            raise schedule_error(body)
 
-    except YearOutOfBoundsException:  # The provided course_year does not exist for the specified course.
-        raise HTTPException(status_code=400,
-                            detail=f"The course '{body.course_name}' doesn't have an year '{body.course_year}'.")
+        encoded_schedules = get_encoded_schedules(body, schedules)
 
-    except CourseNameDoesNotExistException:  # Somehow the course name doesn't exist.
-        raise HTTPException(status_code=404, detail=f"The course '{body.course_name}' does not exist.")
+    # Building final response if everything went ok, it is sent as is (the model only documents it).
+    return EncodedJSONResponse(ScheduleResponse.encode(body.course_name, body.course_date, encoded_schedules))
 
-    # Building final response if everything went ok.
-    response: ScheduleResponse = ScheduleResponse(
-        course_name=body.course_name,
-        course_date=body.course_date,
-        schedules=schedules.as_dict(),
-        shifts=schedules.shifts
-    )
 
-    return response
+@router.post("/schedules/batch", response_model=BatchResponse)
+async def fetch_schedules(
+        bodies: Annotated[list[ScheduleRequest], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+        wait: bool = False) -> EncodedJSONResponse:
+    """
+    This function represents the API endpoint '/schedules/batch' for POST requests, several '/schedule/' requests
+    answered at once. The server must receive as the body a JSON list of ScheduleRequest.
+    The cached schedules are looked up together, and a scrape job is queued for each of the others, the jobs are run
+    by the job queue workers, as many at a time as there are browsers. The outcome of each request is given in order,
+    with the status it would have been answered with on its own.
+
+    :param bodies: The requests received from the client.
+    :type bodies: list[ScheduleRequest]
+    :param wait: Whether to wait for the schedules to be scraped, instead of answering with their jobs.
+    :type wait: bool
+    """
+    body: ScheduleRequest
+    for body in bodies:
+        body.course_name = body.course_name.strip()
+
+    # A single query for the encoded schedules, and another for the schedules that were never encoded, if any.
+    encoded: dict[str, bytes] = {
+        key.removesuffix(".json"): value
+        for key, value in cache.get_many(f"{body.cache_key}.json" for body in bodies).items()
+    }
+    cached: dict[str, Any] = cache.get_many(body.cache_key for body in bodies if body.cache_key not in encoded)
+
+    jobs: dict[str, Job] = {}
+
+    try:
+        for body in bodies:
+            if body.cache_key in cached:
+                encoded[body.cache_key] = get_encoded_schedules(body, cached[body.cache_key])
+
+            elif body.cache_key not in encoded and body.cache_key not in jobs:  # Scraping each missing schedule once.
+                jobs[body.cache_key] = await submit_job(body)
+
+        if wait and jobs:
+            jobs = dict(zip(jobs, await asyncio.gather(*(wait_finished(job) for job in jobs.values()))))
+
+    except ScraperServiceException:
+        raise HTTPException(status_code=503, detail="The schedules can't be scraped.")
+
+    results: list[bytes] = []
+
+    for body in bodies:
+        job: Optional[Job] = jobs.get(body.cache_key)
+
+        if job is not None and job.is_finished and job.error is None and job.result is not None:
+            encoded[body.cache_key] = get_encoded_schedules(body, job.result)
+
+        if body.cache_key in encoded:
+            results.append(BatchItemResponse.encode(200, result=ScheduleResponse.encode(
+                body.course_name, body.course_date, encoded[body.cache_key]
+            )))
+
+        elif not job.is_finished:
+            results.append(BatchItemResponse.encode(202, job=JobResponse.encode(job.id, job.status)))
+
+        else:  # The schedule couldn't be scraped.
+            error: HTTPException = schedule_error(body, job.error)
+            results.append(BatchItemResponse.encode(
+                error.status_code,
+                error=error.detail,
+                job=JobResponse.encode(job.id, JobStatus.FAILED, error=error.detail)
+            ))
+
+    return EncodedJSONResponse(BatchResponse.encode(results))
+
+
+async def get_existing_job(job_id: str) -> Job:
+    """
+    This auxiliary function obtains the current state of a scrape job.
+    :raises HTTPException: If the job doesn't exist (404) or the scraper service can't be reached (503).
+    """
+    try:
+        job: Optional[Job] = await find_job(job_id)
+
+    except ScraperServiceException:
+        raise HTTPException(status_code=503, detail=f"The job '{job_id}' can't be obtained.")
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"The job '{job_id}' does not exist.")
+
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str) -> EncodedJSONResponse:
+    """
+    This function handles the GET requests to /jobs/{job_id}, the state of a scrape job.
+    Once the job is done the response includes the schedule, as a ScheduleResponse.
+
+    :param job_id: The id of the job.
+    :type job_id: str
+    """
+    job: Job = await get_existing_job(job_id)
+
+    return EncodedJSONResponse(encode_job(job))
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job(job_id: str) -> StreamingResponse:
+    """
+    This function handles the GET requests to /jobs/{job_id}/events, a stream of server-sent events with the state
+    of a scrape job, as a JobResponse. The stream sends the current state and, once the job finishes, its final state.
+
+    :param job_id: The id of the job.
+    :type job_id: str
+    """
+    job: Job = await get_existing_job(job_id)
+
+    def to_event(state: Job) -> bytes:
+        return b"data: " + encode_job(state) + b"\n\n"
+
+    async def events() -> AsyncIterator[bytes]:
+        yield to_event(job)
+
+        if job.is_finished:
+            return
+
+        finished: asyncio.Task = asyncio.get_running_loop().create_task(wait_finished(job))
+
+        try:
+            while not (await asyncio.wait({finished}, timeout=SSE_KEEP_ALIVE))[0]:
+                yield b": keep-alive\n\n"
+
+            yield to_event(finished.result())
+
+        except ScraperServiceException:  # The stream ends without the final state, which can still be requested.
+            pass
+
+        finally:  # The client may have closed the stream first.
+            finished.cancel()
+
+    return StreamingResponse(content=events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @router.post("/schedule/convert/")
@@ -128,7 +596,8 @@ async def convert_schedule(request: ConvertRequest):
     """
     This function handles the POST requests to /schedule/convert/, the request must be formatted as a ConvertRequest.
     This function when given a schedule and shifts, filters the shifts and converts the schedule into the specified
-    format (xlsx, ics, json).
+    format (xlsx, ics, json). When several formats (or 'all') are requested, they are built concurrently and sent
+    as a zip archive.
 
     :param request: The body of the post request.
     :type request: ConvertRequest
@@ -136,11 +605,10 @@ async def convert_schedule(request: ConvertRequest):
 
     try:
 
-        schedules: Optional[ScheduleGroup] = cached_get(
+        schedules: Optional[ScheduleGroup] = await cached_get(
             body=request.body,
             cache_obj=cache,
-            scraper_obj=scraper,
-            parser_obj=parser
+            queue_obj=job_queue
         )
 
         if schedules is None:  # No schedule was found for the given date.
@@ -155,27 +623,106 @@ async def convert_schedule(request: ConvertRequest):
         raise HTTPException(status_code=404, detail=f"The course '{request.body.course_name}' does not exist.")
 
     # Filtering the schedules by the provided shifts.
-    used_schedules: list[Schedule] = []
+    used_schedules: dict[int, Schedule] = {}
 
-    year: int
-    shifts: dict[str, list[str]]
-    for year, shifts in request.shifts.items():
-        used_schedules.append(schedules.years[year].filter(shifts))
+    with TRACER.span("schedule.filter"):
+        year: int
+        shifts: dict[str, list[str]]
+        for year, shifts in request.shifts.items():
+            used_schedules[year] = schedules.years[year].filter(shifts)
 
-    # Obtaining the correct builder for the specified format type.
-    builder: Builder = builder_factory.create(
-        str(request.fmt.value),  # json | xlsx | ical
-        schedule=used_schedules
-    )
+    # Every schedule is merged into one, unless an xlsx with a sheet per year or per course was requested.
+    merged: list[Schedule] = list(used_schedules.values())
+    to_build_xlsx: list[Schedule] | dict[str, Schedule] = merged
+
+    if request.layout is Layout.YEAR:
+        to_build_xlsx = {f"Year {year}": schedule for year, schedule in used_schedules.items()}
+
+    elif request.layout is Layout.COURSE:
+        to_build_xlsx = split_by_course(merged)
+
+    # Arguments of the builder of each format, besides the (merged) schedule.
+    arguments: dict[str, dict] = {
+        Format.XSLX.value: {"schedule": to_build_xlsx},
+        Format.JSON.value: {"pretty": request.pretty},
+    }
+
+    formats: list[Format] = request.formats
+    extension: str
 
-    result: bytes = builder.build()  # Converting the schedule into its respective format.
+    if len(formats) == 1:
+        extension = str(formats[0].value)  # json | xlsx | ics
 
-    response: Response = Response(content=result)
-    response.headers["Content-Type"] = f"application/{builder.content_type}"  # Defining content type.
-    response.headers["Content-Disposition"] = f'attachment; filename="schedule.{str(request.fmt.value)}"'  # Filename.
+        # Obtaining the correct builder for the specified format type.
+        builder: Builder = builder_factory.create(extension, **{"schedule": merged, **arguments.get(extension, {})})
+
+    else:  # Several formats are built at the same time and bundled into a zip archive.
+        extension = "zip"
+
+        builder: Builder = BundleBuilder(
+            merged,
+            [str(fmt.value) for fmt in formats],
+            builder_factory,
+            executor=get_bundle_executor(),
+            arguments=arguments,
+        )
+
+    # Converting the schedule into its respective format, the chunks are sent as soon as they are built.
+    response: StreamingResponse = StreamingResponse(content=builder.stream(), media_type=builder.content_type)
+    response.headers["Content-Disposition"] = f'attachment; filename="schedule.{extension}"'  # Filename.
 
     return response
 
 
-router.add_event_handler("shutdown", lambda: scraper.close())
+@router.post("/schedule/solve/", response_model=SolveResponse)
+async def solve_schedule(request: SolveRequest) -> EncodedJSONResponse:
+    """
+    This function handles the POST requests to /schedule/solve/, the request must be formatted as a SolveRequest.
+    This function finds the best shift selections of a year of the schedule, one shift of each type per course and
+    without overlapping events. Each of the returned selections can be used as the shifts of a ConvertRequest.
+
+    :param request: The body of the post request.
+    :type request: SolveRequest
+    """
+
+    try:
+
+        schedules: Optional[ScheduleGroup] = await cached_get(
+            body=request.body,
+            cache_obj=cache,
+            queue_obj=job_queue
+        )
+
+        if schedules is None:  # No schedule was found for the given date.
+            raise HTTPException(status_code=404,
+                                detail=f"No schedule found for '{request.body.course_name}' at '{request.body.course_date}'.")
+
+        if request.year not in schedules.years:
+            raise YearOutOfBoundsException(f"Year {request.year} is not on the schedule.")
+
+        solver: ShiftSolver = ShiftSolver(schedules.years[request.year], courses=request.courses)
+
+    except YearOutOfBoundsException:  # The provided year does not exist for the specified course.
+        raise HTTPException(status_code=400,
+                            detail=f"The course '{request.body.course_name}' doesn't have an year '{request.year}'.")
+
+    except CourseNameDoesNotExistException as e:  # Either the course or one of the subjects doesn't exist.
+        raise HTTPException(status_code=404, detail=str(e))
+
+    # The search is cpu bound, it runs on another thread so the server keeps answering requests meanwhile.
+    solutions: list[Solution] = await asyncio.to_thread(
+        solver.solve, objectives=request.objectives, limit=request.limit
+    )
+
+    # The values already have the types of a SolveResponse, so they are sent without building the model.
+    return EncodedJSONResponse({
+        "objectives": [objective.value for objective in request.objectives],
+        "solutions": [solution.shifts for solution in solutions],
+        "scores": [list(solution.score) for solution in solutions],
+        "truncated": solver.truncated,
+    })
+
+
+router.add_event_handler("startup", startup)
+router.add_event_handler("shutdown", shutdown)
 
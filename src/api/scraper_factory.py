@@ -0,0 +1,27 @@
+import os
+
+from src.lib.scraper.parser import ScheduleParser
+from src.lib.scraper.scraper import PORTAL_URL, ScheduleScraper
+
+# Seconds without scraping after which the browser is shut down (0 keeps it running), and the schedules page to scrape.
+SCRAPER_IDLE_TIMEOUT: float = float(os.environ.get("SHIFTER_SCRAPER_IDLE_TIMEOUT", 600))
+SCRAPER_URL: str = os.environ.get("SHIFTER_SCRAPER_URL", PORTAL_URL)
+
+
+def create_scraper() -> ScheduleScraper:
+    """
+    Creates the scraper of a process from the environment settings, shared by the routes and the scraper service so
+    both scrape the same page the same way. Its browser is only started once needed.
+    :return: The scraper.
+    :rtype: ScheduleScraper
+    """
+    return ScheduleScraper(is_headless=True, idle_timeout=SCRAPER_IDLE_TIMEOUT or None, url=SCRAPER_URL)
+
+
+def create_parser() -> ScheduleParser:
+    """
+    Creates the parser of the scraped schedules.
+    :return: The parser.
+    :rtype: ScheduleParser
+    """
+    return ScheduleParser()
@@ -1,7 +1,19 @@
 from fastapi import FastAPI
 
-from src.api.routes import shifter
+from src.api.middleware import MetricsMiddleware, TracingMiddleware
+from src.api.routes import debug, metrics, shifter
+from src.api.utils import env_flag
+
+from src.lib.metrics.registry import REGISTRY
+from src.lib.tracing.tracer import TRACER
+
+REGISTRY.enabled = env_flag("SHIFTER_METRICS")  # Metrics are only collected (and served) when enabled.
+TRACER.enabled = env_flag("SHIFTER_TRACING")  # Spans aren't exported, only sent as Server-Timing when enabled.
 
 app: FastAPI = FastAPI()  # uvicorn main:app --reload
 
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.include_router(shifter.router, prefix='/api/v1')
+app.include_router(metrics.router)
+app.include_router(debug.router)
@@ -1,4 +1,8 @@
+import ipaddress
+import os
+import socket
 from enum import Enum
+from typing import Optional
 
 
 class SemesterDates(Enum):
@@ -10,3 +14,49 @@ class SemesterDates(Enum):
         return [date for date in SemesterDates][key - 1]
 
 
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """
+    Reads a boolean setting from an environment variable, '1', 'true' and 'yes' are true.
+    :param name: Name of the variable.
+    :type name: str
+    :param default: Value of the setting if the variable isn't set.
+    :type default: bool
+    :return: The setting.
+    :rtype: bool
+    """
+    value: Optional[str] = os.environ.get(name)
+
+    if value is None:
+        return default
+
+    return value.strip().lower() in ("1", "true", "yes")
+
+
+def is_public_host(host: str) -> bool:
+    """
+    Checks whether a host only resolves to public addresses, not to private, loopback, link-local or other reserved
+    ones, so a url given by a client can't be used to reach the internal network of the server.
+    :param host: Name or address of the host.
+    :type host: str
+    :return: Whether every address of the host is public, False if it doesn't resolve.
+    :rtype: bool
+    """
+    try:
+        addresses: list[tuple] = socket.getaddrinfo(host.strip("[]"), None, proto=socket.IPPROTO_TCP)
+
+    except (OSError, UnicodeError):
+        return False
+
+    info: tuple
+    for info in addresses:
+        address: ipaddress.IPv4Address | ipaddress.IPv6Address = ipaddress.ip_address(info[4][0].split("%")[0])
+
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+
+        if not address.is_global or address.is_multicast:
+            return False
+
+    return bool(addresses)
@@ -1,4 +1,6 @@
+import argparse
 from datetime import datetime
+from typing import Optional
 
 import questionary
 from rich.console import Console
@@ -8,12 +10,12 @@ from rich.text import Text
 
 from src.lib.builder.builder import Builder
 from src.lib.builder.builder_factory import BuilderFactory
-from src.lib.builder.ical.ical_builder import IcalBuilder
-from src.lib.builder.json.json_builder import JsonBuilder
-from src.lib.builder.xlsx.xlsx_builder import XlsxBuilder
+from src.lib.builder.bundle.bundle_builder import build_concurrently, make_executor
+from src.lib.profiling.profiler import add_profile_arguments, profile_from_arguments
 from src.lib.scraper.parser import ScheduleParser
 from src.lib.scraper.schedule import Schedule, ScheduleGroup
 from src.lib.scraper.scraper import ScheduleScraper
+from src.lib.solver.shift_solver import Objective, ShiftSolver, Solution
 
 FIRST_SEMESTER_DATE: str = "01-11-2023"
 SECOND_SEMESTER_DATE: str = "01-03-2024"
@@ -52,11 +54,65 @@ def prompt_semester() -> str:
     return FIRST_SEMESTER_DATE if r_semester.startswith("1") else SECOND_SEMESTER_DATE
 
 
+def prompt_solution(
+    schedule: Schedule, exceptions: list[str], console: Console
+) -> dict[str, list[str]]:
+    objective: str = questionary.select(
+        "Rank the selections by",
+        choices=["Fewest days", "Earliest end", "Earliest last class"],
+    ).ask()
+
+    objectives: tuple[Objective, ...] = {
+        "Fewest days": (Objective.DAYS, Objective.END),
+        "Earliest end": (Objective.END, Objective.DAYS),
+        "Earliest last class": (Objective.LAST, Objective.DAYS),
+    }[objective]
+
+    solver: ShiftSolver = ShiftSolver(schedule)
+    solutions: list[Solution] = solver.solve(objectives, limit=5)
+
+    if not solutions:
+        if solver.truncated:
+            console.print("[bold red]No selection of shifts without overlaps was found in time.")
+
+        else:
+            console.print("[bold red]There is no selection of shifts without overlaps.")
+
+        return {}
+
+    if solver.truncated:
+        console.print("[yellow]The search ran out of time, there may be better selections.")
+
+    table = Table(title="Best Selections")
+
+    table.add_column("#", justify="right", style="green")
+    table.add_column("Class Name", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Shifts", style="magenta")
+    table.add_column("Score", style="yellow")
+
+    i: int
+    solution: Solution
+    for i, solution in enumerate(solutions, start=1):
+        for j, c in enumerate(solution.shifts):
+            table.add_row(
+                str(i) if j == 0 else "",
+                title_case_except(c, exceptions),
+                ", ".join(solution.shifts[c]),
+                ", ".join(map(str, solution.score)) if j == 0 else "",
+                end_section=j == len(solution.shifts) - 1,
+            )
+
+    console.print(table)
+
+    choice: str = questionary.select(
+        "Choose a selection", choices=[str(i) for i in range(1, len(solutions) + 1)]
+    ).ask()
+
+    return {c: list(shifts) for c, shifts in solutions[int(choice) - 1].shifts.items()}
+
+
 def main() -> None:
-    builder_factory: BuilderFactory = BuilderFactory()
-    builder_factory.register_builder("xlsx", XlsxBuilder)
-    builder_factory.register_builder("ics", IcalBuilder)
-    builder_factory.register_builder("json", JsonBuilder)
+    builder_factory: BuilderFactory = BuilderFactory.with_defaults()
 
     exceptions: list[str] = ["e", "de", "da", "do", "das", "dos", "em", "na", "para"]
 
@@ -109,7 +165,19 @@ def main() -> None:
     )
 
     shifts: dict[int, dict[str, list[str]]] = schedule.shifts[year]
+
+    mode: str = questionary.select(
+        "How do you want to choose the shifts",
+        choices=["Manually", "Automatically (no overlaps)"],
+    ).ask()
+
     confirm: bool = False
+    if mode != "Manually":
+        solved: dict[str, list[str]] = prompt_solution(schedule.years[year], exceptions, console)
+
+        if solved:  # Falling back to the manual selection when there are none.
+            shifts, confirm = solved, True
+
     while not confirm:
         console.print(f" [underline]Year {year}")
 
@@ -137,7 +205,7 @@ def main() -> None:
     filtered_schedule: Schedule = schedule.years[year].filter(shifts)
 
     formats: list[str] = questionary.checkbox(
-        "Download schedules as", choices=["xlsx", "json", "ics"]
+        "Download schedules as", choices=builder_factory.keys
     ).ask()
 
     path: str = (
@@ -150,21 +218,53 @@ def main() -> None:
         TimeElapsedColumn(),
     )
 
-    for fmt in formats:
+    # Arguments of the builder of each format, besides the schedule.
+    arguments: dict[str, dict] = {"json": {"pretty": True}}
+
+    if len(formats) == 1:  # A single file is written as it is built.
+        fmt: str = formats[0]
+
         with progress as p:
-            task = p.add_task(
-                f"Generating {path}/schedule.{fmt}",
-                total=None,
-            )
+            p.add_task(f"Generating {path}/schedule.{fmt}", total=None)
 
-            builder: Builder = builder_factory.create(fmt, schedule=filtered_schedule)
-            content: bytes = builder.build()
+            builder: Builder = builder_factory.create(fmt, schedule=filtered_schedule, **arguments.get(fmt, {}))
 
             with open(f"{path}/schedule.{fmt}", "wb") as file:
-                file.write(content)
+                for chunk in builder.stream():
+                    file.write(chunk)
+
+    elif formats:  # Otherwise, every format is built at the same time and written as soon as it is done.
+        with progress as p, make_executor(len(formats)) as executor:
+            tasks: dict[str, int] = {
+                fmt: p.add_task(f"Generating {path}/schedule.{fmt}", total=1) for fmt in formats
+            }
+
+            content: bytes
+            for fmt, content in build_concurrently(
+                {
+                    fmt: (builder_factory.get(fmt), {"schedule": filtered_schedule, **arguments.get(fmt, {})})
+                    for fmt in formats
+                },
+                executor,
+            ):
+                with open(f"{path}/schedule.{fmt}", "wb") as file:
+                    file.write(content)
+
+                p.update(tasks[fmt], completed=1)
 
     scraper.close()
 
 
+def run(argv: Optional[list[str]] = None) -> None:
+    """
+    Runs the command line interface with the command line arguments, profiling it if asked to.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Fetches and converts UMinho schedules.")
+    add_profile_arguments(parser)
+
+    with profile_from_arguments(parser.parse_args(argv)):
+        main()
+
+
 if __name__ == "__main__":
-    SystemExit(main())
+    SystemExit(run())
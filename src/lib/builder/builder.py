@@ -1,7 +1,41 @@
+import functools
 from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterator
 
 from src.lib.scraper.schedule import Schedule
-from src.lib.builder.utils import merge_schedules
+from src.lib.builder.memo import get_merged_schedule
+from src.lib.metrics.registry import REGISTRY, Histogram
+from src.lib.tracing.tracer import TRACER
+
+BUILD_SECONDS: Histogram = REGISTRY.histogram(
+    "shifter_build_seconds", "Time spent building a schedule, by builder and method.", ("builder", "method")
+)
+
+
+def measure_build(builder: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wraps the build (or stream) method of a builder class, observing the time it spends, only producing the chunks
+    in the case of stream, while the metrics are enabled, and running it inside a span while the tracer is enabled.
+    """
+    histogram_labels: dict[str, str] = {"builder": builder, "method": method.__name__}
+    span_name: str = f"builder.{method.__name__}"
+
+    @functools.wraps(method)
+    def wrapper(self: "Builder", *args: Any, **kwargs: Any) -> Any:
+        if not REGISTRY.enabled and not TRACER.enabled:
+            return method(self, *args, **kwargs)
+
+        if method.__name__ == "stream":
+            return TRACER.iter_traced(
+                REGISTRY.iter_timed(method(self, *args, **kwargs), BUILD_SECONDS, **histogram_labels),
+                span_name,
+                builder=builder
+            )
+
+        with TRACER.span(span_name, builder=builder), REGISTRY.time_block(BUILD_SECONDS, **histogram_labels):
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class Builder(ABC):
@@ -9,18 +43,32 @@ class Builder(ABC):
     This is the abstract base class for any class that builds over the Schedule class.
 
     :param schedule: This value can either be a schedule object or a list of it, if the value is a list then every
-        schedule constituting is merged.
+        schedule constituting is merged. Merges are memoized, builders of schedules with the same content share it.
     :type schedule: Schedule | list[Schedule]
     """
 
     __slots__ = ("schedule", "content_type")
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Measures and traces the build and stream methods of every builder, labelled by the name of the builder
+        (XlsxBuilder is 'xlsx').
+        """
+        super().__init_subclass__(**kwargs)
+
+        name: str = cls.__name__.removesuffix("Builder").lower()
+
+        method_name: str
+        for method_name in ("build", "stream"):
+            if method_name in cls.__dict__:
+                setattr(cls, method_name, measure_build(name, cls.__dict__[method_name]))
+
     @abstractmethod
     def __init__(self, schedule: Schedule | list[Schedule], *args, **kwargs):
         self.content_type: str = ""
 
         if isinstance(schedule, list):
-            self.schedule: Schedule = merge_schedules(schedule)
+            self.schedule: Schedule = get_merged_schedule(schedule)
 
         else:
             self.schedule: Schedule = schedule
@@ -28,3 +76,14 @@ class Builder(ABC):
     @abstractmethod
     def build(self):
         ...
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        Builds the schedule as a sequence of chunks, so that it can be sent while it is still being built. Builders
+        that can produce their output incrementally override this method, by default the result of build is sent
+        as a single chunk.
+
+        :return: The chunks of the built schedule.
+        :rtype: Iterator[bytes]
+        """
+        yield self.build()
@@ -1,20 +1,112 @@
-from typing import Type, Any
+import importlib
+from typing import TYPE_CHECKING, Any, Optional, Type
 
 from src.lib.builder.builder import Builder
 
+if TYPE_CHECKING:  # importlib.metadata is only imported once entry points are looked up, it takes a while.
+    from importlib.metadata import EntryPoint
+
+ENTRY_POINT_GROUP: str = "shifter.builders"
+
+# Builders shipped with shifter, by format. They are only imported once they are needed, since their dependencies
+# (xlsxwriter, icalendar, pytz) take a while to import.
+DEFAULT_BUILDERS: dict[str, str] = {
+    "xlsx": "src.lib.builder.xlsx.xlsx_builder:XlsxBuilder",
+    "ics": "src.lib.builder.ical.ical_builder:IcalBuilder",
+    "json": "src.lib.builder.json.json_builder:JsonBuilder",
+}
+
+
+def import_builder(path: str) -> Type[Builder]:
+    """
+    Imports a builder class from its dotted path, either 'package.module:Class' or 'package.module.Class'.
+    :param path: The dotted path.
+    :type path: str
+    :return: The builder class.
+    :rtype: Type[Builder]
+    """
+    module_name, _, class_name = path.rpartition(":") if ":" in path else path.rpartition(".")
+    return getattr(importlib.import_module(module_name), class_name)
+
 
 class BuilderFactory:
+    """
+    This class holds the builder of each format. A builder can be registered as its class, as the dotted path of the
+    class or through an entry point, the last two are only imported on their first use.
+    """
 
     def __init__(self) -> None:
-        self.__builders: dict[str, Type[Builder]] = {}
+        self.__builders: dict[str, Type[Builder] | str | "EntryPoint"] = {}
+        self.__entry_point_group: Optional[str] = None  # Group of entry points still to be looked up.
+
+    @classmethod
+    def with_defaults(cls, load_entry_points: bool = True) -> "BuilderFactory":
+        """
+        Creates a factory with the builders shipped with shifter and, optionally, the ones installed by other
+        packages through the 'shifter.builders' entry point group, none of them imported yet. Entry points are looked
+        up once a format is missing or every format is listed.
+        :param load_entry_points: Whether to register the builders of the entry points.
+        :type load_entry_points: bool, optional
+        :return: The factory.
+        :rtype: BuilderFactory
+        """
+        factory: BuilderFactory = cls()
+
+        key: str
+        path: str
+        for key, path in DEFAULT_BUILDERS.items():
+            factory.register_builder(key, path)
+
+        if load_entry_points:
+            factory.__entry_point_group = ENTRY_POINT_GROUP
+
+        return factory
 
-    def register_builder(self, key: str, builder: Type[Builder]) -> None:
+    def register_builder(self, key: str, builder: Type[Builder] | str) -> None:
         self.__builders[key] = builder
 
-    def create(self, key: str, **kwargs) -> Builder:
-        builder_class: Type[Builder] = self.__builders.get(key)
+    def register_entry_points(self, group: str = ENTRY_POINT_GROUP) -> None:
+        """
+        Registers the builders of an entry point group, each entry point name is a format.
+        :param group: The entry point group.
+        :type group: str, optional
+        """
+        from importlib.metadata import entry_points
 
-        if not builder_class:
+        entry_point: "EntryPoint"
+        for entry_point in entry_points(group=group):
+            self.__builders.setdefault(entry_point.name, entry_point)  # Registered builders take precedence.
+
+    def __look_up_entry_points(self) -> None:
+        """
+        Registers the builders of the pending entry point group, if any.
+        """
+        if self.__entry_point_group is not None:
+            group: str = self.__entry_point_group
+            self.__entry_point_group = None
+            self.register_entry_points(group)
+
+    @property
+    def keys(self) -> list[str]:
+        self.__look_up_entry_points()
+        return list(self.__builders)
+
+    def get(self, key: str) -> Type[Builder]:
+        if key not in self.__builders:
+            self.__look_up_entry_points()
+
+        builder: Type[Builder] | str | "EntryPoint" = self.__builders.get(key)
+
+        if not builder:
             raise ValueError(f"No builder registered for key: {key}")
 
-        return builder_class(**kwargs)
+        if isinstance(builder, str):  # Importing the builder on its first use.
+            builder = self.__builders[key] = import_builder(builder)
+
+        elif not isinstance(builder, type):  # An entry point.
+            builder = self.__builders[key] = builder.load()
+
+        return builder
+
+    def create(self, key: str, **kwargs: Any) -> Builder:
+        return self.get(key)(**kwargs)
@@ -0,0 +1,171 @@
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Iterator, Optional, Type
+
+from src.lib.builder.builder import Builder
+from src.lib.builder.builder_factory import BuilderFactory
+from src.lib.scraper.schedule import Schedule
+
+
+def _build(builder_class: Type[Builder], kwargs: dict[str, Any]) -> bytes:
+    """
+    Builds a schedule with a builder, on a worker of the pool. Only the builder class and its arguments travel to the
+    worker, which is what allows the use of a process pool.
+    """
+    return builder_class(**kwargs).build()
+
+
+def make_executor(max_workers: int) -> Executor:
+    """
+    Creates the executor used to run builders concurrently, a process pool when the machine has more than one core
+    (builders are CPU bound, so threads would take turns on the GIL) and a thread pool otherwise. Workers are spawned
+    rather than forked, since forking a process that runs other threads (such as a server) isn't safe.
+    :param max_workers: Maximum number of builders running at the same time.
+    :type max_workers: int
+    :return: The executor.
+    :rtype: Executor
+    """
+    if (os.cpu_count() or 1) > 1:
+        return ProcessPoolExecutor(
+            max_workers=min(max_workers, os.cpu_count()),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def build_concurrently(
+    jobs: dict[str, tuple[Type[Builder], dict[str, Any]]], executor: Executor
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Runs several builders at the same time on an executor, yielding their results as soon as each one finishes.
+    :param jobs: The builder class and its arguments, by format.
+    :type jobs: dict[str, tuple[Type[Builder], dict[str, Any]]]
+    :param executor: Where to run the builders, a process pool runs them in parallel.
+    :type executor: Executor
+    :return: The formats along with their content, in order of completion.
+    :rtype: Iterator[tuple[str, bytes]]
+    """
+    futures: dict[Future, str] = {
+        executor.submit(_build, builder_class, kwargs): fmt for fmt, (builder_class, kwargs) in jobs.items()
+    }
+
+    try:
+        future: Future
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    finally:  # Not waiting for the remaining builders if the caller gives up (or one of them fails).
+        for future in futures:
+            future.cancel()
+
+
+class _ChunkWriter:
+    """
+    File-like object that collects what zipfile writes, so that the archive can be streamed while it is written.
+    zipfile handles streams that can't seek by writing a data descriptor after each file.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        """
+        :return: Everything written since the last call.
+        :rtype: bytes
+        """
+        data: bytes = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class BundleBuilder(Builder):
+    """
+    This is the class that builds a schedule in several formats at once and bundles the results into a zip archive,
+    one file per format (schedule.xlsx, schedule.ics, ...). The builders run concurrently on an executor, so the
+    bundle takes about as long as the slowest of them when the executor is a process pool.
+
+    :param schedule: This value can either be a schedule object or a list of it, if the value is a list then every
+        schedule constituting is merged.
+    :type schedule: Schedule | list[Schedule]
+    :param formats: The formats to build, each one must be registered on the factory.
+    :type formats: list[str]
+    :param factory: The factory holding the builder of each format.
+    :type factory: BuilderFactory
+    :param executor: Where to run the builders, by default a thread pool created for the build.
+    :type executor: Executor, optional
+    :param arguments: Extra keyword arguments for the builder of each format, these can also replace the schedule,
+        such as the sheets of a xlsx.
+    :type arguments: dict[str, dict[str, Any]], optional
+    """
+
+    def __init__(
+        self,
+        schedule: Schedule | list[Schedule],
+        formats: list[str],
+        factory: BuilderFactory,
+        executor: Optional[Executor] = None,
+        arguments: Optional[dict[str, dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Class constructor.
+        """
+
+        super().__init__(schedule)
+
+        self.content_type = "application/zip"
+        self.executor: Optional[Executor] = executor
+
+        arguments = arguments or {}
+
+        self.jobs: dict[str, tuple[Type[Builder], dict[str, Any]]] = {
+            fmt: (factory.get(fmt), {"schedule": self.schedule, **arguments.get(fmt, {})})
+            for fmt in dict.fromkeys(formats)
+        }
+        """
+        The builder class and its arguments, by format. The schedule is merged once and shared by every builder.
+        """
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        Builds the archive chunk by chunk, each file is compressed and sent as soon as its builder finishes.
+
+        :return: The chunks of the zip archive.
+        :rtype: Iterator[bytes]
+        """
+        executor: Executor = self.executor or ThreadPoolExecutor(max_workers=len(self.jobs))
+        writer: _ChunkWriter = _ChunkWriter()
+
+        try:
+            with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                fmt: str
+                content: bytes
+                for fmt, content in build_concurrently(self.jobs, executor):
+                    archive.writestr(f"schedule.{fmt}", content)
+                    yield writer.take()
+
+            yield writer.take()  # Central directory.
+
+        finally:
+            if executor is not self.executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def build(self) -> bytes:
+        """
+        This is the main method inherited from the Builder ABC, and it builds the zip archive.
+
+        :return: The zip archive as bytes.
+        :rtype: bytes
+        """
+        return b"".join(self.stream())
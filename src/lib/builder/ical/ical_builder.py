@@ -1,7 +1,10 @@
-from datetime import datetime, time
+from datetime import datetime, tzinfo
+from io import BytesIO
+from typing import Iterator
 
 from src.lib.builder.builder import Builder
-from src.lib.builder.utils import sum_to_time, get_abbr
+from src.lib.builder.ical.ical_writer import CALENDAR_NAME, TIMEZONE, IcalWriter
+from src.lib.builder.utils import get_abbr
 from src.lib.scraper.event import ScheduleEvent
 from src.lib.scraper.schedule import Schedule
 
@@ -12,14 +15,14 @@ from pytz import timezone
 class IcalBuilder(Builder):
     """
     This is the class that implements the build method that allows the conception of ICal files based on a provided
-    schedule.
+    schedule. The calendar is written directly by IcalWriter, the icalendar object model is only used by to_calendar.
 
     :param schedule: This value can either be a schedule object or a list of it, if the value is a list then every
         schedule constituting is merged.
     :type schedule: Schedule | list[Schedule]
     """
 
-    __slots__ = ("schedule", "content_type", "_weekday_abbr_map")
+    __slots__ = ("schedule", "content_type")
 
     def __init__(self, schedule: Schedule | list[Schedule]):
         """
@@ -29,22 +32,16 @@ class IcalBuilder(Builder):
         super().__init__(schedule)
 
         self.content_type = "text/calendar"
-        self._weekday_abbr_map: dict[str] = {
-            "Segunda-Feira": "MO",
-            "Terça-Feira": "TU",
-            "Quarta-Feira": "WE",
-            "Quinta-Feira": "TH",
-            "Sexta-Feira": "FR",
-            "Sábado": "SA",
-            "Domingo": "SU",
-        }
-
-    def _to_ical_event(self, event: ScheduleEvent) -> Event:
+
+    @staticmethod
+    def _to_ical_event(event: ScheduleEvent, zone: tzinfo) -> Event:
         """
         This private method is responsible to convert a ScheduleEvent into an icalendar recognizable Event.
 
         :param event: Provided event to convert.
         :type event: ScheduleEvent
+        :param zone: Timezone of the event.
+        :type zone: tzinfo
         :return: The converted icalendar event object.
         :rtype: Event
         """
@@ -54,19 +51,18 @@ class IcalBuilder(Builder):
             2021,
             7,
             30,
-            hour=event.starts_at.hour,
-            minute=event.starts_at.minute,
-            tzinfo=timezone("Europe/Lisbon"),
+            hour=event.start // 60,
+            minute=event.start % 60,
+            tzinfo=zone,
         )
 
-        ends_at_time: time = sum_to_time(event.starts_at.time(), event.duration.time())
         ends_at: datetime = datetime(
             2021,
             7,
             30,
-            hour=ends_at_time.hour,
-            minute=ends_at_time.minute,
-            tzinfo=timezone("Europe/Lisbon"),
+            hour=event.end // 60,
+            minute=event.end % 60,
+            tzinfo=zone,
         )
 
         result_event.add(
@@ -79,11 +75,30 @@ class IcalBuilder(Builder):
         result_event.add("dtend", ends_at)
 
         result_event.add(
-            "rrule", {"freq": "weekly", "byday": self._weekday_abbr_map[event.weekday]}
+            "rrule", {"freq": "weekly", "byday": event.day.abbr}
         )
 
         return result_event
 
+    def to_calendar(self) -> Calendar:
+        """
+        Converts the schedule into an icalendar Calendar object, useful to further edit the calendar. Contrary to
+        build, the timezone definition is not included.
+
+        :return: The calendar.
+        :rtype: Calendar
+        """
+        calendar: Calendar = Calendar()
+        calendar.add("name", CALENDAR_NAME)
+
+        zone: tzinfo = timezone(TIMEZONE)
+
+        event: ScheduleEvent
+        for event in self.schedule.get_events():
+            calendar.add_component(self._to_ical_event(event, zone))
+
+        return calendar
+
     def build(self) -> bytes:
         """
         This is the main method inherited from the Builder ABC, and it builds the schedule in an icalendar format.
@@ -91,16 +106,16 @@ class IcalBuilder(Builder):
         :return: The calendar in icalendar format as bytes.
         :rtype: bytes
         """
-        calendar: Calendar = Calendar()
-        calendar.add("name", "Shifter Schedule")
+        result: BytesIO = BytesIO()
+        IcalWriter().write(self.schedule.get_events(), result)
 
-        events: list[ScheduleEvent] = self.schedule.get_events()
+        return result.getvalue()
 
-        event: ScheduleEvent
-        for event in events:
-            calendar.add_component(self._to_ical_event(event))
-
-        # file = open("debug.ics", "wb")
-        # file.write(calendar.to_ical())
+    def stream(self) -> Iterator[bytes]:
+        """
+        Builds the schedule in an icalendar format, chunk by chunk, as the events are written.
 
-        return calendar.to_ical()
+        :return: The chunks of the calendar.
+        :rtype: Iterator[bytes]
+        """
+        return IcalWriter().iter_chunks(self.schedule.get_events())
@@ -0,0 +1,286 @@
+import calendar
+from datetime import datetime, timedelta
+from functools import lru_cache
+from io import StringIO
+from typing import BinaryIO, Iterable, Iterator
+
+from pytz import timezone, utc
+
+from src.lib.builder.utils import get_abbr, iter_chunks
+from src.lib.scraper.event import Location, ScheduleBody, ScheduleEvent, Weekday
+from src.lib.scraper.utils import minutes_to_str
+
+LINE_LIMIT: int = 75  # Maximum octets of a content line, excluding the line break (RFC 5545, 3.1).
+FOLD_SEPARATOR: str = "\r\n "
+
+CALENDAR_NAME: str = "Shifter Schedule"
+TIMEZONE: str = "Europe/Lisbon"
+FIRST_DATE: str = "20210730"  # Date of the first occurrence of every event, the weekly rule moves it to its weekday.
+EVENTS_PER_CHUNK: int = 200  # About 64KiB.
+
+
+def escape_text(text: str) -> str:
+    """
+    Escapes a value according to the iCalendar TEXT rules, the same way the icalendar package does.
+    :param text: The value.
+    :type text: str
+    :return: The escaped value.
+    :rtype: str
+    """
+    return (
+        text.replace(r"\N", "\n")
+        .replace("\\", "\\\\")
+        .replace(";", r"\;")
+        .replace(",", r"\,")
+        .replace("\r\n", r"\n")
+        .replace("\n", r"\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """
+    Folds a content line so that no line is longer than 75 octets, excluding the line break, without splitting a
+    multi-octet character. Continuation lines start with a single space.
+    :param line: The unfolded content line.
+    :type line: str
+    :return: The folded content line, without the final line break.
+    :rtype: str
+    """
+    if len(line) < LINE_LIMIT and line.isascii():  # Most lines are short.
+        return line
+
+    if line.isascii():
+        return FOLD_SEPARATOR.join(line[i:i + LINE_LIMIT - 1] for i in range(0, len(line), LINE_LIMIT - 1))
+
+    folded: StringIO = StringIO()
+    octets: int = 0
+
+    char: str
+    for char in line:
+        size: int = len(char.encode("utf8"))
+        octets += size
+
+        if octets >= LINE_LIMIT:
+            folded.write(FOLD_SEPARATOR)
+            octets = size
+
+        folded.write(char)
+
+    return folded.getvalue()
+
+
+def _format_offset(offset: timedelta) -> str:
+    """
+    Formats an UTC offset as +HHMM or -HHMM.
+    """
+    minutes: int = int(offset.total_seconds()) // 60
+    return f"{'-' if minutes < 0 else '+'}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+
+def _yearly_rule(moment: datetime) -> str:
+    """
+    Builds the yearly rule of a transition, such as the last sunday of march (BYMONTH=3;BYDAY=-1SU).
+    """
+    days_in_month: int = calendar.monthrange(moment.year, moment.month)[1]
+    ordinal: int = -1 if moment.day + 7 > days_in_month else (moment.day - 1) // 7 + 1
+
+    return f"FREQ=YEARLY;BYMONTH={moment.month};BYDAY={ordinal}{Weekday(moment.weekday()).abbr}"
+
+
+@lru_cache(maxsize=8)
+def get_vtimezone(tzid: str, year: int = 2021) -> tuple[str, ...]:
+    """
+    Computes the VTIMEZONE component of a timezone from its transitions during a year, each transition becomes a
+    STANDARD or DAYLIGHT sub-component repeating yearly. The result is cached, since it only depends on the timezone.
+    :param tzid: The timezone, as in the tz database (Europe/Lisbon).
+    :type tzid: str
+    :param year: Year whose transitions are used as reference.
+    :type year: int
+    :return: The unfolded content lines of the component.
+    :rtype: tuple[str, ...]
+    """
+    zone = timezone(tzid)
+
+    def local(instant: datetime) -> datetime:
+        return instant.astimezone(zone)
+
+    # Looking for the changes of offset day by day, then narrowing them down to the minute.
+    transitions: list[tuple[datetime, datetime]] = []
+    moment: datetime = datetime(year, 1, 1, tzinfo=utc)
+    previous: datetime = local(moment)
+
+    while moment.year == year:
+        following: datetime = local(moment + timedelta(days=1))
+
+        if following.utcoffset() != previous.utcoffset():
+            low: datetime = moment
+            step: timedelta
+            for step in (timedelta(hours=1), timedelta(minutes=1)):
+                while local(low + step).utcoffset() == previous.utcoffset():
+                    low += step
+
+            transitions.append((local(low), local(low + timedelta(minutes=1))))
+
+        moment += timedelta(days=1)
+        previous = following
+
+    lines: list[str] = ["BEGIN:VTIMEZONE", f"TZID:{tzid}"]
+
+    if not transitions:  # The offset never changes.
+        lines += [
+            "BEGIN:STANDARD",
+            f"TZOFFSETFROM:{_format_offset(previous.utcoffset())}",
+            f"TZOFFSETTO:{_format_offset(previous.utcoffset())}",
+            f"TZNAME:{previous.tzname()}",
+            "DTSTART:19700101T000000",
+            "END:STANDARD",
+        ]
+
+    before: datetime
+    after: datetime
+    for before, after in transitions:
+        kind: str = "DAYLIGHT" if after.dst() else "STANDARD"
+        starts_at: datetime = before.replace(tzinfo=None) + timedelta(minutes=1)  # Wall time before the change.
+
+        lines += [
+            f"BEGIN:{kind}",
+            f"TZOFFSETFROM:{_format_offset(before.utcoffset())}",
+            f"TZOFFSETTO:{_format_offset(after.utcoffset())}",
+            f"TZNAME:{after.tzname()}",
+            f"DTSTART:{starts_at:%Y%m%dT%H%M%S}",
+            f"RRULE:{_yearly_rule(starts_at)}",
+            f"END:{kind}",
+        ]
+
+    lines.append("END:VTIMEZONE")
+    return tuple(lines)
+
+
+class IcalWriter:
+    """
+    This class writes events straight into iCalendar (RFC 5545) content lines, without going through the icalendar
+    object model. Every event repeats weekly from its first occurrence, on its own weekday. The properties, escaping
+    and folding of the events are the same as the ones produced by the icalendar package, along with the timezone
+    definition, which is computed once.
+
+    :param name: Name of the calendar.
+    :type name: str, optional
+    :param tzid: Timezone of the events.
+    :type tzid: str, optional
+    """
+
+    __slots__ = ("name", "tzid", "_bodies", "_locations")
+
+    def __init__(self, name: str = CALENDAR_NAME, tzid: str = TIMEZONE) -> None:
+        """
+        Class constructor.
+        """
+        self.name: str = name
+        self.tzid: str = tzid
+
+        self._bodies: dict[ScheduleBody, tuple[str, str]] = {}
+        """
+        Summary line and description prefix of each event body, bodies are shared by the events of a shift.
+        """
+
+        self._locations: dict[Location, str] = {}
+        """
+        Location line of each location.
+        """
+
+    def _body_lines(self, body: ScheduleBody) -> tuple[str, str]:
+        """
+        Obtains the (folded) summary line and the (unfolded) start of the description line of an event body.
+        """
+        lines: tuple[str, str] = self._bodies.get(body)
+
+        if lines is None:
+            summary: str = f"{body.shift} - {body.location} - {get_abbr(body.name)}"
+            lines = self._bodies[body] = (
+                f"{fold_line(f'SUMMARY:{escape_text(summary)}')}\r\n",
+                f"DESCRIPTION:{escape_text(str(body))}",
+            )
+
+        return lines
+
+    def _location_line(self, location: Location) -> str:
+        """
+        Obtains the (folded) location line of an event.
+        """
+        line: str = self._locations.get(location)
+
+        if line is None:
+            line = self._locations[location] = f"{fold_line(f'LOCATION:{escape_text(str(location))}')}\r\n"
+
+        return line
+
+    def format_event(self, event: ScheduleEvent) -> str:
+        """
+        Formats an event as a VEVENT component.
+        :param event: The event.
+        :type event: ScheduleEvent
+        :return: The folded content lines of the component, each one ending with a line break.
+        :rtype: str
+        """
+        summary, description = self._body_lines(event.body)
+        starts_at: str = minutes_to_str(event.start)
+        ends_at: str = minutes_to_str(event.end)
+
+        # Same text as str(event), where the times are datetimes on the dummy 1900-01-01 date.
+        description = f"{description}\\n1900-01-01 {starts_at}:00\\n1900-01-01 {minutes_to_str(event.length)}:00\\n"
+
+        return (
+            f"BEGIN:VEVENT\r\n"
+            f"{summary}"
+            f"{fold_line(f'DTSTART;TZID={self.tzid}:{FIRST_DATE}T{starts_at[:2]}{starts_at[3:]}00')}\r\n"
+            f"{fold_line(f'DTEND;TZID={self.tzid}:{FIRST_DATE}T{ends_at[:2]}{ends_at[3:]}00')}\r\n"
+            f"RRULE:FREQ=WEEKLY;BYDAY={event.day.abbr}\r\n"
+            f"{fold_line(description)}\r\n"
+            f"{self._location_line(event.body.location)}"
+            f"END:VEVENT\r\n"
+        )
+
+    def iter_lines(self, events: Iterable[ScheduleEvent]) -> Iterator[str]:
+        """
+        Generates the folded content lines of a calendar with the given events, the lines of each event come together.
+        :param events: The events of the calendar.
+        :type events: Iterable[ScheduleEvent]
+        :return: The content lines, each one ending with a line break.
+        :rtype: Iterator[str]
+        """
+        yield "BEGIN:VCALENDAR\r\n"
+        yield f"{fold_line(f'NAME:{escape_text(self.name)}')}\r\n"
+
+        line: str
+        for line in get_vtimezone(self.tzid):
+            yield f"{fold_line(line)}\r\n"
+
+        yield from map(self.format_event, events)
+
+        yield "END:VCALENDAR\r\n"
+
+    def iter_chunks(
+        self, events: Iterable[ScheduleEvent], events_per_chunk: int = EVENTS_PER_CHUNK
+    ) -> Iterator[bytes]:
+        """
+        Generates a calendar as utf-8 encoded chunks, ready to be streamed.
+        :param events: The events of the calendar.
+        :type events: Iterable[ScheduleEvent]
+        :param events_per_chunk: Number of events on each chunk.
+        :type events_per_chunk: int, optional
+        :return: The chunks.
+        :rtype: Iterator[bytes]
+        """
+        return iter_chunks(self.iter_lines(events), events_per_chunk)
+
+    def write(self, events: Iterable[ScheduleEvent], stream: BinaryIO) -> None:
+        """
+        Writes a calendar into a binary stream.
+        :param events: The events of the calendar.
+        :type events: Iterable[ScheduleEvent]
+        :param stream: Where to write the calendar.
+        :type stream: BinaryIO
+        """
+        chunk: bytes
+        for chunk in self.iter_chunks(events):
+            stream.write(chunk)
@@ -1,11 +1,9 @@
-from datetime import datetime
-from typing import Any
+from typing import Iterator
 
 from src.lib.builder.builder import Builder
+from src.lib.builder.json.schedule_encoder import ScheduleEncoder
 from src.lib.scraper.schedule import Schedule
 
-import json
-
 
 class JsonBuilder(Builder):
     """
@@ -15,47 +13,40 @@ class JsonBuilder(Builder):
     :param schedule: This value can either be a schedule object or a list of it, if the value is a list then every
         schedule constituting is merged.
     :type schedule: Schedule | list[Schedule]
+
+    :param pretty: Whether to indent the document, by default it is compact.
+    :type pretty: bool, optional
     """
 
     __slots__ = (
         'schedule',
-        'content_type'
+        'content_type',
+        'encoder'
     )
 
-    def __init__(self, schedule: Schedule | list[Schedule]):
+    def __init__(self, schedule: Schedule | list[Schedule], pretty: bool = False):
         """
         Class constructor.
         """
         super().__init__(schedule)
         self.content_type = "application/json"
-
-    @staticmethod
-    def _serialize_unknown_obj(obj: Any) -> str:
-        """
-        This method is used as the default function once json.dumps encounters an unknown object.
-        Datetimes are converted into string formatted times, any other object is converted to its str form.
-        :param obj: Object to be serialized.
-        :type obj: Any
-        :return: Resulting string.
-        :rtype: str
-        """
-        if isinstance(obj, datetime):
-            return obj.time().strftime("%H:%M")
-
-        return str(obj)
+        self.encoder: ScheduleEncoder = ScheduleEncoder(pretty=pretty)
 
     def build(self) -> bytes:
         """
         This is the main method inherited from the Builder ABC, and it builds the schedule in a json format.
-        The resulting value from this method needs to be encoded in utf-8.
 
-        :return: The calendar in json format as bytes.
+        :return: The schedule in json format, encoded in utf-8.
         :rtype: bytes
         """
-        schedule_as_dict: dict = self.schedule.get_as_dict()
-        return json.dumps(
-            schedule_as_dict,
-            indent=4,
-            default=self._serialize_unknown_obj,
-            ensure_ascii=False
-        ).encode("utf8")
+        return self.encoder.encode(self.schedule)
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        Builds the schedule in a json format chunk by chunk, a weekday at a time, instead of holding the whole
+        document at once.
+
+        :return: The chunks of the document, encoded in utf-8.
+        :rtype: Iterator[bytes]
+        """
+        return self.encoder.iter_encode(self.schedule)
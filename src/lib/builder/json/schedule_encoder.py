@@ -0,0 +1,196 @@
+import json
+from typing import Any, Callable, Iterator
+
+from src.lib.scraper.event import ScheduleBody, ScheduleEvent
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+from src.lib.scraper.utils import minutes_to_str
+
+try:  # Optional, much faster than the standard library when installed.
+    import orjson
+
+except ImportError:
+    orjson = None
+
+PRETTY_INDENT: int = 2  # The only indentation orjson supports.
+
+
+def dumps(value: Any, pretty: bool = False) -> bytes:
+    """
+    Encodes json compatible values (no other object is supported) with orjson when it is installed, and with the
+    standard library otherwise, both produce the same output.
+    :param value: The value to encode.
+    :type value: Any
+    :param pretty: Whether to indent the output, by default it is compact.
+    :type pretty: bool, optional
+    :return: The json document encoded in utf-8.
+    :rtype: bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    return json.dumps(
+        value,
+        indent=PRETTY_INDENT if pretty else None,
+        separators=None if pretty else (",", ":"),
+        ensure_ascii=False,
+    ).encode("utf8")
+
+
+def format_clock(minutes: int) -> str:
+    """
+    Formats a time as HH:MM, as shown on the json files.
+    :param minutes: Minutes since midnight.
+    :type minutes: int
+    :return: The formatted time.
+    :rtype: str
+    """
+    return minutes_to_str(minutes)
+
+
+def format_datetime(minutes: int) -> str:
+    """
+    Formats a time as an ISO 8601 datetime on the dummy 1900-01-01 date, the way Pydantic serializes the datetimes
+    of ScheduleEvent.as_dict.
+    :param minutes: Minutes since midnight.
+    :type minutes: int
+    :return: The formatted time.
+    :rtype: str
+    """
+    return f"1900-01-01T{minutes_to_str(minutes)}:00"
+
+
+class ScheduleEncoder:
+    """
+    This class encodes schedules as json straight from the event model, without going through ScheduleEvent.as_dict
+    and datetimes. Events of the same shift share the same body, so the encoded body and times are computed once.
+    The values are encoded by dumps.
+
+    :param pretty: Whether to indent the output, by default it is compact.
+    :type pretty: bool, optional
+    :param format_time: Formats the starting time and duration of the events, given in minutes.
+    :type format_time: Callable[[int], str], optional
+    """
+
+    __slots__ = ("pretty", "format_time", "_bodies", "_times")
+
+    def __init__(self, pretty: bool = False, format_time: Callable[[int], str] = format_clock) -> None:
+        """
+        Class constructor.
+        """
+        self.pretty: bool = pretty
+        self.format_time: Callable[[int], str] = format_time
+
+        self._bodies: dict[ScheduleBody, dict] = {}
+        """
+        Dictionary representation of each event body, shared by every event with that body.
+        """
+
+        self._times: dict[int, str] = {}
+        """
+        Formatted value of each time, in minutes.
+        """
+
+    def _body(self, body: ScheduleBody) -> dict:
+        """
+        Obtains the dictionary representation of an event body.
+        """
+        as_dict: dict = self._bodies.get(body)
+
+        if as_dict is None:
+            as_dict = self._bodies[body] = body.as_dict()
+
+        return as_dict
+
+    def _time(self, minutes: int) -> str:
+        """
+        Obtains the formatted value of a time.
+        """
+        formatted: str = self._times.get(minutes)
+
+        if formatted is None:
+            formatted = self._times[minutes] = self.format_time(minutes)
+
+        return formatted
+
+    def event_to_primitives(self, event: ScheduleEvent) -> dict:
+        """
+        Converts an event into json compatible values, the same shape as ScheduleEvent.as_dict.
+        :param event: The event.
+        :type event: ScheduleEvent
+        :return: The event as a dictionary.
+        :rtype: dict
+        """
+        return {
+            "body": self._body(event.body),
+            "starts_at": self._time(event.start),
+            "duration": self._time(event.end - event.start),
+            "weekday": event.weekday,
+        }
+
+    def schedule_to_primitives(self, schedule: Schedule) -> dict[str, list[dict]]:
+        """
+        Converts a schedule into json compatible values, the events of each weekday by its name.
+        :param schedule: The schedule.
+        :type schedule: Schedule
+        :return: The schedule as a dictionary.
+        :rtype: dict[str, list[dict]]
+        """
+        return {
+            weekday: [self.event_to_primitives(event) for event in schedule.get_events_from_weekday(weekday)]
+            for weekday in schedule.weekdays
+        }
+
+    def group_to_primitives(self, group: ScheduleGroup) -> dict[str, dict[str, list[dict]]]:
+        """
+        Converts the schedule of every year of a group into json compatible values.
+        :param group: The schedules.
+        :type group: ScheduleGroup
+        :return: The schedule of each year, by the year.
+        :rtype: dict[str, dict[str, list[dict]]]
+        """
+        return {str(year): self.schedule_to_primitives(schedule) for year, schedule in group.years.items()}
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Encodes json compatible values, with the indentation of the encoder.
+        :param value: The value to encode.
+        :type value: Any
+        :return: The json document encoded in utf-8.
+        :rtype: bytes
+        """
+        return dumps(value, self.pretty)
+
+    def encode(self, schedule: Schedule) -> bytes:
+        """
+        Encodes a schedule.
+        :param schedule: The schedule.
+        :type schedule: Schedule
+        :return: The json document encoded in utf-8.
+        :rtype: bytes
+        """
+        return self.dumps(self.schedule_to_primitives(schedule))
+
+    def iter_encode(self, schedule: Schedule) -> Iterator[bytes]:
+        """
+        Encodes a schedule chunk by chunk, a weekday at a time, so the whole document is never held at once. A pretty
+        document is encoded as a single chunk.
+        :param schedule: The schedule.
+        :type schedule: Schedule
+        :return: The chunks of the json document, encoded in utf-8.
+        :rtype: Iterator[bytes]
+        """
+        if self.pretty:
+            yield self.encode(schedule)
+            return
+
+        separator: bytes = b"{"
+
+        weekday: str
+        for weekday in schedule.weekdays:
+            events: list[dict] = [
+                self.event_to_primitives(event) for event in schedule.get_events_from_weekday(weekday)
+            ]
+            yield separator + self.dumps(weekday) + b":" + self.dumps(events)
+            separator = b","
+
+        yield b"}" if separator == b"," else b"{}"
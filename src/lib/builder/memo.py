@@ -0,0 +1,89 @@
+import hashlib
+from typing import Any, Callable, Hashable
+
+from src.lib.builder.utils import merge_schedules
+from src.lib.cache.lru_cache import LRUCache
+from src.lib.metrics.registry import REGISTRY, CallbackMetric, LabelValues
+from src.lib.scraper.schedule import FINGERPRINT_SIZE, Schedule
+
+MAX_MERGED_SCHEDULES: int = 32
+MAX_LAYOUTS: int = 64
+
+MERGED_SCHEDULES: LRUCache = LRUCache(max_size=MAX_MERGED_SCHEDULES)
+"""
+Merged schedule of each list of schedules, by the fingerprints of the list.
+"""
+
+LAYOUTS: LRUCache = LRUCache(max_size=MAX_LAYOUTS)
+"""
+Layout data of each builder (time grid, columns, colors, ...), by the builder name and the fingerprint of the schedule.
+"""
+
+
+def get_merged_schedule(schedules: list[Schedule]) -> Schedule:
+    """
+    Merges several schedules, reusing the result of a previous merge of schedules with the same content, so builders
+    of different formats (and requests) share it. The fingerprint of the result is derived from the fingerprints of
+    the merged schedules. The result must not be modified.
+    :param schedules: The schedules to merge.
+    :type schedules: list[Schedule]
+    :return: The merged schedule.
+    :rtype: Schedule
+    """
+    key: tuple[str, ...] = tuple(schedule.get_fingerprint() for schedule in schedules)
+
+    def merge() -> Schedule:
+        merged: Schedule = merge_schedules(schedules)
+        merged.set_fingerprint(hashlib.blake2b("".join(key).encode("ascii"), digest_size=FINGERPRINT_SIZE).hexdigest())
+        return merged
+
+    return MERGED_SCHEDULES.get_or_compute(key, merge)
+
+
+def get_layout(builder: str, schedule: Schedule, compute: Callable[[Schedule], Any]) -> Any:
+    """
+    Obtains the layout data a builder derives from a schedule, computing it only for schedules whose content wasn't
+    laid out recently. The result must not be modified.
+    :param builder: Name of the builder, each one has its own layouts.
+    :type builder: str
+    :param schedule: The schedule.
+    :type schedule: Schedule
+    :param compute: Function that computes the layout of a schedule.
+    :type compute: Callable[[Schedule], Any]
+    :return: The layout data.
+    :rtype: Any
+    """
+    key: Hashable = (builder, schedule.get_fingerprint())
+    return LAYOUTS.get_or_compute(key, lambda: compute(schedule))
+
+
+def get_memo_stats() -> dict[str, dict[str, int]]:
+    """
+    :return: The size, hits, misses and evictions of the merged schedules and of the layouts.
+    :rtype: dict[str, dict[str, int]]
+    """
+    return {"merged_schedules": MERGED_SCHEDULES.stats, "layouts": LAYOUTS.stats}
+
+
+def collect_memo_stat(stat: str) -> Callable[[], dict[LabelValues, float]]:
+    """
+    :param stat: One of the statistics of get_memo_stats.
+    :type stat: str
+    :return: Function that reads the statistic of each memoized value, as the samples of a metric.
+    :rtype: Callable[[], dict[LabelValues, float]]
+    """
+    return lambda: {(name,): stats[stat] for name, stats in get_memo_stats().items()}
+
+
+REGISTRY.register(CallbackMetric(
+    "shifter_memo_entries", "Memoized values held by the builders.", ("memo",), collect_memo_stat("size")
+))
+REGISTRY.register(CallbackMetric(
+    "shifter_memo_hits_total", "Memoized values reused.", ("memo",), collect_memo_stat("hits"), "counter"
+))
+REGISTRY.register(CallbackMetric(
+    "shifter_memo_misses_total", "Memoized values computed.", ("memo",), collect_memo_stat("misses"), "counter"
+))
+REGISTRY.register(CallbackMetric(
+    "shifter_memo_evictions_total", "Memoized values evicted.", ("memo",), collect_memo_stat("evictions"), "counter"
+))
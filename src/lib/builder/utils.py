@@ -1,42 +1,66 @@
-from datetime import time, timedelta
+from itertools import islice
+from typing import Iterable, Iterator
 
 from src.lib.scraper.event import ScheduleEvent
 from src.lib.scraper.schedule import Schedule
 
+CHUNK_SIZE: int = 64 * 1024  # Bytes read at once when streaming a file.
+
 
 def merge_schedules(schedules: list[Schedule]) -> Schedule:
-    weekdays: list[str] = ["Segunda-Feira", "Terça-Feira", "Quarta-Feira", "Quinta-Feira", "Sexta-Feira", "Sábado"]
+    """
+    Merges several schedules into one, see Schedule.merge.
+    :param schedules: The schedules to merge.
+    :type schedules: list[Schedule]
+    :return: The merged schedule, with the weekdays of every schedule and its events sorted by their starting time.
+    :rtype: Schedule
+    """
+    return Schedule.merge(schedules)
+
+
+def get_abbr(string: str) -> str:
+    return "".join([word[0].upper() if len(word) > 3 else "" for word in string.split(" ")])
 
-    final_schedule: Schedule = Schedule(weekdays=weekdays)
+
+def split_by_course(schedules: list[Schedule]) -> dict[str, Schedule]:
+    """
+    Splits some schedules into a schedule per course, each one with the events of that course from every schedule.
+    :param schedules: The schedules to split.
+    :type schedules: list[Schedule]
+    :return: The schedule of each course, by its name (title cased), in order of appearance.
+    :rtype: dict[str, Schedule]
+    """
+    courses: dict[str, Schedule] = {}
+    weekdays: list[str] = list(dict.fromkeys(weekday for schedule in schedules for weekday in schedule.weekdays))
 
     schedule: Schedule
     for schedule in schedules:
 
         event: ScheduleEvent
         for event in schedule.get_events():
-            final_schedule.add_event(event)
-
-    return final_schedule
-
+            name: str = event.body.name.title()
 
-def sum_to_time(time_obj: time, duration: time) -> time:
-    time_obj_delta: timedelta = timedelta(
-        hours=time_obj.hour,
-        minutes=time_obj.minute
-    )
+            if name not in courses:
+                courses[name] = Schedule(weekdays=list(weekdays))
 
-    duration_delta: timedelta = timedelta(
-        hours=duration.hour,
-        minutes=duration.minute
-    )
+            courses[name].add_event(event)
 
-    result_delta: timedelta = time_obj_delta + duration_delta
+    return courses
 
-    return time(
-        hour=result_delta.seconds // 3600,
-        minute=(result_delta.seconds // 60) % 60
-    )
 
+def iter_chunks(parts: Iterable[str], parts_per_chunk: int = 8192) -> Iterator[bytes]:
+    """
+    Groups small pieces of text into utf-8 encoded chunks, ready to be streamed. The pieces are grouped by count,
+    which is much cheaper than measuring each one of them.
+    :param parts: The pieces of text, in order.
+    :type parts: Iterable[str]
+    :param parts_per_chunk: Number of pieces on each chunk.
+    :type parts_per_chunk: int, optional
+    :return: The chunks.
+    :rtype: Iterator[bytes]
+    """
+    iterator: Iterator[str] = iter(parts)
 
-def get_abbr(string: str) -> str:
-    return "".join([word[0].upper() if len(word) > 3 else "" for word in string.split(" ")])
+    batch: list[str]
+    while batch := list(islice(iterator, parts_per_chunk)):
+        yield "".join(batch).encode("utf8")
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+
+from src.lib.builder.memo import get_layout
+from src.lib.scraper.event import ScheduleEvent
+from src.lib.scraper.interval_index import IntervalIndex
+from src.lib.scraper.schedule import Schedule
+from src.lib.scraper.utils import minutes_to_str
+
+ROW_MINUTES: int = 30  # Each row of the timetable is half an hour.
+
+EventPlacement = tuple[int, int, str, str]
+"""
+Placement of an event on the worksheet, as (column, height in rows, text, course name).
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class SheetLayout:
+    """
+    This class represents where everything of a schedule goes on a worksheet, independently of the workbook, so the
+    layout of a schedule can be computed once and drawn on any number of worksheets.
+    :param time_data: The time of each row of the timetable, after the header row.
+    :type time_data: tuple[str, ...]
+    :param widths: Number of columns of each weekday, in order, as many as events happening at the same time.
+    :type widths: dict[str, int]
+    :param placements: Placement of the events by their starting row.
+    :type placements: dict[int, list[EventPlacement]]
+    :param courses: Name of every course, in order of appearance, which is the order the colors are given.
+    :type courses: tuple[str, ...]
+    """
+
+    time_data: tuple[str, ...]
+    widths: dict[str, int]
+    placements: dict[int, list[EventPlacement]]
+    courses: tuple[str, ...]
+
+    @property
+    def column_counter(self) -> int:
+        """
+        :return: Number of columns used by the weekdays.
+        :rtype: int
+        """
+        return sum(self.widths.values())
+
+
+def compute_sheet_layout(schedule: Schedule) -> SheetLayout:
+    """
+    Computes the layout of a schedule: the time grid, the columns of each weekday and the placement of the events,
+    where overlapping events are given different lanes (columns) of their weekday.
+    :param schedule: The schedule.
+    :type schedule: Schedule
+    :return: The layout.
+    :rtype: SheetLayout
+    """
+    starting_time, ending_time = schedule.get_starting_and_ending_time()
+    time_data: tuple[str, ...] = (
+        tuple(minutes_to_str(minutes) for minutes in range(starting_time, ending_time + 1, ROW_MINUTES))
+        if starting_time is not None else ()
+    )
+    mapped_hours: dict[str, int] = {time_str: row for row, time_str in enumerate(time_data, start=1)}
+
+    placements: dict[int, list[EventPlacement]] = {}
+    widths: dict[str, int] = {}
+    courses: dict[str, None] = {}
+    column: int = 1
+
+    weekday: str
+    events: list[ScheduleEvent]
+    for weekday, events in schedule.schedule.items():
+        # Retrieving the interval index (overlapping events and their lanes) for the current weekday.
+        interval_index: IntervalIndex = schedule.get_interval_index(weekday)
+        widths[weekday] = interval_index.width
+
+        event: ScheduleEvent
+        lane: int
+        for event, lane in zip(events, interval_index.lanes):
+            courses.setdefault(event.body.name)
+
+            # Events on the same lane never overlap, so each lane is a column of the weekday.
+            placements.setdefault(mapped_hours[minutes_to_str(event.start)], []).append(
+                (column + lane, event.length // ROW_MINUTES, str(event.body), event.body.name)
+            )
+
+        column += interval_index.width
+
+    return SheetLayout(time_data=time_data, widths=widths, placements=placements, courses=tuple(courses))
+
+
+def get_sheet_layout(schedule: Schedule) -> SheetLayout:
+    """
+    Obtains the layout of a schedule, memoized by the content of the schedule.
+    :param schedule: The schedule.
+    :type schedule: Schedule
+    :return: The layout, which must not be modified.
+    :rtype: SheetLayout
+    """
+    return get_layout("xlsx", schedule, compute_sheet_layout)
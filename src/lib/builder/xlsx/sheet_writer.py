@@ -0,0 +1,194 @@
+from typing import Callable
+
+from xlsxwriter.format import Format
+from xlsxwriter.worksheet import Worksheet
+
+from src.lib.builder.xlsx import styles
+from src.lib.builder.xlsx.sheet_layout import SheetLayout, get_sheet_layout
+from src.lib.scraper.schedule import Schedule
+
+Placement = tuple[int, int, str, Format]
+"""
+Placement of an event on the worksheet, as (column, height in rows, text, format).
+"""
+
+
+class XlsxSheetWriter:
+    """
+    This class draws a schedule onto a single worksheet as a timetable, every weekday takes as many columns as events
+    happening at the same time. Cells are addressed numerically (zero indexed rows and columns). Where everything goes
+    is given by the layout of the schedule, which is memoized.
+
+    :param worksheet: The worksheet to draw on.
+    :type worksheet: Worksheet
+    :param schedule: The schedule to draw.
+    :type schedule: Schedule
+    :param get_format: Function that returns the format of a (color, role) pair, shared by every sheet of a workbook.
+    :type get_format: Callable[[str, str], Format]
+    :param constant_memory: Whether the workbook is in constant_memory mode, where rows must be written in order.
+    :type constant_memory: bool, optional
+    """
+
+    __slots__ = ("worksheet", "schedule", "get_format", "constant_memory", "layout", "time_data")
+
+    def __init__(
+        self,
+        worksheet: Worksheet,
+        schedule: Schedule,
+        get_format: Callable[[str, str], Format],
+        constant_memory: bool = False,
+    ) -> None:
+        """
+        Class constructor.
+        """
+        self.worksheet: Worksheet = worksheet
+        self.schedule: Schedule = schedule
+        self.get_format: Callable[[str, str], Format] = get_format
+        self.constant_memory: bool = constant_memory
+
+        self.layout: SheetLayout = get_sheet_layout(schedule)
+        self.time_data: tuple[str, ...] = self.layout.time_data
+
+    def setup_layout(self) -> None:
+        """
+        This method sets up the worksheet column and rows heights and widths.
+        """
+
+        # Column/Row count, width and heights, the time column along with every lane of the weekdays.
+        self.worksheet.set_column(0, self.layout.column_counter, 23)
+        self.worksheet.set_default_row(23)
+        self.worksheet.set_row(0, 30)
+
+    def setup_header(self, widths: dict[str, int]) -> None:
+        """
+        This method draws the header row, each weekday spans as many columns as events happening at the same time.
+        :param widths: Number of columns of each weekday.
+        :type widths: dict[str, int]
+        """
+        column: int = 1
+
+        weekday: str
+        width: int
+        for weekday, width in widths.items():
+            if width > 1:  # If there are overlapping events, we expand the column by the number of lanes.
+                self.worksheet.merge_range(
+                    0, column, 0, column + width - 1,
+                    weekday,
+                    self.get_format(styles.DARK_COLOR, "header_merge"),
+                )
+
+            else:  # Else we simply write on the corresponding column.
+                self.worksheet.write(0, column, weekday, self.get_format(styles.HEADER_CELL["bg_color"], "header"))
+
+            column += width
+
+    def setup_row(self, row: int, column_counter: int) -> None:
+        """
+        This method draws a row of the timetable with its time value and color.
+        :param row: The row (zero indexed), the first one is the header.
+        :type row: int
+        :param column_counter: Number of columns used by the weekdays.
+        :type column_counter: int
+        """
+        color: str = styles.DARK_COLOR_CELL["bg_color"] if row % 2 == 1 else styles.LIGHT_COLOR_CELL["bg_color"]
+
+        self.worksheet.write_row(
+            row, 0,
+            data=[self.time_data[row - 1]] + [""] * column_counter,
+            cell_format=self.get_format(color, "row"),
+        )
+
+    def draw_event(self, row: int, column: int, height: int, text: str, cell_format: Format) -> None:
+        """
+        This method draws an event as a single cell spanning the rows of its duration.
+        :param row: First row of the event.
+        :type row: int
+        :param column: Column of the event.
+        :type column: int
+        :param height: Number of rows of the event.
+        :type height: int
+        :param text: Text of the event.
+        :type text: str
+        :param cell_format: Format of the event.
+        :type cell_format: Format
+        """
+        if height < 2:
+            self.worksheet.write(row, column, text, cell_format)
+
+        else:
+            self.worksheet.merge_range(row, column, row + height - 1, column, text, cell_format)
+
+    def draw_rows_in_order(self, events_by_row: dict[int, list[Placement]], column_counter: int) -> None:
+        """
+        This method draws the timetable and its events strictly row by row, as required by the constant_memory mode,
+        where a row is flushed as soon as a later one is written. merge_range pads the whole range at once, which
+        would flush the first row of an event before the other events starting there are drawn, so the events aren't
+        merged: the text is written on the first cell and the rest of the cells are painted with the event format
+        when their row comes.
+        :param events_by_row: Placement of the events by their starting row.
+        :type events_by_row: dict[int, list[Placement]]
+        :param column_counter: Number of columns used by the weekdays.
+        :type column_counter: int
+        """
+
+        # Events still being drawn on the current row, as (column, last row, format).
+        spanning: list[tuple[int, int, Format]] = []
+
+        row: int
+        for row in range(1, len(self.time_data) + 1):
+            self.setup_row(row, column_counter)
+            spanning = [(column, last, cell_format) for column, last, cell_format in spanning if last >= row]
+
+            column: int
+            cell_format: Format
+            for column, _, cell_format in spanning:
+                self.worksheet.write_blank(row, column, "", cell_format)
+
+            height: int
+            text: str
+            for column, height, text, cell_format in events_by_row.get(row, ()):
+                self.worksheet.write(row, column, text, cell_format)
+
+                if height > 1:
+                    spanning.append((column, row + height - 1, cell_format))
+
+    def write(self, event_colors: dict[str, str]) -> None:
+        """
+        Draws the schedule on the worksheet.
+        :param event_colors: Color of each course, courses without one are given the next color of the palette. It is
+            updated in place, so sharing it between sheets keeps the colors of a course consistent.
+        :type event_colors: dict[str, str]
+        """
+
+        self.setup_layout()  # Setup row and column heights and widths.
+
+        # Coloring stuff, colors are reused once every one of them was taken.
+        name: str
+        for name in self.layout.courses:
+            if name not in event_colors:
+                event_colors[name] = styles.COLORS[len(event_colors) % len(styles.COLORS)]
+
+        # Placement of the events by their starting row, along with their format.
+        events_by_row: dict[int, list[Placement]] = {
+            row: [
+                (column, height, text, self.get_format(event_colors[name], "event"))
+                for column, height, text, name in placements
+            ]
+            for row, placements in self.layout.placements.items()
+        }
+        column_counter: int = self.layout.column_counter
+
+        self.setup_header(self.layout.widths)
+
+        if self.constant_memory:
+            self.draw_rows_in_order(events_by_row, column_counter)
+
+        else:
+            row: int
+            for row in range(1, len(self.time_data) + 1):  # Setup base color layout for the schedule.
+                self.setup_row(row, column_counter)
+
+            placements: list[Placement]
+            for row, placements in events_by_row.items():
+                for placement in placements:
+                    self.draw_event(row, *placement)
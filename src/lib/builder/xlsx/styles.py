@@ -33,3 +33,16 @@ DARK_COLOR: str = "#595959"
 COLORS: list[str] = ["#ffffcc", "#ffcc99", "#ffcccc", "#ff99cc", "#ffccff",
                      "#cc99ff", "#ccccff", "#99ccff", "#ccffff", "#99ffcc",
                      "#ccffcc", "#ccff99"]
+
+
+# Properties of each role a format can have on the worksheet, along with the property that takes its color. Formats
+# are pooled by (color, role), so every combination is created once per workbook.
+FORMAT_ROLES: dict[str, tuple[dict, str]] = {
+    "header": ({**HEADER_CELL, "font_name": FONT, "font_color": "white"}, "bg_color"),
+    "header_merge": (
+        {**MERGE_CELL, "font_size": MERGE_FONT_SIZE, "font_name": FONT, "font_color": "white"},
+        "bg_color",
+    ),
+    "row": ({**LIGHT_COLOR_CELL, "font_name": FONT, "font_color": FONT_COLOR}, "bg_color"),
+    "event": ({**MERGE_CELL, "font_size": MERGE_FONT_SIZE, "font_name": FONT, "font_color": FONT_COLOR}, "fg_color"),
+}
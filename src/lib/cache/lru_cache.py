@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """
+    This class represents an in-memory cache of a limited size, once full the least recently used entry is evicted.
+    It is meant for values derived from others, kept inside a process, so a missing value is simply computed again.
+    The cache is thread safe and keeps track of its hits, misses and evictions.
+
+    :param max_size: Maximum number of entries.
+    :type max_size: int
+    """
+
+    __slots__ = (
+        '_entries',
+        '_lock',
+        'max_size',
+        'hits',
+        'misses',
+        'evictions'
+    )
+
+    def __init__(self, max_size: int = 128) -> None:
+        """
+        Class constructor.
+        """
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        """
+        :return: Number of entries on the cache.
+        :rtype: int
+        """
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Retrieves the value of a key, computing and storing it when missing. The value is computed outside the lock,
+        so two threads missing the same key at the same time may both compute it.
+        :param key: The key.
+        :type key: Hashable
+        :param compute: Function that computes the value of the key.
+        :type compute: Callable[[], Any]
+        :return: The value of the key.
+        :rtype: Any
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            self.misses += 1
+
+        value: Any = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache, the statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        :return: The size, hits, misses and evictions of the cache.
+        :rtype: dict[str, int]
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -5,13 +5,25 @@ Code adapted from https://github.com/colingrady/LiteCache/blob/main/litecache.py
 import pickle
 import sqlite3
 import time
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 import src.lib.cache.sql_commands as queries
+from src.lib.metrics.registry import REGISTRY, Counter, Histogram
+from src.lib.tracing.tracer import TRACER
 
 DAY_AS_SECONDS: int = 24 * 60 * 60
 DEFAULT_TTL = DAY_AS_SECONDS * 7  # Two week time to live.
 
+CACHE_SECONDS: Histogram = REGISTRY.histogram(
+    "shifter_cache_seconds", "Time spent on cache operations.", ("operation",)
+)
+CACHE_REQUESTS: Counter = REGISTRY.counter(
+    "shifter_cache_requests_total", "Keys looked up (hit or miss) and stored on the cache.", ("operation", "result")
+)
+CACHE_BYTES: Counter = REGISTRY.counter(
+    "shifter_cache_bytes_total", "Serialized bytes read from and written to the cache.", ("operation",)
+)
+
 
 class NotSet:
     """
@@ -30,6 +42,9 @@ class Cache:
     :type ttl: int
     :param save_on_exit: Enable of disable on exit saving (committing). True by default.
     :type save_on_exit: bool
+    :param shared: Whether the database is shared with other processes, the changes are then saved as soon as they are
+        made, and readers don't wait for the writer (write-ahead log). False by default.
+    :type shared: bool
 
     # TODO: Use SQLAlchemy to async database.
     """
@@ -39,11 +54,12 @@ class Cache:
         '_conn',
         'db',
         'ttl',
-        'save_on_exit'
+        'save_on_exit',
+        'shared'
     )
 
     def __init__(self, cache_db: Optional[str] = None,
-                 ttl: Optional[int] = DEFAULT_TTL, save_on_exit: Optional[bool] = True):
+                 ttl: Optional[int] = DEFAULT_TTL, save_on_exit: Optional[bool] = True, shared: bool = False):
         """
         Class constructor.
         """
@@ -56,6 +72,7 @@ class Cache:
         self.db: str = cache_db
         self.ttl = ttl
         self.save_on_exit = save_on_exit
+        self.shared = shared
 
     def __repr__(self) -> str:
         """
@@ -63,7 +80,7 @@ class Cache:
         :rtype: str
         """
         return (f'Cache(db={self.db}, ttl={self.ttl}, '
-                f'save_on_exit={self.save_on_exit})')
+                f'save_on_exit={self.save_on_exit}, shared={self.shared})')
 
     def __del__(self):
         """
@@ -141,6 +158,9 @@ class Cache:
             # Open the connection
             self._conn = sqlite3.connect(database=self.db, timeout=30)
 
+            if self.shared:  # Readers of other processes see the saved changes without waiting for the writer.
+                self._conn.execute(queries.SQL_JOURNAL_WAL)
+
             # Creating tables and indexes for the database.
             self._conn.execute(queries.SQL_TABLE_CREATE)
             self._conn.execute(queries.SQL_INDEX_CREATE)
@@ -173,8 +193,14 @@ class Cache:
         """
 
         # Query the database.
-        cursor: sqlite3.Cursor = self._connection.execute(queries.SQL_GET_KEY_SINCE, (key, self._since(ttl)))
-        return cursor.fetchone() is not None
+        with TRACER.span("cache.has"), REGISTRY.time_block(CACHE_SECONDS, operation="has"):
+            cursor: sqlite3.Cursor = self._connection.execute(queries.SQL_GET_KEY_SINCE, (key, self._since(ttl)))
+            found: bool = cursor.fetchone() is not None
+
+        if REGISTRY.enabled:
+            CACHE_REQUESTS.inc(operation="has", result="hit" if found else "miss")
+
+        return found
 
     def get(self, key: str, default: Optional[Any] = NotSet, ttl: Optional[int] = None) -> Any:
         """
@@ -192,18 +218,68 @@ class Cache:
         # Start with the default
         result: Any = default
 
-        # Querying the database for the data.
-        cursor: sqlite3.Cursor = self._connection.execute(queries.SQL_GET_KEY_SINCE, (key, self._since(ttl)))
-        row = cursor.fetchone()
+        with TRACER.span("cache.get"), REGISTRY.time_block(CACHE_SECONDS, operation="get"):
+            # Querying the database for the data.
+            cursor: sqlite3.Cursor = self._connection.execute(queries.SQL_GET_KEY_SINCE, (key, self._since(ttl)))
+            row = cursor.fetchone()
 
-        if row is not None:  # If there were results, deserialize them using pickle.
-            result = pickle.loads(row[0])
+            if row is not None:  # If there were results, deserialize them using pickle.
+                result = pickle.loads(row[0])
+
+        if REGISTRY.enabled:
+            CACHE_REQUESTS.inc(operation="get", result="miss" if row is None else "hit")
+            CACHE_BYTES.inc(0 if row is None else len(row[0]), operation="get")
 
         if result is NotSet:  # If result is still NotSet then we have no matches and raise a key (not found) error.
             raise KeyError(key)
 
         return result
 
+    def get_last_seen(self, key: str, ttl: Optional[int] = None) -> Optional[int]:
+        """
+        Retrieves the time a key was stored at, so other values can be stored to expire along with it.
+        :param key: The primary key value.
+        :type key: str
+        :param ttl: Optional overwrite ttl value.
+        :type ttl: int
+        :return: The last_seen value of the key, None if it doesn't exist or expired.
+        :rtype: Optional[int]
+        """
+        cursor: sqlite3.Cursor = self._connection.execute(queries.SQL_GET_LAST_SEEN_SINCE, (key, self._since(ttl)))
+        row: Optional[tuple[int]] = cursor.fetchone()
+
+        return None if row is None else row[0]
+
+    def get_many(self, keys: Iterable[str], ttl: Optional[int] = None) -> dict[str, Any]:
+        """
+        Retrieves the values of several keys from the database, with a single query.
+        :param keys: The primary key values.
+        :type keys: Iterable[str]
+        :param ttl: Optional overwrite ttl value.
+        :type ttl: int
+        :return: The value of each key stored on the database, missing keys are left out.
+        :rtype: dict[str, Any]
+        """
+        keys: list[str] = list(dict.fromkeys(keys))  # Without repeated keys.
+
+        if not keys:
+            return {}
+
+        with TRACER.span("cache.get_many", keys=len(keys)), REGISTRY.time_block(CACHE_SECONDS, operation="get_many"):
+            # Querying the database for the data.
+            cursor: sqlite3.Cursor = self._connection.execute(
+                queries.SQL_GET_KEYS_SINCE.format(", ".join("?" * len(keys))), (self._since(ttl), *keys)
+            )
+            rows: list[tuple[str, bytes]] = cursor.fetchall()
+            result: dict[str, Any] = {key: pickle.loads(value) for key, value in rows}
+
+        if REGISTRY.enabled:
+            CACHE_REQUESTS.inc(len(rows), operation="get_many", result="hit")
+            CACHE_REQUESTS.inc(len(keys) - len(rows), operation="get_many", result="miss")
+            CACHE_BYTES.inc(sum(len(value) for _, value in rows), operation="get_many")
+
+        return result
+
     def set(self, key: str, value: Any, last_seen: Optional[int] = None) -> None:
         """
         Inserting a new value into the cache.
@@ -218,11 +294,19 @@ class Cache:
         # Get the last_seen time.
         last_seen: Optional[int] = last_seen or self._now()
 
-        # Serialize the data using pickle.
-        data: bytes = pickle.dumps(value)
+        with TRACER.span("cache.set"), REGISTRY.time_block(CACHE_SECONDS, operation="set"):
+            # Serialize the data using pickle.
+            data: bytes = pickle.dumps(value)
 
-        # Insert the data to the database.
-        self._connection.execute(queries.SQL_ADD_UPDATE_KEY, (key, memoryview(data), last_seen))
+            # Insert the data to the database.
+            self._connection.execute(queries.SQL_ADD_UPDATE_KEY, (key, memoryview(data), last_seen))
+
+            if self.shared:
+                self.save()
+
+        if REGISTRY.enabled:
+            CACHE_REQUESTS.inc(operation="set", result="stored")
+            CACHE_BYTES.inc(len(data), operation="set")
 
     def expire(self, key: str) -> None:
         """
@@ -234,6 +318,9 @@ class Cache:
         last_seen = self._now() - 1
         self._connection.execute(queries.SQL_UPDATE_KEY_LAST_SEEN, (last_seen, key))
 
+        if self.shared:
+            self.save()
+
     def delete(self, key: str) -> None:
         """
         Delete the row which has the key specified.
@@ -241,6 +328,9 @@ class Cache:
         """
         self._connection.execute(queries.SQL_DELETE_KEY, (key,))
 
+        if self.shared:
+            self.save()
+
     def clear(self) -> None:
         """
         Clear the database.
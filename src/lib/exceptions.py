@@ -8,3 +8,11 @@ class CourseNameDoesNotExistException(Exception):
         super().__init__(message)
 
 
+class ScraperServiceException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class JobCancelledException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
@@ -0,0 +1,216 @@
+import asyncio
+import contextvars
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+
+from src.lib.exceptions import JobCancelledException
+
+MAX_FINISHED_JOBS: int = 1024
+
+
+class JobStatus(str, Enum):
+    """
+    The states of a job, a job is finished once it is done or failed.
+    """
+
+    PENDING = "pending"  # Waiting on the queue.
+    RUNNING = "running"  # Taken by a worker.
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(slots=True, eq=False)
+class Job:
+    """
+    This class represents a unit of work of a JobQueue, identified by a random id and deduplicated by its key.
+    :param key: Jobs with the same key do the same work, only one of them is queued at a time.
+    :type key: str
+    :param payload: The argument of the function that runs the job.
+    :type payload: Any
+    """
+
+    key: str
+    payload: Any
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.PENDING
+    result: Any = None
+    error: Optional[BaseException] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    callbacks: list[str] = field(default_factory=list)  # Urls notified once the job finishes.
+    context: Optional[contextvars.Context] = field(default_factory=contextvars.copy_context)  # Of the submitter.
+    finished: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.finished.is_set()
+
+
+class JobQueue:
+    """
+    This class represents a queue of jobs run by asyncio workers of the current event loop, so the requests that create
+    them don't wait for them to run. Submitting a job whose key is already queued or running returns the existing job,
+    so the same work is never done twice at the same time. Finished jobs are kept, up to a limit, to be looked up.
+
+    :param run: Coroutine function that runs a job, given its payload, returning its result.
+    :type run: Callable[[Any], Awaitable[Any]]
+    :param workers: Number of jobs run at the same time.
+    :type workers: int
+    :param on_finish: Coroutine function called with each job once it finishes, on a task of its own.
+    :type on_finish: Optional[Callable[[Job], Awaitable[None]]]
+    :param max_finished: Number of finished jobs kept.
+    :type max_finished: int
+    """
+
+    def __init__(
+            self,
+            run: Callable[[Any], Awaitable[Any]],
+            workers: int = 1,
+            on_finish: Optional[Callable[[Job], Awaitable[None]]] = None,
+            max_finished: int = MAX_FINISHED_JOBS) -> None:
+        self.__run: Callable[[Any], Awaitable[Any]] = run
+        self.__on_finish: Optional[Callable[[Job], Awaitable[None]]] = on_finish
+        self.workers: int = workers
+        self.max_finished: int = max_finished
+
+        self.__queue: Optional[asyncio.Queue[Job]] = None  # Created along with the workers, on the first submit.
+        self.__tasks: list[asyncio.Task] = []
+        self.__notifications: set[asyncio.Task] = set()  # Running on_finish calls.
+        self.__jobs: dict[str, Job] = {}  # Jobs by id.
+        self.__active: dict[str, Job] = {}  # Pending and running jobs by key.
+        self.__finished: OrderedDict[str, None] = OrderedDict()  # Ids of the finished jobs, oldest first.
+
+    def __len__(self) -> int:
+        """
+        :return: Number of pending and running jobs.
+        :rtype: int
+        """
+        return len(self.__active)
+
+    def submit(self, key: str, payload: Any, callback_url: Optional[str] = None) -> Job:
+        """
+        Queues a job, unless a job with the same key is pending or running, then that job is returned instead.
+        Must be called from the event loop that runs the jobs.
+        :param key: Key of the job.
+        :type key: str
+        :param payload: Argument of the function that runs the job.
+        :type payload: Any
+        :param callback_url: Url to notify once the job finishes.
+        :type callback_url: Optional[str]
+        :return: The queued job.
+        :rtype: Job
+        """
+        job: Optional[Job] = self.__active.get(key)
+
+        if job is None:
+            job = Job(key=key, payload=payload)
+            self.__jobs[job.id] = self.__active[key] = job
+
+            self.__start_workers()
+            self.__queue.put_nowait(job)
+
+        if callback_url is not None:
+            job.callbacks.append(callback_url)
+
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        :param job_id: Id of the job.
+        :type job_id: str
+        :return: The job, None if it doesn't exist or was already forgotten.
+        :rtype: Optional[Job]
+        """
+        return self.__jobs.get(job_id)
+
+    @staticmethod
+    async def wait(job: Job) -> Any:
+        """
+        Waits for a job to finish.
+        :param job: The job.
+        :type job: Job
+        :return: The result of the job.
+        :rtype: Any
+        :raises BaseException: The error of the job, if it failed.
+        """
+        await job.finished.wait()
+
+        if job.error is not None:
+            raise job.error
+
+        return job.result
+
+    def __start_workers(self) -> None:
+        if self.__queue is None:
+            self.__queue = asyncio.Queue()
+
+        self.__tasks = [task for task in self.__tasks if not task.done()]
+
+        while len(self.__tasks) < self.workers:
+            # The workers don't keep the context of the request that started them, each job runs in its own.
+            self.__tasks.append(asyncio.get_running_loop().create_task(self.__work(), context=contextvars.Context()))
+
+    async def __work(self) -> None:
+        while True:
+            job: Job = await self.__queue.get()
+            job.status = JobStatus.RUNNING
+
+            try:
+                try:
+                    job.result = await asyncio.get_running_loop().create_task(
+                        self.__run(job.payload), context=job.context
+                    )
+                    job.status = JobStatus.DONE
+
+                except asyncio.CancelledError:
+                    job.error = JobCancelledException(f"The job '{job.id}' was cancelled.")
+                    job.status = JobStatus.FAILED
+
+                    if asyncio.current_task().cancelling():  # The worker itself is stopped, not only the job.
+                        raise
+
+                except Exception as e:  # The error is kept on the job, for whoever waits for it.
+                    job.error = e
+                    job.status = JobStatus.FAILED
+
+            finally:  # Even a cancelled job is finished, or the later jobs of its key would wait for it forever.
+                self.__finish(job)
+
+            if self.__on_finish is not None:  # Not awaited, a slow notification doesn't hold up the next jobs.
+                task: asyncio.Task = asyncio.get_running_loop().create_task(self.__notify(job))
+                self.__notifications.add(task)
+                task.add_done_callback(self.__notifications.discard)
+
+    async def __notify(self, job: Job) -> None:
+        try:
+            await self.__on_finish(job)
+
+        except Exception:  # A failed notification is only lost.
+            pass
+
+    def __finish(self, job: Job) -> None:
+        job.finished_at = time.time()
+        job.finished.set()
+        job.context = None
+
+        del self.__active[job.key]
+        self.__finished[job.id] = None
+
+        while len(self.__finished) > self.max_finished:  # Forgetting the oldest finished jobs.
+            forgotten: str = self.__finished.popitem(last=False)[0]
+            del self.__jobs[forgotten]
+
+    def close(self) -> None:
+        """
+        Stops the workers and notifications, the running jobs fail and the pending ones are left queued, for the next
+        workers.
+        """
+        task: asyncio.Task
+        for task in [*self.__tasks, *self.__notifications]:
+            task.cancel()
+
+        self.__tasks = []
@@ -0,0 +1,393 @@
+import bisect
+import functools
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Iterable, Iterator, Optional
+
+# Upper bounds of the latency buckets, in seconds, from a cache lookup to a full scrape.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+CONTENT_TYPE: str = "text/plain; version=0.0.4"  # Responses add the utf-8 charset.
+
+LabelValues = tuple[str, ...]
+"""
+Values of the labels of a sample, in the order of the label names of its metric.
+"""
+
+Sample = tuple[str, dict[str, str], float]
+"""
+A line of the text exposition format, as (name, labels, value).
+"""
+
+
+def format_value(value: float) -> str:
+    """
+    Formats a sample value as the text exposition format expects it.
+    :param value: The value.
+    :type value: float
+    :return: The formatted value.
+    :rtype: str
+    """
+    if value == float("inf"):
+        return "+Inf"
+
+    return repr(float(value))
+
+
+def escape_label_value(value: str) -> str:
+    """
+    Escapes the backslashes, double quotes and line feeds of a label value.
+    :param value: The value.
+    :type value: str
+    :return: The escaped value.
+    :rtype: str
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """
+    Formats the labels of a sample.
+    :param labels: The labels.
+    :type labels: dict[str, str]
+    :return: The labels between braces, empty if there are none.
+    :rtype: str
+    """
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+class Metric:
+    """
+    This is the base class of the metrics of a registry, a family of samples sharing a name and the names of their
+    labels, with a sample per combination of label values.
+
+    :param name: Name of the metric.
+    :type name: str
+    :param documentation: Description of the metric.
+    :type documentation: str
+    :param label_names: Names of the labels of the samples.
+    :type label_names: tuple[str, ...]
+    """
+
+    type: str = "untyped"
+
+    __slots__ = ("name", "documentation", "label_names", "_lock")
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: tuple[str, ...] = label_names
+        self._lock: threading.Lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> LabelValues:
+        """
+        :return: The values of the labels, in order.
+        :rtype: LabelValues
+        """
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _labels(self, key: LabelValues) -> dict[str, str]:
+        """
+        :return: The labels of a key, by name.
+        :rtype: dict[str, str]
+        """
+        return dict(zip(self.label_names, key))
+
+    def samples(self) -> Iterator[Sample]:
+        """
+        :return: The samples of the metric.
+        :rtype: Iterator[Sample]
+        """
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        """
+        Formats the metric in the text exposition format.
+        :return: The lines of the metric.
+        :rtype: str
+        """
+        lines: list[str] = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+        name: str
+        labels: dict[str, str]
+        value: float
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """
+    This class represents a value that only goes up, like a number of requests or of bytes.
+    """
+
+    type: str = "counter"
+
+    __slots__ = ("_values",)
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """
+        Increases the sample of the given labels.
+        :param amount: The increase.
+        :type amount: float, optional
+        """
+        key: LabelValues = self._key(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values: list[tuple[LabelValues, float]] = list(self._values.items())
+
+        key: LabelValues
+        value: float
+        for key, value in values:
+            yield self.name, self._labels(key), value
+
+
+class Histogram(Metric):
+    """
+    This class represents a distribution of observed values, like latencies, counted in buckets by their upper bound.
+
+    :param buckets: The upper bounds of the buckets, in ascending order, the +Inf bucket is implied.
+    :type buckets: tuple[float, ...]
+    """
+
+    type: str = "histogram"
+
+    __slots__ = ("buckets", "_counts", "_sums")
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets: tuple[float, ...] = buckets
+        self._counts: dict[LabelValues, list[int]] = {}  # Observations of each bucket, the last one is +Inf.
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Adds an observation to the sample of the given labels.
+        :param value: The observed value.
+        :type value: float
+        """
+        key: LabelValues = self._key(labels)
+        bucket: int = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            counts: Optional[list[int]] = self._counts.get(key)
+
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+
+            counts[bucket] += 1
+            self._sums[key] += value
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values: list[tuple[LabelValues, list[int], float]] = [
+                (key, list(counts), self._sums[key]) for key, counts in self._counts.items()
+            ]
+
+        key: LabelValues
+        counts: list[int]
+        total: float
+        for key, counts, total in values:
+            labels: dict[str, str] = self._labels(key)
+            cumulative: int = 0
+
+            bound: float
+            count: int
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": format_value(bound)}, cumulative
+
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class CallbackMetric(Metric):
+    """
+    This class represents values owned by something else, which are read as they are exposed.
+
+    :param collect: Function that returns the value of each sample, by the values of its labels.
+    :type collect: Callable[[], dict[LabelValues, float]]
+    :param metric_type: Type of the values, 'gauge' if they can go down, 'counter' otherwise.
+    :type metric_type: str
+    """
+
+    __slots__ = ("collect", "type")
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: tuple[str, ...],
+            collect: Callable[[], dict[LabelValues, float]],
+            metric_type: str = "gauge") -> None:
+        super().__init__(name, documentation, label_names)
+        self.collect: Callable[[], dict[LabelValues, float]] = collect
+        self.type: str = metric_type
+
+    def samples(self) -> Iterator[Sample]:
+        key: LabelValues
+        value: float
+        for key, value in self.collect().items():
+            yield self.name, self._labels(key), value
+
+
+class Timer:
+    """
+    Context manager that observes the time spent inside it on a histogram.
+    """
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: dict[str, Any]) -> None:
+        self.histogram: Histogram = histogram
+        self.labels: dict[str, Any] = labels
+        self.start: float = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class MetricsRegistry:
+    """
+    This class holds the metrics of the process and exposes them in the text exposition format. While disabled, the
+    helpers of the registry (time_block, timed, iter_timed) don't measure anything, so instrumented code costs a
+    single attribute check.
+
+    :param enabled: Whether the metrics are collected.
+    :type enabled: bool
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled: bool = enabled
+        self.__metrics: dict[str, Metric] = {}
+        self.__lock: threading.Lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Registers a metric, unless one with the same name already is, then that one is returned.
+        :param metric: The metric.
+        :type metric: Metric
+        :return: The registered metric.
+        :rtype: Metric
+        """
+        with self.__lock:
+            return self.__metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            label_names: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def time_block(self, histogram: Histogram, **labels: Any) -> ContextManager:
+        """
+        :return: A context manager that observes the time spent inside it, if the registry is enabled.
+        :rtype: ContextManager
+        """
+        if not self.enabled:
+            return nullcontext()
+
+        return Timer(histogram, labels)
+
+    def timed(self, histogram: Histogram, **labels: Any) -> Callable[[Callable], Callable]:
+        """
+        Decorator that observes the time spent by each call of a function, if the registry is enabled.
+        """
+
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return function(*args, **kwargs)
+
+                with Timer(histogram, labels):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def iter_timed(self, iterator: Iterable[Any], histogram: Histogram, **labels: Any) -> Iterable[Any]:
+        """
+        Observes the time spent producing the items of an iterator, without the time spent by its consumer between
+        items, once it is exhausted or closed.
+        :return: The items of the iterator, the iterator itself if the registry is disabled.
+        :rtype: Iterable[Any]
+        """
+        if not self.enabled:
+            return iterator
+
+        return self.__iter_timed(iter(iterator), histogram, labels)
+
+    @staticmethod
+    def __iter_timed(iterator: Iterator[Any], histogram: Histogram, labels: dict[str, Any]) -> Iterator[Any]:
+        elapsed: float = 0.0
+
+        try:
+            while True:
+                start: float = time.perf_counter()
+
+                try:
+                    item: Any = next(iterator)
+
+                finally:
+                    elapsed += time.perf_counter() - start
+
+                yield item
+
+        except StopIteration:
+            return
+
+        finally:
+            histogram.observe(elapsed, **labels)
+
+            close: Optional[Callable[[], None]] = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def expose(self) -> str:
+        """
+        Formats every metric in the text exposition format.
+        :return: The document.
+        :rtype: str
+        """
+        with self.__lock:
+            metrics: list[Metric] = list(self.__metrics.values())
+
+        return "".join(exposed + "\n" for exposed in map(Metric.expose, metrics))
+
+
+REGISTRY: MetricsRegistry = MetricsRegistry()
+"""
+The registry of the process, disabled until it is enabled by whoever runs shifter.
+"""
@@ -0,0 +1,229 @@
+import cProfile
+import marshal
+import os
+import signal
+import sys
+import threading
+from argparse import ArgumentParser, Namespace
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from enum import Enum
+from types import CodeType, FrameType
+from typing import Any, ContextManager, Iterator, Optional
+
+DEFAULT_INTERVAL: float = 0.005  # Seconds between samples, 200 per second.
+
+
+class ProfileFormat(str, Enum):
+    """
+    The outputs of a profile.
+    """
+
+    COLLAPSED = "collapsed"  # Sampled stacks of every thread, a line per stack ('thread;outer;...;inner count').
+    PSTATS = "pstats"  # Deterministic profile of the thread that started it, as written by cProfile (snakeviz, ...).
+
+
+def frame_label(frame: FrameType) -> str:
+    """
+    :return: The name of the function of a frame, along with its module, like 'src.lib.scraper.parser:parse'.
+    :rtype: str
+    """
+    code: CodeType = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """
+    This class samples the stacks of every thread of the process, counting the samples by stack, so it can profile a
+    running process without tracing every call.
+
+    Started from the main thread on unix, the samples are taken by a SIGPROF handler every interval of cpu time of
+    the process, which runs between two bytecodes of the main thread, so busy code is sampled as often as it runs.
+    Otherwise they are taken by a thread every interval of wall time, which can only run once the GIL is released,
+    so code that releases it often (like an event loop polling) is over-represented.
+
+    :param interval: Seconds between samples.
+    :type interval: float
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL) -> None:
+        self.interval: float = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples: int = 0
+
+        self.__stopped: threading.Event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.__previous_handler: Any = None
+        self.__uses_signal: bool = False
+
+    def start(self) -> None:
+        self.__uses_signal = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+        if self.__uses_signal:
+            self.__previous_handler = signal.signal(signal.SIGPROF, self.__on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+        else:
+            self.__stopped.clear()
+            self.__thread = threading.Thread(target=self.__sample_periodically, name="sampling-profiler", daemon=True)
+            self.__thread.start()
+
+    def stop(self) -> None:
+        if self.__uses_signal:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self.__previous_handler)
+
+        elif self.__thread is not None:
+            self.__stopped.set()
+            self.__thread.join()
+            self.__thread = None
+
+    def __on_signal(self, signum: int, frame: Optional[FrameType]) -> None:
+        self.__sample(threading.main_thread().ident, frame)
+
+    def __sample_periodically(self) -> None:
+        while not self.__stopped.wait(self.interval):
+            self.__sample(threading.get_ident(), None)
+
+    def __sample(self, current_id: int, current_frame: Optional[FrameType]) -> None:
+        """
+        Counts the stack of every thread, the current thread is only sampled if its frame is given.
+        """
+        names: dict[int, str] = {thread.ident: thread.name for thread in threading.enumerate()}
+        frames: dict[int, FrameType] = sys._current_frames()
+
+        if current_frame is not None:
+            frames[current_id] = current_frame
+
+        else:
+            frames.pop(current_id, None)
+
+        thread_id: int
+        frame: Optional[FrameType]
+        for thread_id, frame in frames.items():
+            stack: list[str] = []
+
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.stacks[tuple(reversed(stack))] += 1
+
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """
+        :return: The sampled stacks in the collapsed format, the most sampled first.
+        :rtype: str
+        """
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileSession:
+    """
+    This class runs a profile in either format, between start and stop.
+
+    :param profile_format: The output of the profile.
+    :type profile_format: ProfileFormat
+    :param interval: Seconds between samples, of a collapsed profile.
+    :type interval: float
+    """
+
+    def __init__(
+            self,
+            profile_format: ProfileFormat = ProfileFormat.COLLAPSED,
+            interval: float = DEFAULT_INTERVAL) -> None:
+        self.profile_format: ProfileFormat = profile_format
+        self.__sampler: Optional[SamplingProfiler] = None
+        self.__profile: Optional[cProfile.Profile] = None
+
+        if profile_format is ProfileFormat.COLLAPSED:
+            self.__sampler = SamplingProfiler(interval)
+
+        else:
+            self.__profile = cProfile.Profile()
+
+    def start(self) -> None:
+        if self.__sampler is not None:
+            self.__sampler.start()
+
+        else:
+            self.__profile.enable()
+
+    def stop(self) -> bytes:
+        """
+        Stops the profile.
+        :return: The collapsed stacks, as utf-8 text, or the statistics as a pstats file.
+        :rtype: bytes
+        """
+        if self.__sampler is not None:
+            self.__sampler.stop()
+            return self.__sampler.collapsed().encode()
+
+        self.__profile.disable()
+        self.__profile.create_stats()
+
+        return marshal.dumps(self.__profile.stats)  # The contents of Profile.dump_stats.
+
+
+@contextmanager
+def profile_to_file(
+        path: str,
+        profile_format: ProfileFormat = ProfileFormat.COLLAPSED,
+        interval: float = DEFAULT_INTERVAL) -> Iterator[ProfileSession]:
+    """
+    Context manager that profiles the code inside it and writes the profile to a file, even if the code raises.
+    :param path: Path of the file.
+    :type path: str
+    :param profile_format: The output of the profile.
+    :type profile_format: ProfileFormat
+    :param interval: Seconds between samples, of a collapsed profile.
+    :type interval: float
+    :return: The profile.
+    :rtype: Iterator[ProfileSession]
+    """
+    session: ProfileSession = ProfileSession(profile_format, interval)
+    session.start()
+
+    try:
+        yield session
+
+    finally:
+        content: bytes = session.stop()
+
+        with open(os.path.expanduser(path), "wb") as file:
+            file.write(content)
+
+
+def add_profile_arguments(parser: ArgumentParser) -> None:
+    """
+    Adds the --profile and --profile-format options to the arguments of a program.
+    :param parser: The parser of the arguments.
+    :type parser: ArgumentParser
+    """
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        default=None,
+        help="profile the run and write the profile to PATH (disabled by default)",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=[profile_format.value for profile_format in ProfileFormat],
+        default=ProfileFormat.COLLAPSED.value,
+        help="collapsed stacks sampled from every thread, or pstats of the main thread (default: collapsed)",
+    )
+
+
+def profile_from_arguments(arguments: Namespace) -> ContextManager:
+    """
+    :param arguments: The arguments parsed by a parser given to add_profile_arguments.
+    :type arguments: Namespace
+    :return: A context manager that profiles the code inside it if --profile was given.
+    :rtype: ContextManager
+    """
+    if arguments.profile is None:
+        return nullcontext()
+
+    return profile_to_file(arguments.profile, ProfileFormat(arguments.profile_format))
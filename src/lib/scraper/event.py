@@ -1,9 +1,74 @@
 import re
+import sys
 from dataclasses import dataclass
 from datetime import datetime
+from enum import IntEnum
 
+from src.lib.scraper.utils import minutes_to_datetime
 
-@dataclass(frozen=True)
+
+class Weekday(IntEnum):
+    """
+    This enum represents a weekday as its index on the week, starting on monday. The labels are the ones used by the
+    schedules page.
+    """
+
+    MONDAY = 0
+    TUESDAY = 1
+    WEDNESDAY = 2
+    THURSDAY = 3
+    FRIDAY = 4
+    SATURDAY = 5
+    SUNDAY = 6
+
+    @property
+    def label(self) -> str:
+        """
+        :return: The name of the weekday as shown on the schedules page.
+        :rtype: str
+        """
+        return WEEKDAY_LABELS[self]
+
+    @property
+    def abbr(self) -> str:
+        """
+        :return: The two letter abbreviation of the weekday (MO, TU, ...), as used by iCalendar.
+        :rtype: str
+        """
+        return self.name[:2]
+
+    @classmethod
+    def from_label(cls, label: str) -> "Weekday":
+        """
+        Class method that obtains the weekday from its name, the comparison is case-insensitive.
+        :param label: Name of the weekday (Segunda-Feira, Terça-Feira, ...).
+        :type label: str
+        :return: The corresponding weekday.
+        :rtype: Weekday
+        """
+        try:
+            return _LABEL_TO_WEEKDAY[label.strip().casefold()]
+
+        except KeyError:
+            raise ValueError(f"Unknown weekday '{label}'.")
+
+
+WEEKDAY_LABELS: tuple[str, ...] = (
+    "Segunda-Feira",
+    "Terça-Feira",
+    "Quarta-Feira",
+    "Quinta-Feira",
+    "Sexta-Feira",
+    "Sábado",
+    "Domingo",
+)
+
+_LABEL_TO_WEEKDAY: dict[str, Weekday] = {
+    label.casefold(): Weekday(index) for index, label in enumerate(WEEKDAY_LABELS)
+}
+
+
+@dataclass(frozen=True, slots=True)
 class Location:
     """
     This class represents the location of an event.
@@ -30,9 +95,18 @@ class Location:
         """
         campus, building, room = tuple(string.replace(" ", "").split("-"))
         return cls(
-            building=building.replace("Edificio", "CP"), campus=campus, room=room
+            building=sys.intern(building.replace("Edificio", "CP")),
+            campus=sys.intern(campus),
+            room=sys.intern(room),
         )
 
+    def as_dict(self) -> dict:
+        """
+        :return: A dictionary representation of the location, equal to dataclasses.asdict.
+        :rtype: dict
+        """
+        return {"building": self.building, "campus": self.campus, "room": self.room}
+
     def __str__(self) -> str:
         """
         String representation of the class.
@@ -40,7 +114,7 @@ class Location:
         return f"{self.campus} - {self.building} {self.room}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScheduleBody:
     """
     This class represents the body of an event.
@@ -71,9 +145,22 @@ class ScheduleBody:
         location_obj: Location = Location.from_string(location)
 
         return cls(
-            name=course_name.strip().lower(), location=location_obj, shift=shift.strip()
+            name=sys.intern(course_name.strip().lower()),
+            location=location_obj,
+            shift=sys.intern(shift.strip()),
         )
 
+    def as_dict(self) -> dict:
+        """
+        :return: A dictionary representation of the body, equal to dataclasses.asdict.
+        :rtype: dict
+        """
+        return {
+            "name": self.name,
+            "location": self.location.as_dict(),
+            "shift": self.shift,
+        }
+
     def __str__(self):
         """
         String representation of the class.
@@ -81,49 +168,95 @@ class ScheduleBody:
         return f"{self.name.title()}\n{self.location} - {self.shift}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScheduleEvent:
     """
     This class represents an event.
     :param body: Event details.
     :type body: ScheduleBody
-    :param starts_at: Starting that of the event.
-    :type starts_at: datetime
-    :param duration: Duration of the event.
-    :type duration: datetime
-    :param weekday: Weekday of the event.
-    :type weekday: str
+    :param start: Starting time of the event, in minutes since midnight.
+    :type start: int
+    :param end: Ending time of the event, in minutes since midnight.
+    :type end: int
+    :param day: Weekday of the event.
+    :type day: Weekday
     """
 
     body: ScheduleBody
-    starts_at: datetime
-    duration: datetime
-    weekday: str
+    start: int
+    end: int
+    day: Weekday
 
     @classmethod
     def build(
-        cls, body: str, starts_at: datetime, duration: datetime, weekday: str
+        cls, body: str, start: int, duration: int, weekday: str | Weekday
     ) -> "ScheduleEvent":
         """
         Given a string and some details (duration, starting time, weekday), this method builds an event.
         :param body: Event details as string.
         :type body: str
-        :param starts_at: Starting that of the event.
-        :type starts_at: datetime
-        :param duration: Duration of the event.
-        :type duration: datetime
-        :param weekday: Weekday of the event.
-        :type weekday: str
+        :param start: Starting time of the event, in minutes since midnight.
+        :type start: int
+        :param duration: Duration of the event, in minutes.
+        :type duration: int
+        :param weekday: Weekday of the event, either its name or the enum value.
+        :type weekday: str | Weekday
         :return: ScheduleEvent object representing the event.
         :rtype: ScheduleEvent
         """
         return cls(
             body=ScheduleBody.from_string(body),
-            starts_at=starts_at,
-            duration=duration,
-            weekday=weekday,
+            start=start,
+            end=start + duration,
+            day=weekday if isinstance(weekday, Weekday) else Weekday.from_label(weekday),
         )
 
+    @property
+    def length(self) -> int:
+        """
+        :return: Duration of the event in minutes.
+        :rtype: int
+        """
+        return self.end - self.start
+
+    @property
+    def weekday(self) -> str:
+        """
+        :return: Name of the weekday of the event, used as key on the Schedule.
+        :rtype: str
+        """
+        return WEEKDAY_LABELS[self.day]
+
+    @property
+    def starts_at(self) -> datetime:
+        """
+        :return: Starting time of the event as a datetime on the dummy 1900-01-01 date.
+        :rtype: datetime
+        """
+        return minutes_to_datetime(self.start)
+
+    @property
+    def duration(self) -> datetime:
+        """
+        :return: Duration of the event as a datetime on the dummy 1900-01-01 date.
+        :rtype: datetime
+        """
+        return minutes_to_datetime(self.end - self.start)
+
+    def as_dict(self) -> dict:
+        """
+        Dictionary representation of the event, keeps the same shape and values dataclasses.asdict produced when
+        the times were stored as datetimes.
+        :return: A dictionary representation of the event.
+        :rtype: dict
+        """
+        return {
+            "body": self.body.as_dict(),
+            "starts_at": self.starts_at,
+            "duration": self.duration,
+            "weekday": self.weekday,
+        }
+
     def __str__(self):
         """
         String representation of the class.
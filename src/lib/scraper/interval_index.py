@@ -0,0 +1,104 @@
+import heapq
+from dataclasses import dataclass
+
+from src.lib.scraper.event import ScheduleEvent
+
+
+@dataclass(frozen=True, slots=True)
+class Collision:
+    """
+    This class represents a group of events that overlap, directly or through other events of the group.
+    :param start: Starting time of the earliest event of the group, in minutes since midnight.
+    :type start: int
+    :param end: Ending time of the latest event of the group, in minutes since midnight.
+    :type end: int
+    :param events: Events of the group, sorted by their starting time.
+    :type events: tuple[ScheduleEvent, ...]
+    :param concurrency: Maximum number of events of the group happening at the same time.
+    :type concurrency: int
+    """
+
+    start: int
+    end: int
+    events: tuple[ScheduleEvent, ...]
+    concurrency: int
+
+
+class IntervalIndex:
+    """
+    This class indexes the events of a single weekday, computing with a sweep line every group of overlapping events
+    and a lane (column) for each event, in a way that events on the same lane never overlap. The index is built in
+    O(n log n) and uses the minimum amount of lanes possible, that is, the maximum concurrency of the day.
+
+    :param events: Events of the weekday.
+    :type events: list[ScheduleEvent]
+    """
+
+    __slots__ = ("collisions", "lanes", "width")
+
+    def __init__(self, events: list[ScheduleEvent]) -> None:
+        """
+        Class constructor, builds the index.
+        """
+
+        self.collisions: list[Collision] = []
+        """
+        Groups of overlapping events, sorted by their starting time.
+        """
+
+        self.lanes: list[int] = [0] * len(events)
+        """
+        The lane of each event, in the same order as the provided events.
+        """
+
+        self.width: int = 1
+        """
+        Number of lanes needed to draw the weekday without overlaps, at least one.
+        """
+
+        order: list[int] = sorted(range(len(events)), key=lambda i: (events[i].start, events[i].end))
+
+        active: list[tuple[int, int]] = []  # Heap of (end, lane) for the events still going on.
+        free_lanes: list[int] = []  # Heap of the lanes released by events that already ended.
+        group: list[int] = []  # Events of the current overlapping group.
+        group_end: int = 0
+        concurrency: int = 0
+
+        i: int
+        for i in order:
+            event: ScheduleEvent = events[i]
+
+            # Releasing the lanes of the events that ended before this one starts.
+            while active and active[0][0] <= event.start:
+                heapq.heappush(free_lanes, heapq.heappop(active)[1])
+
+            if not active:  # Nothing is going on, the current group is complete.
+                self._close_group(events, group, group_end, concurrency)
+                group, free_lanes, concurrency = [], [], 0
+
+            lane: int = heapq.heappop(free_lanes) if free_lanes else len(active)
+            heapq.heappush(active, (event.end, lane))
+
+            self.lanes[i] = lane
+            group.append(i)
+            group_end = max(group_end, event.end) if len(group) > 1 else event.end
+            concurrency = max(concurrency, len(active))
+
+        self._close_group(events, group, group_end, concurrency)
+
+    def _close_group(self, events: list[ScheduleEvent], group: list[int], end: int, concurrency: int) -> None:
+        """
+        Registers a group of events as a collision if it has more than one event.
+        """
+        if len(group) < 2:
+            return
+
+        self.collisions.append(
+            Collision(
+                start=events[group[0]].start,
+                end=end,
+                events=tuple(events[i] for i in group),
+                concurrency=concurrency,
+            )
+        )
+        self.width = max(self.width, concurrency)
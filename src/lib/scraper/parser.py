@@ -1,12 +1,15 @@
 import re
-from datetime import datetime
 
 from bs4 import BeautifulSoup
 from bs4.element import ResultSet
 
-from src.lib.scraper.event import ScheduleEvent
+from src.lib.metrics.registry import REGISTRY, Histogram
+from src.lib.scraper.event import ScheduleEvent, Weekday
+from src.lib.tracing.tracer import TRACER
 from src.lib.scraper.schedule import Schedule
-from src.lib.scraper.utils import add_to_time
+from src.lib.scraper.utils import minutes_from_str
+
+PARSE_SECONDS: Histogram = REGISTRY.histogram("shifter_parse_seconds", "Time spent parsing a scraped schedule page.")
 
 # todo: remove hard coded values, put them in variables or onto a config class
 
@@ -27,47 +30,45 @@ class ScheduleParser:
             list[str]: List of the weekdays as strings
         """
         weekday_table = (sched.find_all("table", class_="rsHorizontalHeaderTable"))[0]
-        return [weekday.text.title() for weekday in weekday_table.find_all("a")]
+        return [Weekday.from_label(weekday.text).label for weekday in weekday_table.find_all("a")]
 
     @staticmethod
-    def __parse_start_time(sched: BeautifulSoup) -> datetime:
+    def __parse_start_time(sched: BeautifulSoup) -> int:
         """Get the starting time of the schedule, present on the first time table row.
 
         Args:
             sched (BeautifulSoup): Queriable schedule object.
 
         Returns:
-            datetime: Starting time as a datatime object.
+            int: Starting time in minutes since midnight.
         """
         time_table = (sched.find_all("table", class_="rsVerticalHeaderTable"))[0]
         time_str: str = time_table.find_next("div").text.title().strip()
-        return datetime.strptime(time_str, "%H:%M")
+        return minutes_from_str(time_str)
 
     @staticmethod
-    def __parse_duration(style_string: str) -> datetime:
+    def __parse_duration(style_string: str) -> int:
         """
         Given a style css string, this method extracts the height of the container and based on that calculates the
         duration of it. Height above 200 means a duration of 2 hours, height bellow 200 means a duration of 1 hour.
         :param style_string: String containing the css string of the container.
         :type style_string: str
-        :return: The duration as a datetime.
-        :rtype: datetime
+        :return: The duration in minutes.
+        :rtype: int
         """
         block_height_match: re.Match = re.search(r"height:(\d+)px", style_string)
-        duration: str = "2:00" if int(block_height_match.group(1)) > 200 else "1:00"
-
-        return datetime.strptime(duration, "%H:%M")
+        return 120 if int(block_height_match.group(1)) > 200 else 60
 
     def __parse_blocks(
-        self, context: ResultSet, current_time: datetime, weekday: str
+        self, context: ResultSet, current_time: int, weekday: str
     ) -> list[ScheduleEvent]:
         """
         Each row of the schedule can and will have multiple events, this method parses those events into
         ScheduleEvent objects.
         :param context: Current 'block' we are in.
         :type context: ResultSet
-        :param current_time: Current time of events.
-        :type current_time: datetime
+        :param current_time: Current time of events, in minutes since midnight.
+        :type current_time: int
         :param weekday: Current weekday.
         :type weekday: str
         :return: List of every parsed block inside the container.
@@ -76,17 +77,19 @@ class ScheduleParser:
 
         events: list[ScheduleEvent] = []
         for block in context:
-            duration: datetime = self.__parse_duration(block["style"])
+            duration: int = self.__parse_duration(block["style"])
             event = ScheduleEvent.build(
                 body=block["title"],
                 duration=duration,
-                starts_at=current_time,
+                start=current_time,
                 weekday=weekday,
             )
             events.append(event)
 
         return events
 
+    @TRACER.traced("parser.parse")
+    @REGISTRY.timed(PARSE_SECONDS)
     def parse(self, raw_content: str) -> Schedule:
         """
         Given the raw source code of the scraped page, this method is responsible for parsing every and each event
@@ -100,14 +103,14 @@ class ScheduleParser:
         soup: BeautifulSoup = BeautifulSoup(raw_content, "lxml")  # parse into soup
 
         weekdays: list[str] = self.__parse_weekdays(soup)
-        starting_time: datetime = self.__parse_start_time(soup)
+        starting_time: int = self.__parse_start_time(soup)
 
         schedule: Schedule = Schedule(weekdays)
         schedule_rows = soup.find_all("table", class_="rsContentTable")[0].find_all(
             "tr"
         )
 
-        current_time: datetime = starting_time
+        current_time: int = starting_time
         for row in schedule_rows:
             for index, column in enumerate(row.find_all("td")):
                 current_weekday = weekdays[index]
@@ -121,6 +124,6 @@ class ScheduleParser:
                 for event in events:
                     schedule.add_event(event)
 
-            current_time = add_to_time(current_time, minutes=30)
+            current_time += 30
 
         return schedule
@@ -1,9 +1,14 @@
-from dataclasses import asdict
-from datetime import time, timedelta
-from typing import Optional
+import bisect
+import hashlib
+import heapq
+from operator import attrgetter
+from typing import Iterable, Optional
 
-from src.lib.scraper.event import ScheduleEvent
-from src.lib.scraper.utils import calculate_final_time
+from src.lib.scraper.event import Location, ScheduleBody, ScheduleEvent, Weekday
+from src.lib.scraper.interval_index import Collision, IntervalIndex
+
+
+FINGERPRINT_SIZE: int = 16  # Bytes.
 
 
 class Schedule:
@@ -25,6 +30,98 @@ class Schedule:
         of ScheduleEvent. 
         """
 
+        self._interval_indexes: dict[str, IntervalIndex] = {}
+        """
+        Interval index of each weekday, built on demand and invalidated once an event is added.
+        """
+
+        self._fingerprint: Optional[str] = None
+        """
+        Digest of the content of the schedule, computed on demand and invalidated once an event is added.
+        """
+
+        self._reset_indexes()
+
+    def _reset_indexes(self) -> None:
+        """
+        Creates the (empty) secondary indexes of the schedule, they are kept up to date by add_event. Every entry is a
+        (sequence, event) pair, where the sequence is the order in which the event was added to the schedule.
+        """
+
+        self._sequence: int = 0
+
+        self._by_course: dict[str, list[tuple[int, ScheduleEvent]]] = {}
+        self._by_shift: dict[tuple[str, str], list[tuple[int, ScheduleEvent]]] = {}
+        self._by_location: dict[Location, list[tuple[int, ScheduleEvent]]] = {}
+
+        self._start_times: dict[str, list[int]] = {weekday: [] for weekday in self.schedule}
+        self._by_start_time: dict[str, list[tuple[int, ScheduleEvent]]] = {weekday: [] for weekday in self.schedule}
+        """
+        Events of each weekday sorted by their starting time, _start_times holds the (bisectable) starting times.
+        """
+
+    def _index_event(self, event: ScheduleEvent) -> None:
+        """
+        Add an event to the secondary indexes.
+        :param event: Event to index.
+        :type event: ScheduleEvent
+        """
+        entry: tuple[int, ScheduleEvent] = (self._sequence, event)
+        self._sequence += 1
+
+        self._by_course.setdefault(event.body.name, []).append(entry)
+        self._by_shift.setdefault((event.body.name, event.body.shift), []).append(entry)
+        self._by_location.setdefault(event.body.location, []).append(entry)
+
+        start_times: list[int] = self._start_times[event.weekday]
+        position: int = bisect.bisect_right(start_times, event.start)
+        start_times.insert(position, event.start)
+        self._by_start_time[event.weekday].insert(position, entry)
+
+    def _index_sorted_events(self, weekday: str, events: list[ScheduleEvent]) -> None:
+        """
+        Add the events of a weekday to the secondary indexes at once, the events must be sorted by their starting
+        time and start no earlier than the events of the weekday already indexed.
+        :param weekday: Weekday of the events.
+        :type weekday: str
+        :param events: Events to index.
+        :type events: list[ScheduleEvent]
+        """
+        entries: list[tuple[int, ScheduleEvent]] = list(enumerate(events, self._sequence))
+        self._sequence += len(entries)
+
+        self._start_times[weekday].extend([event.start for event in events])
+        self._by_start_time[weekday].extend(entries)
+
+        entry: tuple[int, ScheduleEvent]
+        for entry in entries:
+            body: ScheduleBody = entry[1].body
+
+            self._by_course.setdefault(body.name, []).append(entry)
+            self._by_shift.setdefault((body.name, body.shift), []).append(entry)
+            self._by_location.setdefault(body.location, []).append(entry)
+
+    def __getstate__(self) -> dict:
+        """
+        The indexes are derived data, so they are left out when pickling (caching) the schedule. The fingerprint is
+        kept, so that schedules loaded from the cache don't need to compute it again.
+        """
+        return {"weekdays": self.weekdays, "schedule": self.schedule, "fingerprint": self.get_fingerprint()}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores a pickled schedule, rebuilding its indexes.
+        """
+        self.weekdays = state["weekdays"]
+        self.schedule = state["schedule"]
+        self._interval_indexes = {}
+        self._fingerprint = state.get("fingerprint")
+        self._reset_indexes()
+
+        event: ScheduleEvent
+        for event in self.get_events():
+            self._index_event(event)
+
     def add_event(self, event: ScheduleEvent) -> None:
         """
         Add an event to the schedule.
@@ -32,6 +129,9 @@ class Schedule:
         :type event: ScheduleEvent
         """
         self.schedule[event.weekday].append(event)
+        self._interval_indexes.pop(event.weekday, None)
+        self._fingerprint = None
+        self._index_event(event)
 
     def get_events_from_weekday(self, weekday: str) -> list[ScheduleEvent]:
         """
@@ -43,55 +143,26 @@ class Schedule:
         """
         return self.schedule[weekday]
 
-    def get_starting_and_ending_time(self) -> tuple[time, time]:
+    def get_starting_and_ending_time(self) -> tuple[Optional[int], Optional[int]]:
         """
         Method that calculates the earliest event and the latest event times.
-        :return: A tuple containing the starting and ending times.
-        :rtype: tuple[time, time]
-
-        TODO: Refactor for better and clear code.
+        :return: A tuple containing the starting and ending times in minutes since midnight, (None, None) if the
+            schedule has no events.
+        :rtype: tuple[Optional[int], Optional[int]]
         """
 
-        starting_time: Optional[time] = None
-        ending_time: Optional[time] = None
+        starting_time: Optional[int] = None
+        ending_time: Optional[int] = None
 
         events: list[ScheduleEvent]
-        for _, events in self.schedule.items():
+        for events in self.schedule.values():
             event: ScheduleEvent
             for event in events:
-                event_delta: timedelta = timedelta(
-                    hours=event.starts_at.hour, minutes=event.starts_at.minute
-                )
-
-                if starting_time and ending_time:
-                    starting_delta: timedelta = timedelta(
-                        hours=starting_time.hour, minutes=starting_time.minute
-                    )
-                    ending_delta: timedelta = timedelta(
-                        hours=ending_time.hour, minutes=ending_time.minute
-                    )
-
-                if starting_time is None:
-                    starting_time = event.starts_at.time()
-
-                elif event_delta < starting_delta:
-                    starting_time = event.starts_at.time()
-
-                if ending_time is None:
-                    ending_time = calculate_final_time(
-                        event.starts_at.time(), event.duration.time()
-                    )
-
-                else:
-                    event_ending: time = calculate_final_time(
-                        event.starts_at.time(), event.duration.time()
-                    )
-                    event_ending_delta: timedelta = timedelta(
-                        hours=event_ending.hour, minutes=event_ending.minute
-                    )
-
-                    if event_ending_delta > ending_delta:
-                        ending_time = event_ending
+                if starting_time is None or event.start < starting_time:
+                    starting_time = event.start
+
+                if ending_time is None or event.end > ending_time:
+                    ending_time = event.end
 
         return starting_time, ending_time
 
@@ -114,21 +185,11 @@ class Schedule:
 
     def get_course_names(self) -> list[str]:
         """
-        Gets the name of every event on the schedule.
-        :return: List of the names.
+        Gets the name of every event on the schedule, without repetitions.
+        :return: List of the names (title cased).
         :rtype: list[str]
         """
-
-        course_names: list[str] = []
-
-        events: list[ScheduleEvent]
-        for _, events in self.schedule.items():
-            event: ScheduleEvent
-            for event in events:
-                if event.body.name not in course_names:
-                    course_names.append(event.body.name.title())
-
-        return course_names
+        return [name.title() for name in self._by_course]
 
     def get_shifts_from_courses(self) -> dict[str, list[str]]:
         """
@@ -138,17 +199,24 @@ class Schedule:
         """
         shifts: dict[str, list[str]] = {}
 
-        weekday: str
-        for weekday in self.schedule:
-            event: ScheduleEvent
-            for event in self.schedule[weekday]:
-                if event.body.name not in shifts:
-                    shifts[event.body.name] = []
-
-                shifts[event.body.name].append(event.body.shift)
+        name: str
+        shift: str
+        for name, shift in self._by_shift:
+            shifts.setdefault(name, []).append(shift)
 
         return shifts
 
+    @staticmethod
+    def _merge_entries(entries: Iterable[list[tuple[int, ScheduleEvent]]]) -> list[ScheduleEvent]:
+        """
+        Merges (union) several index lookups, keeping the order in which the events were added to the schedule.
+        :param entries: Lists of (sequence, event) pairs, each of them sorted.
+        :type entries: Iterable[list[tuple[int, ScheduleEvent]]]
+        :return: The events.
+        :rtype: list[ScheduleEvent]
+        """
+        return [event for _, event in heapq.merge(*entries, key=lambda entry: entry[0])]
+
     def filter(self, shifts: dict[str, list[str]]) -> "Schedule":
         """
         Method that filters the schedule by the given shifts 'map'.
@@ -158,103 +226,178 @@ class Schedule:
         :rtype: Schedule
         """
 
-        shifts = {
-            course.lower(): shifts[course] for course in shifts
-        }  # Normalize course names to lower case
         result: Schedule = Schedule(self.weekdays)
 
-        weekday: str
-        for weekday in self.schedule:  # Iterate over weekdays
-            event: ScheduleEvent
-            for event in self.schedule[weekday]:  # Iterate over events in the weekday
-                if (
-                    event.body.name in shifts
-                    and event.body.shift in shifts[event.body.name]
-                ):  # Match course/shift
-                    result.add_event(event)
+        # Without repeated pairs, a shift listed twice (or under course names differing in case) is only added once.
+        pairs: dict[tuple[str, str], None] = dict.fromkeys(
+            (course.lower(), shift) for course, course_shifts in shifts.items() for shift in course_shifts
+        )
+
+        event: ScheduleEvent
+        for event in self._merge_entries(self._by_shift[pair] for pair in pairs if pair in self._by_shift):
+            result.add_event(event)
 
         return result
 
+    def events_of_course(self, course_name: str) -> list[ScheduleEvent]:
+        """
+        Obtains every event of a course.
+        :param course_name: Name of the course (case insensitive).
+        :type course_name: str
+        :return: The events, in the order they were added to the schedule.
+        :rtype: list[ScheduleEvent]
+        """
+        return [event for _, event in self._by_course.get(course_name.lower(), [])]
+
+    def events_in_room(self, location: Location) -> list[ScheduleEvent]:
+        """
+        Obtains every event taking place at a location.
+        :param location: The location (campus, building and room).
+        :type location: Location
+        :return: The events, in the order they were added to the schedule.
+        :rtype: list[ScheduleEvent]
+        """
+        return [event for _, event in self._by_location.get(location, [])]
+
+    def events_between(self, start: int, end: int, weekday: Optional[str] = None) -> list[ScheduleEvent]:
+        """
+        Obtains the events starting in a time window.
+        :param start: Start of the window (inclusive), in minutes since midnight.
+        :type start: int
+        :param end: End of the window (exclusive), in minutes since midnight.
+        :type end: int
+        :param weekday: Only search on this weekday, every weekday by default.
+        :type weekday: str, optional
+        :return: The events, sorted by weekday and then by starting time.
+        :rtype: list[ScheduleEvent]
+        """
+
+        weekdays: Iterable[str] = self.schedule if weekday is None else (weekday,)
+        events: list[ScheduleEvent] = []
+
+        for weekday in weekdays:
+            start_times: list[int] = self._start_times.get(weekday, [])
+            entries: list[tuple[int, ScheduleEvent]] = self._by_start_time.get(weekday, [])
+
+            first: int = bisect.bisect_left(start_times, start)
+            last: int = bisect.bisect_left(start_times, end)
+
+            events.extend(event for _, event in entries[first:last])
+
+        return events
+
     def get_as_dict(self) -> dict:
         """
-        :return: A dictionary representation of the schedule.
+        :return: A dictionary representation of the schedule, the events of each weekday by its name.
         :rtype: dict
         """
 
-        as_dict: dict = dict.fromkeys(self.weekdays, list())
+        return {
+            weekday: [event.as_dict() for event in self.schedule[weekday]]
+            for weekday in self.weekdays
+        }
+
+    @classmethod
+    def merge(cls, schedules: list["Schedule"]) -> "Schedule":
+        """
+        Merges several schedules into a new one, with the weekdays of every schedule in weekday order. The events of
+        each weekday are already indexed by their starting time, so they are merged (k-way) instead of sorted again,
+        and end up sorted by their starting time, events starting at the same time keep the order of the schedules.
+        :param schedules: The schedules to merge.
+        :type schedules: list[Schedule]
+        :return: The merged schedule.
+        :rtype: Schedule
+        """
+
+        weekdays: list[str] = sorted(
+            dict.fromkeys(weekday for schedule in schedules for weekday in schedule.weekdays),
+            key=Weekday.from_label
+        )
+
+        result: Schedule = cls(weekdays)
 
         weekday: str
-        for weekday in self.schedule:
-            event: ScheduleEvent
-            for event in self.schedule[weekday]:
-                as_dict[weekday].append(asdict(event))
+        for weekday in weekdays:
+            events: list[ScheduleEvent] = [
+                event for schedule in schedules for _, event in schedule._by_start_time.get(weekday, ())
+            ]
+            # Each schedule is a sorted run, which Timsort merges with each other (a k-way merge, in C).
+            events.sort(key=attrgetter("start"))
 
-        return as_dict
+            result.schedule[weekday] = events
+            result._index_sorted_events(weekday, events)
 
-    @staticmethod
-    def _check_if_collides(
-        main_event: ScheduleEvent, test_event: ScheduleEvent
-    ) -> bool:
-        """
-        Static private method that checks whether two events overlap. Two events overlap if:
-            1. The events start at the same time.
-            2. One of the events starts in the middle of the other.
-        :param main_event: The main event to compare with.
-        :type main_event: ScheduleEvent
-        :param test_event: The test event to compare against the main event.
-        :type test_event: ScheduleEvent
-        :return: True if they overlap, False otherwise.
-        :rtype: bool
-        """
-
-        if main_event.starts_at.time() == test_event.starts_at.time():
-            return True
-
-        main_event_delta: timedelta = timedelta(
-            hours=main_event.starts_at.hour, minutes=main_event.starts_at.minute
-        )
-        duration_delta: timedelta = timedelta(
-            hours=main_event.duration.hour, minutes=main_event.duration.minute
-        )
+        return result
 
-        ending_timedelta: timedelta = main_event_delta + duration_delta
-        main_event_ends: time = time(
-            hour=ending_timedelta.seconds // 3600,
-            minute=(ending_timedelta.seconds // 60) % 60,
-        )
+    def get_fingerprint(self) -> str:
+        """
+        Obtains a digest of the content of the schedule (its weekdays and their events, in order). Schedules with the
+        same content have the same fingerprint, even if they are different objects, so it can be used to memoize
+        values derived from the schedule. It is computed once, until an event is added.
+        :return: The fingerprint, as an hexadecimal string.
+        :rtype: str
+        """
 
-        return (
-            main_event.starts_at.time() < test_event.starts_at.time() < main_event_ends
-        )
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+            bodies: dict[ScheduleBody, str] = {}  # Bodies are shared by the events of a shift.
+
+            weekday: str
+            for weekday in self.weekdays:
+                digest.update(f"\x1e{weekday}".encode("utf8"))
 
-    def get_collisions(self, weekday: str) -> list[time | tuple[time, time]]:
+                event: ScheduleEvent
+                for event in self.schedule[weekday]:
+                    body: Optional[str] = bodies.get(event.body)
+
+                    if body is None:
+                        location: Location = event.body.location
+                        body = bodies[event.body] = "\x1f".join(
+                            (event.body.name, event.body.shift, location.campus, location.building, location.room)
+                        )
+
+                    digest.update(f"\x1d{body}\x1f{event.start}\x1f{event.end}\x1f{event.day}".encode("utf8"))
+
+            self._fingerprint = digest.hexdigest()
+
+        return self._fingerprint
+
+    def set_fingerprint(self, fingerprint: str) -> None:
+        """
+        Sets the fingerprint of a schedule whose content is fully determined by something else that already has one,
+        such as the schedules it was merged from, instead of computing it from its events.
+        :param fingerprint: The fingerprint.
+        :type fingerprint: str
         """
-        For a given weekday, this method computes at which times event overlapping occurs.
+        self._fingerprint = fingerprint
 
-        :param weekday: Weekday to search on.
+    def get_interval_index(self, weekday: str) -> IntervalIndex:
+        """
+        Obtains the interval index of a weekday, building it if needed.
+        :param weekday: Weekday of the index.
         :type weekday: str
-        :return: List containing either the time or a tuple of times (that represent midway overlaps).
-        :rtype: list[time | tuple[time, ...]]
+        :return: The interval index, its lanes follow the order of the weekday events.
+        :rtype: IntervalIndex
         """
 
-        previous_event: Optional[ScheduleEvent] = None
-        collisions: list[time | tuple[time, ...]] = []
+        index: Optional[IntervalIndex] = self._interval_indexes.get(weekday)
 
-        event: ScheduleEvent
-        for event in self.schedule[weekday]:
-            if previous_event and self._check_if_collides(previous_event, event):
-                # In the case of the overlapping events starting time doesn't match, we aggregate them in a tuple.
-                if previous_event.starts_at.time() != event.starts_at.time():
-                    collisions.append(
-                        (previous_event.starts_at.time(), event.starts_at.time())
-                    )
+        if index is None:
+            index = self._interval_indexes[weekday] = IntervalIndex(self.schedule[weekday])
 
-                else:  # Else we just append the hour.
-                    collisions.append(event.starts_at.time())
+        return index
 
-            previous_event = event
+    def get_collisions(self, weekday: str) -> list[Collision]:
+        """
+        For a given weekday, this method computes the groups of overlapping events. Two events overlap if one of
+        them starts before the other ends, the groups include events that overlap indirectly (A with B and B with C).
 
-        return collisions
+        :param weekday: Weekday to search on.
+        :type weekday: str
+        :return: List of the overlapping groups, sorted by their starting time.
+        :rtype: list[Collision]
+        """
+        return self.get_interval_index(weekday).collisions
 
 
 class ScheduleGroup:
@@ -0,0 +1,566 @@
+from array import array
+from typing import Generic, Hashable, Iterable, Iterator, Optional, TypeVar
+
+from src.lib.scraper.event import Location, ScheduleBody, ScheduleEvent, Weekday
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+
+try:  # NumPy is optional, when present the queries run vectorized over the columns.
+    import numpy as np
+except ImportError:
+    np = None
+
+T = TypeVar("T", bound=Hashable)
+
+
+class StringDictionary(Generic[T]):
+    """
+    This class maps values to dense integer ids (and back), it is used to dictionary-encode the columns of a
+    ScheduleTable.
+    """
+
+    __slots__ = ("_values", "_ids")
+
+    def __init__(self) -> None:
+        self._values: list[T] = []
+        self._ids: dict[T, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, value: T) -> bool:
+        return value in self._ids
+
+    def encode(self, value: T) -> int:
+        """
+        Obtains the id of a value, registering it if it's not yet known.
+        :param value: Value to encode.
+        :type value: T
+        :return: The id of the value.
+        :rtype: int
+        """
+        value_id: Optional[int] = self._ids.get(value)
+
+        if value_id is None:
+            value_id = self._ids[value] = len(self._values)
+            self._values.append(value)
+
+        return value_id
+
+    def lookup(self, value: T) -> Optional[int]:
+        """
+        Obtains the id of a value without registering it.
+        :param value: Value to look for.
+        :type value: T
+        :return: The id of the value, None if the value is unknown.
+        :rtype: Optional[int]
+        """
+        return self._ids.get(value)
+
+    def decode(self, value_id: int) -> T:
+        """
+        :param value_id: Id of the value.
+        :type value_id: int
+        :return: The value with the given id.
+        :rtype: T
+        """
+        return self._values[value_id]
+
+
+class ScheduleTable:
+    """
+    This class represents a set of events in a columnar layout, each event is a row and each attribute is stored in
+    a typed array (weekday, start, end, course, shift, location, year and group). Names, shifts, locations and groups
+    are dictionary-encoded, so an event takes a few bytes instead of a graph of Python objects, which makes it
+    suitable to hold many schedules at once (every course, year and semester).
+
+    The group column identifies the ScheduleGroup (course name) the event came from.
+
+    Queries return row indexes or new tables, and run vectorized when NumPy is installed.
+    """
+
+    __slots__ = (
+        "weekday",
+        "start",
+        "end",
+        "course",
+        "shift",
+        "location",
+        "year",
+        "group",
+        "courses",
+        "shifts",
+        "locations",
+        "groups",
+        "weekdays",
+    )
+
+    def __init__(self) -> None:
+        """
+        Class constructor, creates an empty table.
+        """
+
+        # Columns.
+        self.weekday: array = array("B")
+        self.start: array = array("H")
+        self.end: array = array("H")
+        self.course: array = array("I")
+        self.shift: array = array("I")
+        self.location: array = array("I")
+        self.year: array = array("B")
+        self.group: array = array("I")
+
+        # Dictionaries for the encoded columns.
+        self.courses: StringDictionary[str] = StringDictionary()
+        self.shifts: StringDictionary[str] = StringDictionary()
+        self.locations: StringDictionary[Location] = StringDictionary()
+        self.groups: StringDictionary[str] = StringDictionary()
+
+        self.weekdays: dict[tuple[int, int], list[str]] = {}
+        """
+        The weekdays of the original schedule of each (group, year), used to rebuild Schedule objects.
+        """
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __iter__(self) -> Iterator[ScheduleEvent]:
+        return (self.event(row) for row in range(len(self)))
+
+    def append(self, event: ScheduleEvent, year: int = 0, group: str = "") -> None:
+        """
+        Add an event to the table.
+        :param event: Event to add.
+        :type event: ScheduleEvent
+        :param year: Year of the schedule the event belongs to.
+        :type year: int
+        :param group: Name of the schedule group the event belongs to.
+        :type group: str
+        """
+        self.weekday.append(event.day)
+        self.start.append(event.start)
+        self.end.append(event.end)
+        self.course.append(self.courses.encode(event.body.name))
+        self.shift.append(self.shifts.encode(event.body.shift))
+        self.location.append(self.locations.encode(event.body.location))
+        self.year.append(year)
+        self.group.append(self.groups.encode(group))
+
+    def extend(self, events: Iterable[ScheduleEvent], year: int = 0, group: str = "") -> None:
+        """
+        Add several events to the table.
+        :param events: Events to add.
+        :type events: Iterable[ScheduleEvent]
+        :param year: Year of the schedule the events belongs to.
+        :type year: int
+        :param group: Name of the schedule group the events belongs to.
+        :type group: str
+        """
+        event: ScheduleEvent
+        for event in events:
+            self.append(event, year, group)
+
+    def event(self, row: int) -> ScheduleEvent:
+        """
+        Rebuilds the event stored at a given row.
+        :param row: Index of the row.
+        :type row: int
+        :return: The event.
+        :rtype: ScheduleEvent
+        """
+        return ScheduleEvent(
+            body=ScheduleBody(
+                name=self.courses.decode(self.course[row]),
+                location=self.locations.decode(self.location[row]),
+                shift=self.shifts.decode(self.shift[row]),
+            ),
+            start=self.start[row],
+            end=self.end[row],
+            day=Weekday(self.weekday[row]),
+        )
+
+    @classmethod
+    def from_schedule(cls, schedule: Schedule, year: int = 0) -> "ScheduleTable":
+        """
+        Builds a table from a schedule.
+        :param schedule: Schedule to convert.
+        :type schedule: Schedule
+        :param year: Year to assign to the events.
+        :type year: int
+        :return: The table.
+        :rtype: ScheduleTable
+        """
+        table: ScheduleTable = cls()
+        table.add_schedule(schedule, year)
+        return table
+
+    @classmethod
+    def from_schedule_groups(cls, *groups: ScheduleGroup) -> "ScheduleTable":
+        """
+        Builds a table from every year of the given schedule groups.
+        :param groups: Schedule groups to convert.
+        :type groups: ScheduleGroup
+        :return: The table.
+        :rtype: ScheduleTable
+        """
+        table: ScheduleTable = cls()
+
+        group: ScheduleGroup
+        for group in groups:
+            table.add_schedule_group(group)
+
+        return table
+
+    def add_schedule(self, schedule: Schedule, year: int = 0, group: str = "") -> None:
+        """
+        Add every event of a schedule to the table.
+        :param schedule: Schedule to add.
+        :type schedule: Schedule
+        :param year: Year to assign to the events.
+        :type year: int
+        :param group: Name of the schedule group to assign to the events.
+        :type group: str
+        """
+        self.weekdays.setdefault((self.groups.encode(group), year), list(schedule.weekdays))
+        self.extend(schedule.get_events(), year, group)
+
+    def add_schedule_group(self, group: ScheduleGroup) -> None:
+        """
+        Add every year of a schedule group to the table.
+        :param group: Schedule group to add.
+        :type group: ScheduleGroup
+        """
+        year: int
+        schedule: Schedule
+        for year, schedule in group.years.items():
+            self.add_schedule(schedule, year, group.course_name)
+
+    def to_schedule(self, rows: Optional[Iterable[int]] = None, weekdays: Optional[list[str]] = None) -> Schedule:
+        """
+        Converts the table (or some of its rows) into a Schedule.
+        :param rows: Rows to convert, every row by default.
+        :type rows: Iterable[int], optional
+        :param weekdays: Weekdays of the resulting schedule, by default the ones of the converted events.
+        :type weekdays: list[str], optional
+        :return: The schedule.
+        :rtype: Schedule
+        """
+        rows: Iterable[int] = range(len(self)) if rows is None else rows
+        events: list[ScheduleEvent] = [self.event(row) for row in rows]
+
+        if weekdays is None:
+            weekdays = [day.label for day in sorted({event.day for event in events})]
+
+        schedule: Schedule = Schedule(weekdays)
+
+        event: ScheduleEvent
+        for event in events:
+            schedule.add_event(event)
+
+        return schedule
+
+    def to_schedule_group(self, course_name: str) -> ScheduleGroup:
+        """
+        Converts the rows of a schedule group back into a ScheduleGroup, with a schedule per year.
+        :param course_name: Name of the course of the group.
+        :type course_name: str
+        :return: The schedule group.
+        :rtype: ScheduleGroup
+        """
+        result: ScheduleGroup = ScheduleGroup(course_name=course_name)
+        group_id: Optional[int] = self.groups.lookup(course_name)
+
+        if group_id is None:
+            return result
+
+        years: dict[int, list[int]] = {}
+
+        row: int
+        for row in self.select(group=course_name):
+            years.setdefault(self.year[row], []).append(row)
+
+        year: int
+        rows: list[int]
+        for year, rows in years.items():
+            result.add_event_to_year(year, self.to_schedule(rows, self.weekdays.get((group_id, year))))
+
+        return result
+
+    def take(self, rows: Iterable[int]) -> "ScheduleTable":
+        """
+        Builds a new table with the given rows, the dictionaries are shared with this table.
+        :param rows: Rows to take.
+        :type rows: Iterable[int]
+        :return: The new table.
+        :rtype: ScheduleTable
+        """
+        table: ScheduleTable = ScheduleTable()
+        table.courses, table.shifts, table.locations = self.courses, self.shifts, self.locations
+        table.groups = self.groups
+        table.weekdays = self.weekdays
+
+        rows = list(rows)
+
+        column: str
+        for column in ("weekday", "start", "end", "course", "shift", "location", "year", "group"):
+            source: array = getattr(self, column)
+            getattr(table, column).extend(source[row] for row in rows)
+
+        return table
+
+    def select(
+        self,
+        weekday: Optional[Weekday] = None,
+        year: Optional[int] = None,
+        group: Optional[str] = None,
+        courses: Optional[Iterable[str]] = None,
+        shifts: Optional[dict[str, list[str]]] = None,
+        location: Optional[Location] = None,
+        starts_after: Optional[int] = None,
+        ends_before: Optional[int] = None,
+    ) -> list[int]:
+        """
+        Obtains the rows that match every given condition.
+        :param weekday: Only events on this weekday.
+        :type weekday: Weekday, optional
+        :param year: Only events of this year.
+        :type year: int, optional
+        :param group: Only events of this schedule group.
+        :type group: str, optional
+        :param courses: Only events of these courses.
+        :type courses: Iterable[str], optional
+        :param shifts: Only the given shifts of each course, same format used by Schedule.filter.
+        :type shifts: dict[str, list[str]], optional
+        :param location: Only events at this location.
+        :type location: Location, optional
+        :param starts_after: Only events starting at or after this time (minutes since midnight).
+        :type starts_after: int, optional
+        :param ends_before: Only events ending at or before this time (minutes since midnight).
+        :type ends_before: int, optional
+        :return: The matching rows, in ascending order.
+        :rtype: list[int]
+        """
+
+        # Conditions over the encoded columns, as (column, accepted values).
+        conditions: list[tuple[array, set[int]]] = []
+
+        if weekday is not None:
+            conditions.append((self.weekday, {int(weekday)}))
+
+        if year is not None:
+            conditions.append((self.year, {year}))
+
+        if group is not None:
+            conditions.append((self.group, self._lookup_all(self.groups, (group,))))
+
+        if courses is not None:
+            conditions.append((self.course, self._lookup_all(self.courses, (c.lower() for c in courses))))
+
+        if location is not None:
+            conditions.append((self.location, self._lookup_all(self.locations, (location,))))
+
+        wanted_pairs: Optional[set[int]] = None
+        if shifts is not None:
+            wanted_pairs = {
+                self._pair(course_id, shift_id)
+                for course, course_shifts in shifts.items()
+                if (course_id := self.courses.lookup(course.lower())) is not None
+                for shift_id in self._lookup_all(self.shifts, course_shifts)
+            }
+
+        if np is not None:
+            return self._select_vectorized(conditions, wanted_pairs, starts_after, ends_before)
+
+        rows: Iterable[int] = range(len(self))
+
+        column: array
+        accepted: set[int]
+        for column, accepted in conditions:
+            rows = [row for row in rows if column[row] in accepted]
+
+        if wanted_pairs is not None:
+            rows = [row for row in rows if self._pair(self.course[row], self.shift[row]) in wanted_pairs]
+
+        if starts_after is not None:
+            rows = [row for row in rows if self.start[row] >= starts_after]
+
+        if ends_before is not None:
+            rows = [row for row in rows if self.end[row] <= ends_before]
+
+        return list(rows)
+
+    def filter(self, **conditions) -> "ScheduleTable":
+        """
+        Builds a new table with the rows that match the given conditions, see select for the accepted conditions.
+        :return: The filtered table.
+        :rtype: ScheduleTable
+        """
+        return self.take(self.select(**conditions))
+
+    def group_by_course(self) -> dict[str, list[int]]:
+        """
+        Groups the rows by the course (event name).
+        :return: Dictionary with the course name as key and its rows as value.
+        :rtype: dict[str, list[int]]
+        """
+        groups: dict[int, list[int]] = (
+            self._group_rows_vectorized(self.course) if np is not None else self._group_rows(self.course)
+        )
+
+        return {self.courses.decode(course_id): rows for course_id, rows in groups.items()}
+
+    def conflicts(self) -> list[tuple[int, int]]:
+        """
+        Computes every pair of rows whose events overlap, that is, same group, year and weekday and intersecting times.
+        :return: List of the overlapping row pairs (earliest row first).
+        :rtype: list[tuple[int, int]]
+        """
+
+        if np is not None:
+            return self._conflicts_vectorized()
+
+        order: list[int] = sorted(
+            range(len(self)), key=lambda r: (self.group[r], self.year[r], self.weekday[r], self.start[r])
+        )
+
+        # Sweep line over the sorted rows, keeping the rows still active on the current day.
+        pairs: list[tuple[int, int]] = []
+        active: list[int] = []
+        current_day: Optional[tuple[int, int, int]] = None
+
+        row: int
+        for row in order:
+            day: tuple[int, int, int] = (self.group[row], self.year[row], self.weekday[row])
+
+            if day != current_day:
+                active, current_day = [], day
+
+            start: int = self.start[row]
+            active = [other for other in active if self.end[other] > start]
+
+            other: int
+            for other in active:
+                pairs.append((min(other, row), max(other, row)))
+
+            active.append(row)
+
+        return pairs
+
+    @staticmethod
+    def _pair(course_id: int, shift_id: int) -> int:
+        """
+        Packs a (course, shift) pair of ids into a single integer.
+        """
+        return (course_id << 32) | shift_id
+
+    @staticmethod
+    def _lookup_all(dictionary: StringDictionary, values: Iterable) -> set[int]:
+        """
+        Obtains the ids of the known values, unknown values are ignored.
+        """
+        return {value_id for value in values if (value_id := dictionary.lookup(value)) is not None}
+
+    @staticmethod
+    def _group_rows(column: array) -> dict[int, list[int]]:
+        """
+        Groups the row indexes by the value of a column, keeping the order of first appearance.
+        """
+        groups: dict[int, list[int]] = {}
+
+        row: int
+        value: int
+        for row, value in enumerate(column):
+            groups.setdefault(value, []).append(row)
+
+        return groups
+
+    @classmethod
+    def _group_rows_vectorized(cls, column: array) -> dict[int, list[int]]:
+        """
+        NumPy implementation of _group_rows, a stable sort of the rows by their value splits them into the groups,
+        each one starting at the first occurrence of its value.
+        """
+        values = cls._view(column)
+        order = np.argsort(values, kind="stable")
+        unique, starts = np.unique(values[order], return_index=True)
+        groups: list = np.split(order, starts[1:]) if len(order) else []
+
+        # The first row of each group is its lowest one, the groups are given in order of first appearance.
+        return {int(unique[i]): groups[i].tolist() for i in np.argsort(order[starts], kind="stable").tolist()}
+
+    def _conflicts_vectorized(self) -> list[tuple[int, int]]:
+        """
+        NumPy implementation of conflicts. The rows are sorted by (group, year, weekday, start) and the times of each
+        day are shifted past the ones of the previous day, so the cumulative maximum of the ending times is the end of
+        the rows still active on that day. A row starting at or after it begins a new cluster of overlapping rows, the
+        pairs are the rows of each cluster before a row that end after it starts. The pairs come out in the same
+        order as the sweep line.
+        """
+        if len(self) < 2:
+            return []
+
+        order = np.lexsort((
+            self._view(self.start), self._view(self.weekday), self._view(self.year), self._view(self.group)
+        ))
+
+        keys = (
+            (self._view(self.group).astype(np.int64) << 16)
+            | (self._view(self.year).astype(np.int64) << 8)
+            | self._view(self.weekday)
+        )[order]
+        day = np.concatenate(([0], np.cumsum(keys[1:] != keys[:-1])))
+
+        span: int = int(self._view(self.end).max()) + 1  # Times of a day never reach the ones of the next one.
+        start = self._view(self.start)[order] + day * span
+        end = self._view(self.end)[order] + day * span
+
+        # Position (sorted) where the cluster of each row begins.
+        active_end = np.maximum.accumulate(end)
+        new_cluster = np.concatenate(([True], start[1:] >= active_end[:-1]))
+        cluster_start = np.maximum.accumulate(np.where(new_cluster, np.arange(len(self)), 0))
+
+        # Every (earlier, later) candidate pair of each cluster, then only those that overlap.
+        counts = np.arange(len(self)) - cluster_start
+        later = np.repeat(np.arange(len(self)), counts)
+        earlier = np.repeat(cluster_start - np.cumsum(counts) + counts, counts) + np.arange(int(counts.sum()))
+        overlapping = end[earlier] > start[later]
+
+        first = order[earlier[overlapping]]
+        second = order[later[overlapping]]
+
+        return list(zip(np.minimum(first, second).tolist(), np.maximum(first, second).tolist()))
+
+    def _select_vectorized(
+        self,
+        conditions: list[tuple[array, set[int]]],
+        wanted_pairs: Optional[set[int]],
+        starts_after: Optional[int],
+        ends_before: Optional[int],
+    ) -> list[int]:
+        """
+        NumPy implementation of select, the columns are viewed (without copying) as NumPy arrays.
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        column: array
+        accepted: set[int]
+        for column, accepted in conditions:
+            mask &= np.isin(self._view(column), np.fromiter(accepted, dtype=np.int64, count=len(accepted)))
+
+        if wanted_pairs is not None:
+            pairs = (self._view(self.course).astype(np.int64) << 32) | self._view(self.shift)
+            mask &= np.isin(pairs, np.fromiter(wanted_pairs, dtype=np.int64, count=len(wanted_pairs)))
+
+        if starts_after is not None:
+            mask &= self._view(self.start) >= starts_after
+
+        if ends_before is not None:
+            mask &= self._view(self.end) <= ends_before
+
+        return np.flatnonzero(mask).tolist()
+
+    @staticmethod
+    def _view(column: array):
+        """
+        :return: A NumPy view over the memory of an array column.
+        """
+        return np.frombuffer(column, dtype=np.dtype(column.typecode)) if len(column) else np.empty(0, dtype=np.int64)
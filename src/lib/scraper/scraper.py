@@ -1,16 +1,43 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
 from datetime import date
-from typing import Optional
-
-from selenium import webdriver
-from selenium.common import NoSuchElementException
-from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.remote.webelement import WebElement
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
 
 import src.lib.scraper.elements as elements
 from src.lib.exceptions import CourseNameDoesNotExistException, YearOutOfBoundsException
+from src.lib.metrics.registry import REGISTRY, Histogram
 from src.lib.scraper.parser import ScheduleParser
 from src.lib.scraper.schedule import Schedule, ScheduleGroup
+from src.lib.tracing.tracer import TRACER
+
+if TYPE_CHECKING:  # Selenium is only imported once a browser is started, it takes a while.
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.firefox.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+PORTAL_URL: str = "https://alunos.uminho.pt/pt/estudantes/paginas/infouteishorarios.aspx"  # The schedules page.
+
+SCRAPE_YEAR_SECONDS: Histogram = REGISTRY.histogram(
+    "shifter_scrape_year_seconds", "Time spent scraping (and parsing) the schedule of a year.", ("year",)
+)
+SCRAPE_STEP_SECONDS: Histogram = REGISTRY.histogram(
+    "shifter_scrape_step_seconds", "Time spent on each step of the browser while scraping.", ("step",)
+)
+
+
+def uses_driver(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorator of the scraper methods that use the browser, they run inside a browsing session of the scraper.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "ScheduleScraper", *args: Any, **kwargs: Any) -> Any:
+        with self.session():
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class ScheduleScraper:
@@ -18,38 +45,174 @@ class ScheduleScraper:
     This class is responsible for scraping the web for the desired schedules that are specified by a name,
     a date string and the school years to get.
 
+    The browser is only started once it is first needed (or warmed up), so creating a scraper is instantaneous, and
+    it can be shut down after a while without being used, being started again on the next scrape.
+
     :param is_headless: This boolean is used for debugging, and runs selenium in a non-headless mode.
     :type is_headless: bool
+    :param idle_timeout: Seconds without scraping after which the browser is shut down, None to keep it running.
+    :type idle_timeout: Optional[float]
+    :param url: Url of the schedules page, another server mimicking it (such as a local stand-in) can be given.
+    :type url: str
     """
 
-    def __init__(self, is_headless: bool = True) -> None:
-        self.__url: str = (
-            "https://alunos.uminho.pt/pt/estudantes/paginas/infouteishorarios.aspx"
-        )
+    def __init__(self, is_headless: bool = True, idle_timeout: Optional[float] = None, url: str = PORTAL_URL) -> None:
+        self.__url: str = url
         self.__fetched: bool = False
-        self.options: FirefoxOptions = FirefoxOptions()
+        self.is_headless: bool = is_headless
+        self.idle_timeout: Optional[float] = idle_timeout
 
-        if is_headless:
-            self.options.add_argument("--headless")
+        self.__driver: Optional["WebDriver"] = None
+        self.__lock: threading.RLock = threading.RLock()  # A browser can only be used by a thread at a time.
+        self.__sessions: int = 0  # Nested sessions of the thread holding the lock.
+        self.__last_used: float = time.monotonic()
+        self.__idle_timer: Optional[threading.Timer] = None
 
-        self.driver = webdriver.Firefox(options=self.options)  # webdriver set-up
+    @property
+    def driver(self) -> "WebDriver":
+        """
+        :return: The browser, started if it isn't running.
+        :rtype: WebDriver
+        """
+        with self.__lock:
+            if self.__driver is None:
+                self.__start_driver()
+
+            return self.__driver
+
+    @property
+    def is_running(self) -> bool:
+        """
+        :return: Whether the browser is running, without starting it.
+        :rtype: bool
+        """
+        return self.__driver is not None
+
+    def __start_driver(self) -> None:
+        from selenium import webdriver
+        from selenium.webdriver.firefox.options import Options as FirefoxOptions
 
+        options: "FirefoxOptions" = FirefoxOptions()
+
+        if self.is_headless:
+            options.add_argument("--headless")
+
+        self.__driver = webdriver.Firefox(options=options)  # webdriver set-up
+        self.__fetched = False
+
+    def __stop_driver(self) -> None:
+        from selenium.common import WebDriverException
+
+        driver: Optional["WebDriver"] = self.__driver
+        self.__driver = None
+        self.__fetched = False
+
+        if driver is not None:
+            try:
+                driver.quit()
+
+            except WebDriverException:  # The browser is already gone.
+                pass
+
+    def warm_up(self) -> None:
+        """
+        Starts the browser ahead of the first scrape, if it isn't running.
+        """
+        with self.session():
+            pass
+
+    def is_healthy(self) -> bool:
+        """
+        Checks whether the browser is running and responding. A browser in use by another thread is taken as healthy,
+        so the check never waits for a scrape.
+        :return: True if the browser responds, False if it isn't running or doesn't respond.
+        :rtype: bool
+        """
+        from selenium.common import WebDriverException
+
+        if not self.__lock.acquire(blocking=False):
+            return self.__driver is not None
+
+        try:
+            if self.__driver is None:
+                return False
+
+            self.__driver.execute_script("return 1;")
+            return True
+
+        except WebDriverException:
+            return False
+
+        finally:
+            self.__lock.release()
+
+    @contextmanager
+    def session(self) -> Iterator["WebDriver"]:
+        """
+        Context manager that holds the browser for the current thread, starting it if it isn't running and restarting
+        it if it stopped responding. Once the outermost session ends the idle timeout starts counting.
+        :return: The browser.
+        :rtype: Iterator[WebDriver]
+        """
+        with self.__lock:
+            self.__sessions += 1
+
+            try:
+                if self.__sessions == 1:
+                    self.__cancel_idle_timer()
+
+                    if self.__driver is not None and not self.is_healthy():  # Restarting a crashed browser.
+                        self.__stop_driver()
+
+                yield self.driver
+
+            finally:
+                self.__sessions -= 1
+                self.__last_used = time.monotonic()
+
+                if self.__sessions == 0:
+                    self.__start_idle_timer()
+
+    def __start_idle_timer(self) -> None:
+        if self.idle_timeout is not None and self.__driver is not None:
+            self.__idle_timer = threading.Timer(self.idle_timeout, self.__stop_if_idle)
+            self.__idle_timer.daemon = True
+            self.__idle_timer.start()
+
+    def __cancel_idle_timer(self) -> None:
+        if self.__idle_timer is not None:
+            self.__idle_timer.cancel()
+            self.__idle_timer = None
+
+    def __stop_if_idle(self) -> None:
+        with self.__lock:  # Waits for any running session.
+            if (
+                self.__sessions == 0
+                and self.idle_timeout is not None
+                and time.monotonic() - self.__last_used >= self.idle_timeout
+            ):
+                self.__idle_timer = None
+                self.__stop_driver()
+
+    @uses_driver
     def get_courses(self) -> list[str]:
         """
         Return a list of every available course on the schedules page.
         :return: list of course names
         :rtype: list[str]
         """
+        from selenium.webdriver.common.by import By
 
         if not self.__fetched:
             self.driver.get(self.__url)
             self.__fetched = True
 
-        courses: list[WebElement] = self.driver.find_elements(
+        courses: list["WebElement"] = self.driver.find_elements(
             by=By.CLASS_NAME, value="rcbItem"
         )
         return list(map(lambda item: item.get_property("innerText"), courses))
 
+    @uses_driver
     def get_single(
         self, year: int, date_str: str, formatted: bool, parser: ScheduleParser
     ) -> Optional[str | Schedule]:
@@ -68,30 +231,43 @@ class ScheduleScraper:
             object if formatted is true.
         :rtype: Optional[str | Schedule]
         """
+        with TRACER.span("scraper.get_single", year=year), REGISTRY.time_block(SCRAPE_YEAR_SECONDS, year=year):
+            return self.__get_single(year, date_str, formatted, parser)
+
+    def __get_single(
+        self, year: int, date_str: str, formatted: bool, parser: ScheduleParser
+    ) -> Optional[str | Schedule]:
+        from selenium.common import NoSuchElementException
+        from selenium.webdriver.common.by import By
 
         try:
             # Click on the button to get the page of schedule.
-            search = self.driver.find_element(By.ID, elements.search_button)
-            search.click()
+            with REGISTRY.time_block(SCRAPE_STEP_SECONDS, step="search"):
+                search = self.driver.find_element(By.ID, elements.search_button)
+                search.click()
 
             # Click on the year select button.
-            year_input = self.driver.find_element(By.ID, elements.year_to_id[year])
-            year_input.click()
+            with REGISTRY.time_block(SCRAPE_STEP_SECONDS, step="year"):
+                year_input = self.driver.find_element(By.ID, elements.year_to_id[year])
+                year_input.click()
 
             # Select the date when the schedule came out.
-            date_input = self.driver.find_element(
-                By.ID, elements.date_bar
-            )  # Date format : dd-mm-YYYY
-            date_input.clear()
-            date_input.send_keys(date_str)
+            with REGISTRY.time_block(SCRAPE_STEP_SECONDS, step="date"):
+                date_input = self.driver.find_element(
+                    By.ID, elements.date_bar
+                )  # Date format : dd-mm-YYYY
+                date_input.clear()
+                date_input.send_keys(date_str)
 
             # Expand schedule in order to get the full html document, it also acts like a search button.
-            expand = self.driver.find_element(By.ID, elements.expand_check)
+            with REGISTRY.time_block(SCRAPE_STEP_SECONDS, step="expand"):
+                expand = self.driver.find_element(By.ID, elements.expand_check)
 
-            if not expand.get_property("checked"):
-                expand.click()
+                if not expand.get_property("checked"):
+                    expand.click()
 
-            page_content: str = self.driver.page_source
+            with REGISTRY.time_block(SCRAPE_STEP_SECONDS, step="page_source"):
+                page_content: str = self.driver.page_source
 
         except (
             NoSuchElementException
@@ -99,8 +275,9 @@ class ScheduleScraper:
             raise YearOutOfBoundsException(f"The course doesn't have an year {year}.")
 
         finally:  # Go to the previous page in case we want to scrape any more years.
-            self.driver.back()
-            self.driver.back()
+            with REGISTRY.time_block(SCRAPE_STEP_SECONDS, step="back"):
+                self.driver.back()
+                self.driver.back()
 
         if formatted:  # If we want the result as a Schedule object.
             parsed_content: Schedule
@@ -115,6 +292,8 @@ class ScheduleScraper:
 
         return page_content
 
+    @TRACER.traced("scraper.get")
+    @uses_driver
     def get(
         self,
         course_name: str,
@@ -141,9 +320,11 @@ class ScheduleScraper:
             doesn't exist.
         :rtype: Optional[ScheduleGroup]
         """
+        from selenium.webdriver.common.by import By
 
-        self.driver.get(self.__url)  # Getting the page.
-        self.__fetched = True
+        with REGISTRY.time_block(SCRAPE_STEP_SECONDS, step="load"):
+            self.driver.get(self.__url)  # Getting the page.
+            self.__fetched = True
 
         if (
             course_name not in self.get_courses()
@@ -190,4 +371,9 @@ class ScheduleScraper:
         return result
 
     def close(self) -> None:
-        self.driver.quit()
+        """
+        Shuts the browser down, if it is running. It is started again if the scraper is used afterwards.
+        """
+        with self.__lock:
+            self.__cancel_idle_timer()
+            self.__stop_driver()
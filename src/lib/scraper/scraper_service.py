@@ -0,0 +1,360 @@
+import asyncio
+import base64
+import json
+import os
+import struct
+from typing import Any, Callable, Optional
+
+from src.lib.cache.ttl_cache import Cache
+from src.lib.exceptions import (
+    CourseNameDoesNotExistException, ScraperServiceException, YearOutOfBoundsException
+)
+from src.lib.jobs.job_queue import Job, JobQueue, JobStatus
+from src.lib.scraper.parser import ScheduleParser
+from src.lib.scraper.schedule import ScheduleGroup
+from src.lib.scraper.scraper import ScheduleScraper
+
+HEADER: struct.Struct = struct.Struct("!I")  # Length of the message that follows.
+MAX_MESSAGE_SIZE: int = 64 * 1024 * 1024
+ENCODED_SUFFIX: str = ".json"  # Suffix of the keys of the encoded schedules, the only values the servers save.
+
+# Errors raised again on the client, by name, any other error is raised as a ScraperServiceException.
+KNOWN_ERRORS: dict[str, type[Exception]] = {
+    error.__name__: error for error in (YearOutOfBoundsException, CourseNameDoesNotExistException)
+}
+
+
+async def read_message(reader: asyncio.StreamReader) -> Any:
+    """
+    Reads a message, a json document preceded by its length. Messages are never unpickled, a peer can only send data.
+    :raises asyncio.IncompleteReadError: If the connection is closed before the whole message is read.
+    :raises ValueError: If the message is too large or isn't valid json.
+    """
+    size: int = HEADER.unpack(await reader.readexactly(HEADER.size))[0]
+
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message of {size} bytes is too large.")
+
+    return json.loads(await reader.readexactly(size))
+
+
+async def write_message(writer: asyncio.StreamWriter, message: Any) -> None:
+    data: bytes = json.dumps(message, separators=(",", ":")).encode()
+    writer.write(HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+def job_state(job: Job) -> dict[str, Any]:
+    """
+    Obtains the state of a scrape job of the service, as sent to the servers.
+    :param job: The job, its payload ends with the request it was submitted with.
+    :type job: Job
+    :return: The id, key, status, request, whether the schedule was found and the error, by name, of the job.
+    :rtype: dict[str, Any]
+    """
+    return {
+        "id": job.id,
+        "key": job.key,
+        "status": job.status.value,
+        "request": job.payload[-1],
+        "found": job.result,
+        "error": type(job.error).__name__ if job.error is not None else None,
+        "message": str(job.error) if job.error is not None else None,
+    }
+
+
+def from_job_state(state: dict[str, Any]) -> Job:
+    """
+    Obtains a scrape job of the service from its state, its payload is the request it was submitted with and its
+    result whether the schedule was found. The errors are raised again as on ScraperClient.request.
+    :param state: The state of the job.
+    :type state: dict[str, Any]
+    :return: The job, finished if the job of the service is.
+    :rtype: Job
+    """
+    job: Job = Job(
+        key=state["key"], payload=state["request"], id=state["id"], status=JobStatus(state["status"]), context=None
+    )
+    job.result = state["found"]
+
+    if state["error"] is not None:
+        job.error = KNOWN_ERRORS.get(state["error"], ScraperServiceException)(state["message"])
+
+    if job.status in (JobStatus.DONE, JobStatus.FAILED):
+        job.finished.set()
+
+    return job
+
+
+class ScraperService:
+    """
+    This class owns the scraper of a deployment with several server processes. It is the only process with a
+    browser and the only writer of the shared cache: the servers read the cache and ask the service, over a local
+    socket, to scrape the schedules that are missing, which it saves to the cache, and to save the values they derive.
+
+    Scrapes of the same schedule are deduplicated, and run one at a time (there's a single browser), a schedule that
+    is already cached isn't scraped again. The scrape jobs are kept by the service, so a job submitted through one
+    server can be looked up through any other. The service listens on a unix socket that only its user can connect
+    to, the messages are json and the servers can only save encoded schedules.
+
+    :param scraper: The scraper.
+    :type scraper: ScheduleScraper
+    :param parser: The parser of the scraped schedules.
+    :type parser: ScheduleParser
+    :param cache: The shared cache.
+    :type cache: Cache
+    :param address: Path of the unix socket to listen on, its directory should only be accessible by its user.
+    :type address: str
+    """
+
+    def __init__(self, scraper: ScheduleScraper, parser: ScheduleParser, cache: Cache, address: str) -> None:
+        self.scraper: ScheduleScraper = scraper
+        self.parser: ScheduleParser = parser
+        self.cache: Cache = cache
+        self.address: str = address
+
+        self.__queue: JobQueue = JobQueue(self.__scrape, workers=1)
+        self.__operations: dict[str, Callable[..., Any]] = {
+            "scrape": self.__submit_scrape,
+            "submit": self.__submit,
+            "job": self.__get_job,
+            "wait": self.__wait_job,
+            "courses": self.__get_courses,
+            "set": self.__set,
+            "health": self.__get_health,
+        }
+
+    async def serve_forever(self) -> None:
+        """
+        Answers the requests of the servers until cancelled, the browser is shut down afterwards.
+        """
+        if os.path.exists(self.address):  # Left behind by a previous run.
+            os.remove(self.address)
+
+        # Created without permissions for others, then restricted to the user, so other users can't connect.
+        umask: int = os.umask(0o177)
+
+        try:
+            server: asyncio.AbstractServer = await asyncio.start_unix_server(self.__handle, self.address)
+
+        finally:
+            os.umask(umask)
+
+        os.chmod(self.address, 0o600)
+
+        try:
+            async with server:
+                await server.serve_forever()
+
+        finally:
+            self.__queue.close()
+            await asyncio.to_thread(self.scraper.close)
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answers the requests of a connection, in order, until it is closed. A request is an (operation, arguments)
+        pair, and its response a (result, error name, error message) tuple.
+        """
+        try:
+            while True:
+                try:
+                    operation, arguments = await read_message(reader)
+
+                except (asyncio.IncompleteReadError, ValueError):  # The connection was closed or is not a server.
+                    break
+
+                try:
+                    result: Any = await self.__operations[operation](**arguments)
+                    await write_message(writer, (result, None, None))
+
+                except Exception as e:  # The error is raised on the server that made the request.
+                    await write_message(writer, (None, type(e).__name__, str(e)))
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writer.close()
+
+    async def __submit_scrape(self, key: str, course_name: str, year: Optional[int], date_str: str) -> bool:
+        return await self.__queue.wait(self.__queue.submit(key, (key, course_name, year, date_str, None)))
+
+    async def __submit(
+            self,
+            key: str,
+            course_name: str,
+            year: Optional[int],
+            date_str: str,
+            request: Any = None) -> dict[str, Any]:
+        """
+        Queues the scrape job of a schedule without waiting for it, the request it was submitted with is kept with it.
+        :return: The state of the job, the one of the same schedule if it was already queued.
+        :rtype: dict[str, Any]
+        """
+        return job_state(self.__queue.submit(key, (key, course_name, year, date_str, request)))
+
+    async def __get_job(self, job_id: str) -> Optional[dict[str, Any]]:
+        job: Optional[Job] = self.__queue.get(job_id)
+
+        return job_state(job) if job is not None else None
+
+    async def __wait_job(self, job_id: str) -> Optional[dict[str, Any]]:
+        job: Optional[Job] = self.__queue.get(job_id)
+
+        if job is None:
+            return None
+
+        await job.finished.wait()
+
+        return job_state(job)
+
+    async def __scrape(self, payload: tuple[str, str, Optional[int], str, Any]) -> bool:
+        """
+        Scrapes a schedule and saves it to the cache, unless a previous request already did.
+        :return: Whether the schedule was found, it isn't if there's no schedule for the given date.
+        :rtype: bool
+        """
+        key, course_name, year, date_str, _ = payload
+
+        if self.cache.has(key):
+            return True
+
+        schedules: Optional[ScheduleGroup] = await asyncio.to_thread(
+            self.scraper.get, course_name=course_name, year=year, date_str=date_str, parser=self.parser
+        )
+
+        if schedules is None:
+            return False
+
+        self.cache.set(key, schedules)
+        self.cache.delete(f"{key}{ENCODED_SUFFIX}")  # The encoding of the previous schedules, if any.
+        return True
+
+    async def __get_courses(self) -> list[str]:
+        if self.cache.has("courses"):
+            return self.cache.get("courses")
+
+        courses: list[str] = await asyncio.to_thread(self.scraper.get_courses)
+        self.cache.set("courses", courses)
+
+        return courses
+
+    async def __set(self, key: str, value: str, last_seen: Optional[int] = None) -> None:
+        """
+        Saves the encoded schedules of a cached schedule, given in base64, as seen at the same time as the schedule.
+        :raises ValueError: If the key isn't the one of encoded schedules.
+        """
+        if not key.endswith(ENCODED_SUFFIX):
+            raise ValueError(f"Only encoded schedules can be saved, not '{key}'.")
+
+        self.cache.set(key, base64.b64decode(value, validate=True), last_seen)
+
+    async def __get_health(self) -> dict[str, bool]:
+        running: bool = self.scraper.is_running
+        healthy: bool = running and await asyncio.to_thread(self.scraper.is_healthy)
+
+        return {"scraper_running": running, "scraper_healthy": healthy}
+
+
+class ScraperClient:
+    """
+    This class makes the requests of a server to the ScraperService of the deployment, the errors of the service are
+    raised again, and a service that can't be reached raises a ScraperServiceException.
+
+    :param address: Path of the unix socket of the service.
+    :type address: str
+    """
+
+    def __init__(self, address: str) -> None:
+        self.address: str = address
+        self.__pending: set[asyncio.Task] = set()  # Requests whose result isn't awaited.
+
+    async def request(self, operation: str, **arguments: Any) -> Any:
+        """
+        Makes a request to the service, on a connection of its own.
+        :param operation: The operation (scrape, submit, job, wait, courses, set, health).
+        :type operation: str
+        :return: The result of the operation.
+        :rtype: Any
+        """
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.address)
+
+        except OSError as e:
+            raise ScraperServiceException(f"The scraper service at '{self.address}' can't be reached: {e}.")
+
+        try:
+            await write_message(writer, (operation, arguments))
+            result, error, message = await read_message(reader)
+
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            raise ScraperServiceException(f"The scraper service at '{self.address}' closed the connection: {e}.")
+
+        finally:
+            writer.close()
+
+        if error is not None:
+            raise KNOWN_ERRORS.get(error, ScraperServiceException)(message)
+
+        return result
+
+    async def scrape(self, key: str, course_name: str, year: Optional[int], date_str: str) -> bool:
+        """
+        Has the service scrape a schedule and save it to the cache, under the given key.
+        :return: Whether the schedule was found.
+        :rtype: bool
+        """
+        return await self.request("scrape", key=key, course_name=course_name, year=year, date_str=date_str)
+
+    async def submit(self, key: str, course_name: str, year: Optional[int], date_str: str, request: Any) -> Job:
+        """
+        Has the service queue the scrape of a schedule, without waiting for it.
+        :param request: Kept with the job, as the payload of the jobs returned for it.
+        :type request: Any
+        :return: The job, whose result is whether the schedule was found.
+        :rtype: Job
+        """
+        return from_job_state(await self.request(
+            "submit", key=key, course_name=course_name, year=year, date_str=date_str, request=request
+        ))
+
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        :return: The current state of a scrape job, None if it doesn't exist or was already forgotten.
+        :rtype: Optional[Job]
+        """
+        state: Optional[dict[str, Any]] = await self.request("job", job_id=job_id)
+
+        return from_job_state(state) if state is not None else None
+
+    async def wait_job(self, job_id: str) -> Optional[Job]:
+        """
+        :return: The state of a scrape job once it finishes, None if it doesn't exist or was already forgotten.
+        :rtype: Optional[Job]
+        """
+        state: Optional[dict[str, Any]] = await self.request("wait", job_id=job_id)
+
+        return from_job_state(state) if state is not None else None
+
+    async def get_courses(self) -> list[str]:
+        return await self.request("courses")
+
+    async def get_health(self) -> dict[str, bool]:
+        return await self.request("health")
+
+    def set_soon(self, key: str, value: bytes, last_seen: Optional[int] = None) -> None:
+        """
+        Has the service save encoded schedules to the cache, without waiting for it. A value that can't be saved is
+        left out of the cache. Must be called from an event loop.
+        """
+        task: asyncio.Task = asyncio.get_running_loop().create_task(
+            self.request("set", key=key, value=base64.b64encode(value).decode("ascii"), last_seen=last_seen)
+        )
+        self.__pending.add(task)
+        task.add_done_callback(self.__forget)
+
+    def __forget(self, task: asyncio.Task) -> None:
+        self.__pending.discard(task)
+
+        if not task.cancelled():
+            task.exception()  # Retrieved, a value that wasn't saved is only a cache miss.
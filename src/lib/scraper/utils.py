@@ -0,0 +1,38 @@
+from datetime import datetime
+
+MINUTES_IN_HOUR: int = 60
+
+
+def minutes_from_str(time_str: str) -> int:
+    """
+    Converts a time string formatted as %H:%M into minutes since midnight.
+    :param time_str: Time as a string (HH:MM).
+    :type time_str: str
+    :return: Minutes since midnight.
+    :rtype: int
+    """
+    hours, minutes = time_str.strip().split(":")
+    return int(hours) * MINUTES_IN_HOUR + int(minutes)
+
+
+def minutes_to_str(minutes: int) -> str:
+    """
+    Converts minutes since midnight into a time string formatted as %H:%M.
+    :param minutes: Minutes since midnight.
+    :type minutes: int
+    :return: Time as a string (HH:MM).
+    :rtype: str
+    """
+    return f"{minutes // MINUTES_IN_HOUR:02d}:{minutes % MINUTES_IN_HOUR:02d}"
+
+
+def minutes_to_datetime(minutes: int) -> datetime:
+    """
+    Converts minutes since midnight into a datetime on the dummy 1900-01-01 date, the same value that
+    datetime.strptime(..., "%H:%M") would produce.
+    :param minutes: Minutes since midnight.
+    :type minutes: int
+    :return: The corresponding datetime.
+    :rtype: datetime
+    """
+    return datetime(1900, 1, 1, minutes // MINUTES_IN_HOUR, minutes % MINUTES_IN_HOUR)
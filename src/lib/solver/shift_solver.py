@@ -0,0 +1,447 @@
+import heapq
+import re
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, Iterator, Optional
+
+from src.lib.exceptions import CourseNameDoesNotExistException
+from src.lib.scraper.event import ScheduleEvent
+from src.lib.scraper.schedule import Schedule
+
+SLOT_MINUTES: int = 5
+SLOTS_PER_DAY: int = 24 * 60 // SLOT_MINUTES
+WEEK_DAYS: int = 7
+DAYS_ALL: int = (1 << WEEK_DAYS) - 1
+
+# Budget of a search, the number of partial selections visited and the seconds spent, after which the best selections
+# found so far are returned. The search is exponential on the number of variables, the budget bounds its worst case.
+MAX_NODES: int = 5_000
+TIMEOUT: float = 0.5
+
+Candidate = tuple[str, int, int, tuple[tuple[int, int], ...], tuple[int, ...]]
+"""
+A candidate shift of a variable, as (shift, time bitset, days bitset, (weekday, ending time) of each of its days,
+ending time of each weekday or 0 if free).
+"""
+
+
+class Objective(str, Enum):
+    """
+    The criteria used to rank the shift selections, the lower the better. None of them improves when a shift is
+    added to a selection, which is what allows the solver to prune partial selections.
+    """
+
+    DAYS = "days"  # Number of days with classes.
+    END = "end"  # Sum of the ending times of each day with classes.
+    LAST = "last"  # Ending time of the latest class of the week.
+
+
+@dataclass(frozen=True, slots=True)
+class Solution:
+    """
+    This class represents a valid shift selection, one shift of each type per course without overlapping events.
+    :param shifts: The selected shifts, in the format accepted by Schedule.filter.
+    :type shifts: dict[str, list[str]]
+    :param score: Value of each of the requested objectives, in days or minutes.
+    :type score: tuple[int, ...]
+    """
+
+    shifts: dict[str, list[str]]
+    score: tuple[int, ...]
+
+
+def get_shift_type(shift: str) -> str:
+    """
+    Obtains the type of shift, its letters (T1 -> T, TP2 -> TP, PL10 -> PL).
+    :param shift: The shift.
+    :type shift: str
+    :return: The type of the shift.
+    :rtype: str
+    """
+    match: Optional[re.Match] = re.match(r"\D+", shift)
+    return match.group(0) if match else shift
+
+
+def get_time_mask(events: Iterable[ScheduleEvent]) -> int:
+    """
+    Builds a bitset of the week where each bit is a slot of SLOT_MINUTES, set if an event is happening then.
+    :param events: The events.
+    :type events: Iterable[ScheduleEvent]
+    :return: The bitset.
+    :rtype: int
+    """
+    mask: int = 0
+
+    event: ScheduleEvent
+    for event in events:
+        first: int = event.day * SLOTS_PER_DAY + event.start // SLOT_MINUTES
+        last: int = event.day * SLOTS_PER_DAY + -(-event.end // SLOT_MINUTES)  # Ceiling division.
+        mask |= (1 << last) - (1 << first)
+
+    return mask
+
+
+def merge_ends(ends: list[int], day_ends: tuple[tuple[int, int], ...]) -> list[int]:
+    """
+    Combines the ending time of each day of a selection with the ones of a shift.
+    :param ends: Ending time of each weekday (0 if free) of the selection.
+    :type ends: list[int]
+    :param day_ends: (weekday, ending time) of each day of the shift.
+    :type day_ends: tuple[tuple[int, int], ...]
+    :return: Ending time of each weekday of the selection with the shift.
+    :rtype: list[int]
+    """
+    merged: list[int] = list(ends)
+
+    day: int
+    end: int
+    for day, end in day_ends:
+        if end > merged[day]:
+            merged[day] = end
+
+    return merged
+
+
+def end_increase(ends: list[int], day_ends: tuple[tuple[int, int], ...]) -> int:
+    """
+    Computes how much the sum of the ending times of each day of a selection grows once a shift is added.
+    :param ends: Ending time of each weekday (0 if free) of the selection.
+    :type ends: list[int]
+    :param day_ends: (weekday, ending time) of each day of the shift.
+    :type day_ends: tuple[tuple[int, int], ...]
+    :return: The increase, in minutes.
+    :rtype: int
+    """
+    increase: int = 0
+
+    day: int
+    end: int
+    for day, end in day_ends:
+        if end > ends[day]:
+            increase += end - ends[day]
+
+    return increase
+
+
+def evaluate(days: int, ends: list[int], objectives: Iterable[Objective]) -> tuple[int, ...]:
+    """
+    Computes the value of each objective for a selection.
+    :param days: Bitset of the days with classes.
+    :type days: int
+    :param ends: Ending time of each weekday (0 if free).
+    :type ends: list[int]
+    :param objectives: The objectives to compute.
+    :type objectives: Iterable[Objective]
+    :return: The values, in the same order as the objectives.
+    :rtype: tuple[int, ...]
+    """
+    values: dict[Objective, int] = {
+        Objective.DAYS: days.bit_count(),
+        Objective.END: sum(ends),
+        Objective.LAST: max(ends),
+    }
+
+    return tuple(values[objective] for objective in objectives)
+
+
+class ShiftSolver:
+    """
+    This class enumerates the shift selections of a schedule where each course gets one shift of each of its types
+    (T, TP, PL, ...) and no events overlap. Each (course, type) pair is a variable whose domain is the shifts of that
+    type and each shift is a bitset of the time it occupies, so checking a conflict is a single AND.
+
+    The domains are first reduced with arc consistency, then a backtracking search picks the variable with the
+    smallest domain first, tries the cheapest shifts first, forward checks the remaining domains after each choice
+    and prunes the branches that can't beat the worst of the best selections found so far. A search that runs out of
+    its budget returns the best selections found until then, which aren't guaranteed to be the best ones, and sets
+    truncated.
+
+    :param schedule: The schedule to solve.
+    :type schedule: Schedule
+    :param courses: The courses to take, every course on the schedule by default.
+    :type courses: Iterable[str], optional
+    """
+
+    def __init__(self, schedule: Schedule, courses: Optional[Iterable[str]] = None) -> None:
+        """
+        Class constructor, builds the variables and their domains.
+        """
+
+        available: dict[str, list[str]] = schedule.get_shifts_from_courses()
+        courses: list[str] = list(available) if courses is None else [course.lower() for course in courses]
+
+        self.variables: list[tuple[str, str]] = []
+        """
+        The (course, shift type) pairs that need a shift.
+        """
+
+        self.domains: list[list[Candidate]] = []
+        """
+        For each variable, its candidate shifts.
+        """
+
+        course: str
+        for course in courses:
+            if course not in available:
+                raise CourseNameDoesNotExistException(f"Course '{course}' is not on the schedule.")
+
+            by_type: dict[str, list[Candidate]] = {}
+
+            shift: str
+            for shift in available[course]:
+                events: list[ScheduleEvent] = schedule.filter({course: [shift]}).get_events()
+
+                days: int = 0
+                ends: dict[int, int] = {}
+
+                event: ScheduleEvent
+                for event in events:
+                    days |= 1 << event.day
+                    ends[event.day] = max(ends.get(event.day, 0), event.end)
+
+                by_type.setdefault(get_shift_type(shift), []).append(
+                    (
+                        shift,
+                        get_time_mask(events),
+                        days,
+                        tuple(ends.items()),
+                        tuple(ends.get(day, 0) for day in range(WEEK_DAYS)),
+                    )
+                )
+
+            shift_type: str
+            domain: list[Candidate]
+            for shift_type, domain in by_type.items():
+                self.variables.append((course, shift_type))
+                self.domains.append(domain)
+
+        self.truncated: bool = False
+        """
+        Whether the last search ran out of its budget before it was complete.
+        """
+
+    @staticmethod
+    def _propagate(domains: list[list[Candidate]]) -> bool:
+        """
+        Enforces arc consistency, removing every shift that conflicts with all the shifts of another variable.
+        :param domains: The domains, changed in place.
+        :type domains: list[list[Candidate]]
+        :return: False if a domain becomes empty (no selections), True otherwise.
+        :rtype: bool
+        """
+        changed: bool = True
+
+        while changed:
+            changed = False
+
+            i: int
+            for i in range(len(domains)):
+                others: list[list[Candidate]] = [domain for j, domain in enumerate(domains) if j != i]
+
+                supported: list[Candidate] = [
+                    candidate
+                    for candidate in domains[i]
+                    if all(any(not candidate[1] & other[1] for other in domain) for domain in others)
+                ]
+
+                if not supported:
+                    return False
+
+                if len(supported) != len(domains[i]):
+                    domains[i] = supported
+                    changed = True
+
+        return True
+
+    @staticmethod
+    def _lower_bounds(
+        objectives: tuple[Objective, ...],
+        used_days: int,
+        used_ends: list[int],
+        remaining: list[int],
+        current: list[list[Candidate]],
+    ) -> Iterator[int]:
+        """
+        Lower bounds of the objectives for any selection that extends a partial one, computed lazily. Anything shared
+        by all the candidates of a variable will be added anyway, so it is forced on top of the partial selection.
+        Then, every remaining variable will add one of its candidates, so an objective grows at least by the cheapest
+        of them over the forced days and ending times.
+        """
+
+        forced_days: int = used_days
+        forced_ends: list[int] = list(used_ends)
+
+        v: int
+        for v in remaining:
+            common: int = DAYS_ALL
+            for candidate in current[v]:
+                common &= candidate[2]
+
+            forced_days |= common
+
+            day: int
+            while common:
+                day = (common & -common).bit_length() - 1
+                common &= common - 1
+
+                earliest: int = min(candidate[4][day] for candidate in current[v])
+                if earliest > forced_ends[day]:
+                    forced_ends[day] = earliest
+
+        objective: Objective
+        for objective in objectives:
+            if objective is Objective.DAYS:
+                increase: int = max(
+                    min((candidate[2] & ~forced_days).bit_count() for candidate in current[v]) for v in remaining
+                )
+                yield forced_days.bit_count() + increase
+
+            elif objective is Objective.END:
+                increase: int = max(
+                    min(end_increase(forced_ends, candidate[3]) for candidate in current[v]) for v in remaining
+                )
+                yield sum(forced_ends) + increase
+
+            else:
+                latest: int = max(min(max(candidate[4]) for candidate in current[v]) for v in remaining)
+                yield max(max(forced_ends), latest)
+
+    def solve(
+        self,
+        objectives: Iterable[Objective] = (Objective.DAYS, Objective.END),
+        limit: int = 10,
+        max_nodes: Optional[int] = MAX_NODES,
+        timeout: Optional[float] = TIMEOUT,
+    ) -> list[Solution]:
+        """
+        Searches for the best shift selections, until the search is complete or its budget runs out.
+        :param objectives: The objectives used to rank the selections, compared in order.
+        :type objectives: Iterable[Objective]
+        :param limit: Maximum number of selections to return.
+        :type limit: int
+        :param max_nodes: Maximum number of partial selections to visit, None for no limit.
+        :type max_nodes: Optional[int]
+        :param timeout: Maximum number of seconds to search for, None for no limit.
+        :type timeout: Optional[float]
+        :return: The best selections, best first.
+        :rtype: list[Solution]
+        """
+
+        objectives: tuple[Objective, ...] = tuple(objectives)
+        domains: list[list[Candidate]] = [list(domain) for domain in self.domains]
+        self.truncated = False
+
+        if limit <= 0 or not self._propagate(domains):
+            return []
+
+        # Min-heap of the best selections so far keyed by the negated score, so the worst one is at the top. The
+        # negated counter keeps the first found selection on ties.
+        best: list[tuple[tuple[int, ...], int, list[str]]] = []
+        counter: int = 0
+        assignment: list[Optional[str]] = [None] * len(domains)
+
+        nodes: int = 0
+        deadline: Optional[float] = time.perf_counter() + timeout if timeout is not None else None
+
+        def can_improve(bounds: Iterable[int]) -> bool:
+            """
+            Checks whether a partial selection with the given bounds can still make it into the best selections.
+            """
+            if len(best) < limit:
+                return True
+
+            worst: tuple[int, ...] = best[0][0]
+
+            i: int
+            value: int
+            for i, value in enumerate(bounds):
+                if value != -worst[i]:
+                    return value < -worst[i]
+
+            return False  # At best equal to the worst one, which stays since it was found first.
+
+        def search(used: int, used_days: int, used_ends: list[int], remaining: list[int],
+                   current: list[list[Candidate]]) -> None:
+            nonlocal counter, nodes
+
+            if self.truncated:
+                return
+
+            nodes += 1
+
+            out_of_nodes: bool = max_nodes is not None and nodes > max_nodes
+
+            if out_of_nodes or (deadline is not None and time.perf_counter() > deadline):
+                self.truncated = True
+                return
+
+            if not remaining:
+                score: tuple[int, ...] = evaluate(used_days, used_ends, objectives)
+                entry = (tuple(-value for value in score), -counter, list(assignment))
+                counter += 1
+
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+
+                return
+
+            if not can_improve(self._lower_bounds(objectives, used_days, used_ends, remaining, current)):
+                return
+
+            # Picking the variable with the smallest domain first.
+            variable: int = min(remaining, key=lambda v: len(current[v]))
+            rest: list[int] = [v for v in remaining if v != variable]
+
+            # Trying the cheapest candidates first, so that good selections tighten the bound early.
+            candidates: list[Candidate] = sorted(
+                current[variable],
+                key=lambda c: evaluate(used_days | c[2], merge_ends(used_ends, c[3]), objectives),
+            )
+
+            shift: str
+            mask: int
+            days: int
+            ends: tuple[tuple[int, int], ...]
+            for shift, mask, days, ends, _ in candidates:
+                if self.truncated:
+                    break
+
+                chosen: int = used | mask
+
+                # Forward checking, removing the candidates that now conflict.
+                pruned: list[list[Candidate]] = list(current)
+                feasible: bool = True
+
+                v: int
+                for v in rest:
+                    pruned[v] = [candidate for candidate in current[v] if not candidate[1] & chosen]
+
+                    if not pruned[v]:
+                        feasible = False
+                        break
+
+                if feasible:
+                    assignment[variable] = shift
+                    search(chosen, used_days | days, merge_ends(used_ends, ends), rest, pruned)
+
+            assignment[variable] = None
+
+        search(0, 0, [0] * WEEK_DAYS, list(range(len(domains))), domains)
+
+        solutions: list[Solution] = []
+
+        negated: tuple[int, ...]
+        selected: list[str]
+        for negated, _, selected in sorted(best, reverse=True):
+            shifts: dict[str, list[str]] = {}
+
+            for (course, _), shift in zip(self.variables, selected):
+                shifts.setdefault(course, []).append(shift)
+
+            solutions.append(Solution(shifts=shifts, score=tuple(-value for value in negated)))
+
+        return solutions
@@ -0,0 +1,292 @@
+import functools
+import inspect
+import re
+import secrets
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Iterable, Iterator, Optional
+
+TRACEPARENT_PATTERN: re.Pattern = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+def new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+@dataclass(slots=True, eq=False)
+class Span:
+    """
+    This class represents a timed operation of a trace, with the same ids and times as an OpenTelemetry span
+    (hexadecimal trace and span ids, nanoseconds since the epoch), so it can be handed to any exporter.
+    :param name: Name of the operation, like 'cache.get'.
+    :type name: str
+    :param trace_id: Id of the trace, 32 hexadecimal digits.
+    :type trace_id: str
+    :param parent_id: Id of the span this one is part of, None for the root span.
+    :type parent_id: Optional[str]
+    :param attributes: Details of the operation.
+    :type attributes: dict[str, Any]
+    """
+
+    name: str
+    trace_id: str
+    parent_id: Optional[str] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    span_id: str = field(default_factory=new_span_id)
+    start_time: int = field(default_factory=time.time_ns)
+    end_time: Optional[int] = None
+    status: str = "unset"  # Becomes 'error' if the operation raises.
+
+    @property
+    def duration(self) -> float:
+        """
+        :return: Duration of the span in milliseconds, until now if it hasn't ended.
+        :rtype: float
+        """
+        return ((self.end_time or time.time_ns()) - self.start_time) / 1_000_000
+
+    @property
+    def traceparent(self) -> str:
+        """
+        :return: The W3C trace context header that makes other services continue the trace from this span.
+        :rtype: str
+        """
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        :return: The span with the field names of the OpenTelemetry protocol (OTLP) json encoding.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": self.start_time,
+            "endTimeUnixNano": self.end_time,
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+@dataclass(slots=True, eq=False)
+class Trace:
+    """
+    This class gathers the spans of a request, as they end, along with its id.
+    :param request_id: Id of the request.
+    :type request_id: str
+    :param trace_id: Id of the trace, the one given by the caller to continue its trace.
+    :type trace_id: str
+    :param parent_id: Id of the span of the caller, if any.
+    :type parent_id: Optional[str]
+    """
+
+    request_id: str
+    trace_id: str = field(default_factory=new_trace_id)
+    parent_id: Optional[str] = None
+    spans: list[Span] = field(default_factory=list)
+
+    @classmethod
+    def from_traceparent(cls, request_id: str, traceparent: Optional[str]) -> "Trace":
+        """
+        Creates the trace of a request, continuing the trace of the caller if it sent a valid W3C traceparent header.
+        :param request_id: Id of the request.
+        :type request_id: str
+        :param traceparent: The traceparent header of the request.
+        :type traceparent: Optional[str]
+        :return: The trace.
+        :rtype: Trace
+        """
+        match: Optional[re.Match] = TRACEPARENT_PATTERN.match(traceparent.strip().lower()) if traceparent else None
+
+        if match is None:
+            return cls(request_id=request_id)
+
+        return cls(request_id=request_id, trace_id=match.group(1), parent_id=match.group(2))
+
+    def server_timing(self) -> str:
+        """
+        Formats the time of the ended spans as a Server-Timing header, the durations of the spans with the same name
+        are added up.
+        :return: The header value, like 'cache.get;dur=0.41, parser.parse;dur=120.5'.
+        :rtype: str
+        """
+        durations: dict[str, float] = {}
+
+        span: Span
+        for span in list(self.spans):
+            durations[span.name] = durations.get(span.name, 0.0) + span.duration
+
+        return ", ".join(f"{name};dur={duration:.2f}" for name, duration in durations.items())
+
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    This class creates the spans of the process. Spans are nested by context (threads started with
+    asyncio.to_thread and tasks keep the span they were started from), and handed to the exporters as they end.
+    No exporter is needed, the spans of a request are gathered on its Trace. While disabled, span and traced don't
+    create anything, so instrumented code costs a single attribute check.
+
+    :param enabled: Whether spans are created.
+    :type enabled: bool
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled: bool = enabled
+        self.exporters: list[Callable[[Span], None]] = []
+
+    @contextmanager
+    def trace(self, request_id: str, traceparent: Optional[str] = None) -> Iterator[Trace]:
+        """
+        Context manager that gathers the spans ended inside it.
+        :param request_id: Id of the request.
+        :type request_id: str
+        :param traceparent: The W3C traceparent header of the request, if any.
+        :type traceparent: Optional[str]
+        :return: The trace.
+        :rtype: Iterator[Trace]
+        """
+        trace: Trace = Trace.from_traceparent(request_id, traceparent)
+        token: Token = current_trace.set(trace)
+
+        try:
+            yield trace
+
+        finally:
+            current_trace.reset(token)
+
+    def start_span(self, name: str, attributes: Optional[dict[str, Any]] = None) -> Span:
+        """
+        Creates a span, child of the current span, without making it the current one.
+        :param name: Name of the operation.
+        :type name: str
+        :param attributes: Details of the operation.
+        :type attributes: Optional[dict[str, Any]]
+        :return: The span, which must be ended with end_span.
+        :rtype: Span
+        """
+        parent: Optional[Span] = current_span.get()
+        trace: Optional[Trace] = current_trace.get()
+
+        if parent is not None:
+            return Span(name, parent.trace_id, parent.span_id, attributes or {})
+
+        if trace is not None:
+            return Span(name, trace.trace_id, trace.parent_id, {"request.id": trace.request_id, **(attributes or {})})
+
+        return Span(name, new_trace_id(), None, attributes or {})
+
+    def end_span(self, span: Span, trace: Optional[Trace] = None) -> None:
+        """
+        Ends a span, adding it to the trace it was created in and handing it to the exporters.
+        :param span: The span.
+        :type span: Span
+        :param trace: The trace of the span, the current one by default.
+        :type trace: Optional[Trace]
+        """
+        span.end_time = time.time_ns()
+        trace = trace or current_trace.get()
+
+        if trace is not None:
+            trace.spans.append(span)
+
+        exporter: Callable[[Span], None]
+        for exporter in self.exporters:
+            exporter(span)
+
+    @contextmanager
+    def __span(self, name: str, attributes: dict[str, Any]) -> Iterator[Span]:
+        span: Span = self.start_span(name, attributes)
+        token: Token = current_span.set(span)
+
+        try:
+            yield span
+
+        except BaseException as e:
+            span.status = "error"
+            span.attributes["exception.type"] = type(e).__name__
+            raise
+
+        finally:
+            current_span.reset(token)
+            self.end_span(span)
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[Optional[Span]]:
+        """
+        :return: A context manager of a span that is the current one inside it, if the tracer is enabled.
+        :rtype: ContextManager[Optional[Span]]
+        """
+        if not self.enabled:
+            return nullcontext()
+
+        return self.__span(name, attributes)
+
+    def traced(self, name: str) -> Callable[[Callable], Callable]:
+        """
+        Decorator that runs each call of a function, or coroutine function, inside a span.
+        """
+
+        def decorator(function: Callable) -> Callable:
+            if inspect.iscoroutinefunction(function):
+                @functools.wraps(function)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if not self.enabled:
+                        return await function(*args, **kwargs)
+
+                    with self.__span(name, {}):
+                        return await function(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return function(*args, **kwargs)
+
+                with self.__span(name, {}):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def iter_traced(self, iterator: Iterable[Any], name: str, **attributes: Any) -> Iterable[Any]:
+        """
+        Runs an iterator inside a span, from its creation until it is exhausted or closed. The span isn't made the
+        current one, since the items may be consumed from different contexts.
+        :return: The items of the iterator, the iterator itself if the tracer is disabled.
+        :rtype: Iterable[Any]
+        """
+        if not self.enabled:
+            return iterator
+
+        return self.__iter_traced(iter(iterator), self.start_span(name, attributes), current_trace.get())
+
+    def __iter_traced(self, iterator: Iterator[Any], span: Span, trace: Optional[Trace]) -> Iterator[Any]:
+        try:
+            yield from iterator
+
+        except Exception as e:
+            span.status = "error"
+            span.attributes["exception.type"] = type(e).__name__
+            raise
+
+        finally:
+            self.end_span(span, trace)
+
+
+TRACER: Tracer = Tracer()
+"""
+The tracer of the process, disabled until it is enabled by whoever runs shifter.
+"""
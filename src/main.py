@@ -1,10 +1,11 @@
+import argparse
+from typing import Optional
+
 from src.lib.builder.builder import Builder
 from src.lib.builder.builder_factory import BuilderFactory
-from src.lib.builder.ical.ical_builder import IcalBuilder
-from src.lib.builder.json.json_builder import JsonBuilder
-from src.lib.builder.xlsx.xlsx_builder import XlsxBuilder
 from src.lib.scraper.parser import ScheduleParser
 from src.lib.scraper.schedule import Schedule, ScheduleGroup
+from src.lib.profiling.profiler import add_profile_arguments, profile_from_arguments
 from src.lib.scraper.scraper import ScheduleScraper
 
 FIRST_SEMESTER_DATE: str = "01-11-2023"
@@ -12,10 +13,7 @@ SECOND_SEMESTER_DATE: str = "01-03-2024"
 
 
 def main():
-    builder_factory: BuilderFactory = BuilderFactory()  # Builder
-    builder_factory.register_builder("xlsx", XlsxBuilder)
-    builder_factory.register_builder("ics", IcalBuilder)
-    builder_factory.register_builder("json", JsonBuilder)
+    builder_factory: BuilderFactory = BuilderFactory.with_defaults()  # Builder
 
     parser: ScheduleParser = ScheduleParser()
     scraper: ScheduleScraper = ScheduleScraper(is_headless=True)
@@ -39,11 +37,22 @@ def main():
         "Narrativas de Viagem": ["T1", "TP1"],
     }
 
-    builder: Builder = JsonBuilder(schedule_obj)
+    builder: Builder = builder_factory.create("json", schedule=schedule_obj)
     sched: bytes = builder.build()
 
     print(sched.decode())
 
 
+def run(argv: Optional[list[str]] = None) -> None:
+    """
+    Runs main with the command line arguments, profiling it if asked to.
+    """
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Scrapes and prints a schedule.")
+    add_profile_arguments(argument_parser)
+
+    with profile_from_arguments(argument_parser.parse_args(argv)):
+        main()
+
+
 if __name__ == "__main__":
-    SystemExit(main())
+    SystemExit(run())
@@ -0,0 +1,167 @@
+import asyncio
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import httpx
+import pytest
+
+from src.lib.cache.ttl_cache import Cache
+from src.lib.scraper.schedule import Schedule, ScheduleGroup
+from src.lib.scraper.scraper_service import ScraperService
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+COURSE: str = "Licenciatura em Engenharia Informática"
+STARTUP_TIMEOUT: float = 30
+
+
+class BlockedScraper:
+    """
+    Stands in for the scraper of the service, each scrape waits until it is released.
+    """
+
+    def __init__(self) -> None:
+        self.released: threading.Event = threading.Event()
+        self.scrapes: int = 0
+        self.is_running: bool = False
+
+    def get(self, course_name: str, year: Optional[int], date_str: str, parser: Any) -> ScheduleGroup:
+        self.scrapes += 1
+        self.released.wait(STARTUP_TIMEOUT)
+
+        group: ScheduleGroup = ScheduleGroup(course_name=course_name)
+        group.add_event_to_year(1, Schedule(["Segunda", "Terça"]))
+
+        return group
+
+    def close(self) -> None:
+        self.released.set()
+
+
+@pytest.fixture
+def service() -> Iterator[tuple[BlockedScraper, str, str]]:
+    """
+    Runs a scraper service on a thread of its own, with its own event loop.
+    :return: The scraper of the service, the path of its socket and the path of the shared cache.
+    """
+    directory: str = tempfile.mkdtemp(prefix="shifter-")
+    address: str = os.path.join(directory, "scraper.sock")
+    cache_db: str = os.path.join(directory, "cache.db")
+
+    scraper: BlockedScraper = BlockedScraper()
+    loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+
+    def serve() -> None:
+        # The cache is created, used and released on this thread, sqlite connections can't change threads.
+        cache: Cache = Cache(cache_db, shared=True)
+        task: asyncio.Task = loop.create_task(ScraperService(scraper, None, cache, address).serve_forever())
+
+        try:
+            loop.run_until_complete(task)
+
+        except asyncio.CancelledError:
+            pass
+
+        finally:
+            loop.close()
+            del task
+            gc.collect()  # The tasks of the service reference the cache, which is then released on this thread.
+
+    thread: threading.Thread = threading.Thread(target=serve)
+    thread.start()
+
+    yield scraper, address, cache_db
+
+    loop.call_soon_threadsafe(lambda: [task.cancel() for task in asyncio.all_tasks(loop)])
+    thread.join()
+
+
+def start_worker(address: str, cache_db: str, socket_path: str) -> subprocess.Popen:
+    """
+    Starts a server process of the cluster, listening on a unix socket.
+    """
+    env: dict[str, str] = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "SHIFTER_SCRAPER_ADDRESS": address,
+        "SHIFTER_CACHE_DB": cache_db,
+    }
+
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.server:app", "--uds", socket_path, "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+
+
+def connect(socket_path: str, process: subprocess.Popen) -> httpx.Client:
+    """
+    Waits for a server process to answer, then returns a client of it.
+    """
+    client: httpx.Client = httpx.Client(transport=httpx.HTTPTransport(uds=socket_path), base_url="http://worker")
+    deadline: float = time.monotonic() + STARTUP_TIMEOUT
+
+    while True:
+        try:
+            client.get("/api/v1/shifter/health")
+            return client
+
+        except httpx.TransportError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"The server at '{socket_path}' didn't start.")
+
+            time.sleep(0.1)
+
+
+def test_job_is_polled_through_another_worker(service: tuple[BlockedScraper, str, str]) -> None:
+    scraper, address, cache_db = service
+    directory: str = os.path.dirname(address)
+    processes: list[subprocess.Popen] = [
+        start_worker(address, cache_db, os.path.join(directory, f"worker{index}.sock")) for index in range(2)
+    ]
+
+    try:
+        first, second = (
+            connect(os.path.join(directory, f"worker{index}.sock"), process)
+            for index, process in enumerate(processes)
+        )
+        body: dict[str, Any] = {"course_name": COURSE, "course_semester": 1, "course_years": 1}
+
+        response: httpx.Response = first.post("/api/v1/shifter/schedule/", json=body)
+        assert response.status_code == 202
+        job_id: str = response.json()["job_id"]
+        location: str = httpx.URL(response.headers["Location"]).path
+
+        # The other worker knows the job, and shares it instead of scraping the schedule again.
+        assert second.get(location).json()["status"] in ("pending", "running")
+        assert second.post("/api/v1/shifter/schedule/", json=body).json()["job_id"] == job_id
+
+        scraper.released.set()
+        deadline: float = time.monotonic() + STARTUP_TIMEOUT
+
+        while (state := second.get(location).json())["status"] not in ("done", "failed"):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+        assert state["status"] == "done"
+        assert state["result"]["course_name"] == COURSE
+        assert scraper.scrapes == 1
+
+        events: str = first.get(f"{location}/events").text
+        assert '"status":"done"' in events
+
+        assert second.get("/api/v1/shifter/jobs/unknown").status_code == 404
+
+    finally:
+        scraper.released.set()
+
+        process: subprocess.Popen
+        for process in processes:
+            process.terminate()
+            process.wait()
@@ -0,0 +1,134 @@
+import itertools
+import random
+
+import pytest
+
+from src.lib.scraper.event import ScheduleEvent, WEEKDAY_LABELS
+from src.lib.scraper.interval_index import Collision
+from src.lib.scraper.schedule import Schedule
+
+WEEKDAY: str = WEEKDAY_LABELS[0]
+
+
+def make_schedule(intervals: list[tuple[int, int]]) -> tuple[Schedule, list[ScheduleEvent]]:
+    """
+    :param intervals: (start, end) of each event, in minutes since midnight, all on the same weekday.
+    :return: A schedule with an event of a shift of its own for each interval, and the events in the given order.
+    """
+    schedule: Schedule = Schedule([WEEKDAY])
+    events: list[ScheduleEvent] = []
+
+    i: int
+    for i, (start, end) in enumerate(intervals):
+        event: ScheduleEvent = ScheduleEvent.build(
+            body=f"Unidade Curricular Teste [Gualtar - Edificio 1 - 0.{i:02d}] T{i + 1}",
+            start=start,
+            duration=end - start,
+            weekday=WEEKDAY,
+        )
+        schedule.add_event(event)
+        events.append(event)
+
+    return schedule, events
+
+
+def brute_force_collisions(events: list[ScheduleEvent]) -> set[tuple[int, int, frozenset[int], int]]:
+    """
+    Groups the events that overlap, directly or not, by comparing every pair of them.
+    :return: (start, end, ids of the events, concurrency) of each group of more than one event.
+    """
+    groups: list[set[int]] = [{i} for i in range(len(events))]
+
+    a: int
+    b: int
+    for a, b in itertools.combinations(range(len(events)), 2):
+        if events[a].start < events[b].end and events[b].start < events[a].end:
+            first: set[int] = next(group for group in groups if a in group)
+            second: set[int] = next(group for group in groups if b in group)
+
+            if first is not second:
+                first |= second
+                groups.remove(second)
+
+    result: set[tuple[int, int, frozenset[int], int]] = set()
+
+    group: set[int]
+    for group in groups:
+        if len(group) < 2:
+            continue
+
+        members: list[ScheduleEvent] = [events[i] for i in group]
+        concurrency: int = max(
+            sum(other.start <= event.start < other.end for other in members) for event in members
+        )
+        result.add((
+            min(event.start for event in members),
+            max(event.end for event in members),
+            frozenset(id(event) for event in members),
+            concurrency,
+        ))
+
+    return result
+
+
+def as_set(collisions: list[Collision]) -> set[tuple[int, int, frozenset[int], int]]:
+    return {
+        (collision.start, collision.end, frozenset(id(event) for event in collision.events), collision.concurrency)
+        for collision in collisions
+    }
+
+
+@pytest.mark.parametrize(
+    "intervals",
+    [
+        pytest.param([(480, 600), (540, 660), (570, 630)], id="triple overlap"),
+        pytest.param([(480, 720), (500, 540), (600, 660)], id="non-adjacent overlap"),
+        pytest.param([(480, 540), (540, 600)], id="touching"),
+        pytest.param([(480, 540), (540, 600), (590, 650)], id="touching then overlapping"),
+        pytest.param([(600, 660), (480, 900), (420, 500), (890, 960)], id="chained out of order"),
+        pytest.param([(480, 540), (480, 540), (480, 540)], id="identical"),
+        pytest.param([(480, 540)], id="single"),
+        pytest.param([], id="empty"),
+    ],
+)
+def test_collisions_match_brute_force(intervals: list[tuple[int, int]]) -> None:
+    schedule, events = make_schedule(intervals)
+
+    assert as_set(schedule.get_collisions(WEEKDAY)) == brute_force_collisions(events)
+
+
+def test_touching_intervals_do_not_collide() -> None:
+    schedule, _ = make_schedule([(480, 540), (540, 600), (600, 660)])
+
+    assert schedule.get_collisions(WEEKDAY) == []
+
+
+def test_non_adjacent_overlap_is_one_group() -> None:
+    # Sorted by start, the last event only overlaps the first one, which ends after the middle one.
+    schedule, events = make_schedule([(480, 720), (500, 540), (600, 660)])
+    collisions: list[Collision] = schedule.get_collisions(WEEKDAY)
+
+    assert len(collisions) == 1
+    assert collisions[0].start == 480 and collisions[0].end == 720
+    assert set(map(id, collisions[0].events)) == set(map(id, events))
+    assert collisions[0].concurrency == 2
+
+
+def test_collisions_are_sorted_by_start() -> None:
+    schedule, _ = make_schedule([(900, 960), (930, 990), (480, 540), (500, 560)])
+
+    assert [collision.start for collision in schedule.get_collisions(WEEKDAY)] == [480, 900]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_collisions_match_brute_force(seed: int) -> None:
+    rng: random.Random = random.Random(seed)
+    intervals: list[tuple[int, int]] = []
+
+    for _ in range(rng.randrange(2, 30)):
+        start: int = rng.randrange(8 * 60, 20 * 60, 30)
+        intervals.append((start, start + rng.choice((30, 60, 90, 120, 180))))
+
+    schedule, events = make_schedule(intervals)
+
+    assert as_set(schedule.get_collisions(WEEKDAY)) == brute_force_collisions(events)
@@ -0,0 +1,21 @@
+import pytest
+from pydantic import ValidationError
+
+from src.api.models.convert_request import ConvertRequest, Format
+
+BODY: dict = {"course_name": "Licenciatura em Engenharia Informática", "course_semester": 1, "course_years": 1}
+
+
+def make_request(fmt) -> ConvertRequest:
+    return ConvertRequest.model_validate({"body": BODY, "shifts": {}, "fmt": fmt})
+
+
+def test_formats_are_deduplicated_and_all_is_expanded() -> None:
+    assert make_request("xlsx").formats == [Format.XSLX]
+    assert make_request(["ics", "json", "ics"]).formats == [Format.ICS, Format.JSON]
+    assert make_request(["json", "all"]).formats == [Format.XSLX, Format.ICS, Format.JSON]
+
+
+def test_an_empty_list_of_formats_is_rejected() -> None:
+    with pytest.raises(ValidationError):
+        make_request([])
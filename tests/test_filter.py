@@ -0,0 +1,58 @@
+from src.lib.scraper.event import ScheduleEvent, WEEKDAY_LABELS
+from src.lib.scraper.schedule import Schedule
+
+MONDAY, TUESDAY = WEEKDAY_LABELS[:2]
+
+
+def make_schedule() -> Schedule:
+    schedule: Schedule = Schedule([MONDAY, TUESDAY])
+
+    weekday: str
+    start: int
+    body: str
+    for weekday, start, body in [
+        (MONDAY, 600, "Unidade Curricular Teste [Gualtar - Edificio 1 - 0.01] T1"),
+        (MONDAY, 480, "Unidade Curricular Teste [Gualtar - Edificio 1 - 0.02] TP1"),
+        (TUESDAY, 480, "Unidade Curricular Teste [Gualtar - Edificio 1 - 0.01] T1"),
+        (MONDAY, 540, "Outra Unidade Curricular [Gualtar - Edificio 2 - 0.01] PL1"),
+    ]:
+        schedule.add_event(ScheduleEvent.build(body=body, start=start, duration=60, weekday=weekday))
+
+    return schedule
+
+
+def shifts(schedule: Schedule, weekday: str) -> list[str]:
+    return [event.body.shift for event in schedule.get_events_from_weekday(weekday)]
+
+
+def test_filter_keeps_the_requested_shifts() -> None:
+    filtered: Schedule = make_schedule().filter({
+        "Unidade Curricular Teste": ["T1"],
+        "outra unidade curricular": ["PL1"],
+    })
+
+    assert shifts(filtered, MONDAY) == ["T1", "PL1"]  # In the order they were added.
+    assert shifts(filtered, TUESDAY) == ["T1"]
+
+
+def test_filter_ignores_unknown_courses_and_shifts() -> None:
+    filtered: Schedule = make_schedule().filter({"Unidade Curricular Teste": ["T9"], "Inexistente": ["T1"]})
+
+    assert filtered.get_events() == []
+
+
+def test_filter_adds_a_shift_listed_twice_once() -> None:
+    filtered: Schedule = make_schedule().filter({"Unidade Curricular Teste": ["T1", "T1"]})
+
+    assert shifts(filtered, MONDAY) == ["T1"]
+    assert shifts(filtered, TUESDAY) == ["T1"]
+
+
+def test_filter_adds_a_shift_of_courses_differing_in_case_once() -> None:
+    filtered: Schedule = make_schedule().filter({
+        "Unidade Curricular Teste": ["T1"],
+        "UNIDADE CURRICULAR TESTE": ["T1", "TP1"],
+    })
+
+    assert shifts(filtered, MONDAY) == ["T1", "TP1"]
+    assert shifts(filtered, TUESDAY) == ["T1"]
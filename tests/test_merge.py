@@ -0,0 +1,106 @@
+from src.lib.builder.utils import merge_schedules
+from src.lib.scraper.event import ScheduleEvent, WEEKDAY_LABELS
+from src.lib.scraper.schedule import Schedule
+
+MONDAY, TUESDAY, WEDNESDAY = WEEKDAY_LABELS[:3]
+
+
+def make_schedule(weekdays: list[str], events: list[tuple[str, int, str]]) -> Schedule:
+    """
+    :param weekdays: Weekdays of the schedule.
+    :param events: (weekday, start, shift) of each event, an hour long, added in the given order.
+    """
+    schedule: Schedule = Schedule(list(weekdays))
+
+    weekday: str
+    start: int
+    shift: str
+    for weekday, start, shift in events:
+        schedule.add_event(ScheduleEvent.build(
+            body=f"Unidade Curricular Teste [Gualtar - Edificio 1 - 0.01] {shift}",
+            start=start,
+            duration=60,
+            weekday=weekday,
+        ))
+
+    return schedule
+
+
+def shifts(schedule: Schedule, weekday: str) -> list[str]:
+    return [event.body.shift for event in schedule.get_events_from_weekday(weekday)]
+
+
+def test_merge_sorts_each_weekday_by_start() -> None:
+    first: Schedule = make_schedule([MONDAY, TUESDAY], [(MONDAY, 600, "T1"), (MONDAY, 480, "T2"), (TUESDAY, 540, "T3")])
+    second: Schedule = make_schedule([MONDAY], [(MONDAY, 540, "T4"), (MONDAY, 720, "T5")])
+
+    merged: Schedule = merge_schedules([first, second])
+
+    assert shifts(merged, MONDAY) == ["T2", "T4", "T1", "T5"]
+    assert shifts(merged, TUESDAY) == ["T3"]
+
+
+def test_merge_keeps_the_weekdays_of_every_schedule_in_weekday_order() -> None:
+    first: Schedule = make_schedule([WEDNESDAY], [(WEDNESDAY, 480, "T1")])
+    second: Schedule = make_schedule([TUESDAY, MONDAY], [(MONDAY, 480, "T2")])
+
+    assert merge_schedules([first, second]).weekdays == [MONDAY, TUESDAY, WEDNESDAY]
+
+
+def test_merge_is_stable() -> None:
+    # Events starting at the same time keep the order of the schedules, then the order they were added in.
+    first: Schedule = make_schedule([MONDAY], [(MONDAY, 480, "T1"), (MONDAY, 480, "T2")])
+    second: Schedule = make_schedule([MONDAY], [(MONDAY, 480, "T3"), (MONDAY, 420, "T4"), (MONDAY, 480, "T5")])
+
+    assert shifts(merge_schedules([first, second]), MONDAY) == ["T4", "T1", "T2", "T3", "T5"]
+    assert shifts(merge_schedules([second, first]), MONDAY) == ["T4", "T3", "T5", "T1", "T2"]
+
+
+def test_merge_has_every_event_once() -> None:
+    first: Schedule = make_schedule([MONDAY, TUESDAY], [(MONDAY, 480, "T1"), (TUESDAY, 480, "T2")])
+    second: Schedule = make_schedule([MONDAY], [(MONDAY, 480, "T3")])
+
+    merged: Schedule = merge_schedules([first, second])
+
+    assert sorted(map(id, merged.get_events())) == sorted(map(id, first.get_events() + second.get_events()))
+
+
+def test_merge_of_no_schedules_is_empty() -> None:
+    merged: Schedule = merge_schedules([])
+
+    assert merged.weekdays == []
+    assert merged.get_events() == []
+    assert merged.get_as_dict() == {}
+
+
+def test_merge_of_a_single_schedule_is_a_copy() -> None:
+    schedule: Schedule = make_schedule([MONDAY, TUESDAY], [(MONDAY, 600, "T1"), (MONDAY, 480, "T2")])
+
+    merged: Schedule = merge_schedules([schedule])
+
+    assert merged is not schedule
+    assert merged.weekdays == [MONDAY, TUESDAY]
+    assert shifts(merged, MONDAY) == ["T2", "T1"]
+    assert shifts(merged, TUESDAY) == []
+
+    merged.add_event(ScheduleEvent.build("Unidade Curricular Teste [Gualtar - Edificio 1 - 0.01] T3", 700, 60, MONDAY))
+    assert len(schedule.get_events()) == 2
+
+
+def test_merged_schedule_is_indexed() -> None:
+    first: Schedule = make_schedule([MONDAY], [(MONDAY, 480, "T1"), (MONDAY, 510, "TP1")])
+    second: Schedule = make_schedule([MONDAY], [(MONDAY, 900, "PL1")])
+
+    merged: Schedule = merge_schedules([first, second])
+
+    assert shifts(merged.filter({"unidade curricular teste": ["PL1"]}), MONDAY) == ["PL1"]
+    assert len(merged.get_collisions(MONDAY)) == 1
+
+
+def test_get_as_dict_lists_each_event_on_its_own_weekday() -> None:
+    schedule: Schedule = make_schedule([MONDAY, TUESDAY, WEDNESDAY], [(MONDAY, 480, "T1"), (TUESDAY, 480, "T2")])
+
+    as_dict: dict = schedule.get_as_dict()
+
+    assert [len(as_dict[weekday]) for weekday in (MONDAY, TUESDAY, WEDNESDAY)] == [1, 1, 0]
+    assert as_dict[MONDAY] is not as_dict[TUESDAY]
@@ -0,0 +1,112 @@
+import pstats
+import time
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.routes import debug
+from src.lib.profiling.profiler import ProfileFormat, profile_to_file
+
+TOKEN: str = "s3cret-token"
+
+
+def busy(seconds: float) -> int:
+    """
+    Keeps the cpu busy for a while, so the sampler has something to sample.
+    """
+    deadline: float = time.process_time() + seconds
+    total: int = 0
+
+    while time.process_time() < deadline:
+        total += sum(range(1000))
+
+    return total
+
+
+def read_collapsed(path: Path) -> dict[tuple[str, ...], int]:
+    """
+    Parses a collapsed profile, a 'frame;frame;... count' line per stack.
+    """
+    stacks: dict[tuple[str, ...], int] = {}
+
+    line: str
+    for line in path.read_text().splitlines():
+        stack, _, count = line.rpartition(" ")
+        stacks[tuple(stack.split(";"))] = int(count)
+
+    return stacks
+
+
+@pytest.mark.parametrize("authorization", [None, "", f"Bearer {TOKEN}"])
+def test_check_admin_without_admin_token_is_not_found(
+        monkeypatch: pytest.MonkeyPatch,
+        authorization: Optional[str]) -> None:
+    monkeypatch.setattr(debug, "ADMIN_TOKEN", None)
+
+    with pytest.raises(HTTPException) as error:
+        debug.check_admin(authorization)
+
+    assert error.value.status_code == 404
+
+
+@pytest.mark.parametrize("authorization", [None, "", "Bearer wrong-token", f"Basic {TOKEN}", TOKEN, "Bearer "])
+def test_check_admin_with_wrong_token_is_forbidden(
+        monkeypatch: pytest.MonkeyPatch,
+        authorization: Optional[str]) -> None:
+    monkeypatch.setattr(debug, "ADMIN_TOKEN", TOKEN)
+
+    with pytest.raises(HTTPException) as error:
+        debug.check_admin(authorization)
+
+    assert error.value.status_code == 403
+
+
+@pytest.mark.parametrize("authorization", [f"Bearer {TOKEN}", f"bearer {TOKEN}"])
+def test_check_admin_with_admin_token_passes(monkeypatch: pytest.MonkeyPatch, authorization: str) -> None:
+    monkeypatch.setattr(debug, "ADMIN_TOKEN", TOKEN)
+
+    debug.check_admin(authorization)
+
+
+def test_profile_to_file_writes_collapsed_stacks(tmp_path: Path) -> None:
+    path: Path = tmp_path / "profile.txt"
+
+    with profile_to_file(str(path), ProfileFormat.COLLAPSED, interval=0.001):
+        busy(0.2)
+
+    stacks: dict[tuple[str, ...], int] = read_collapsed(path)
+
+    assert stacks
+    assert all(count > 0 for count in stacks.values())
+    assert any(frame.endswith(":busy") for stack in stacks for frame in stack)
+
+
+def test_profile_to_file_writes_pstats(tmp_path: Path) -> None:
+    path: Path = tmp_path / "profile.pstats"
+
+    with profile_to_file(str(path), ProfileFormat.PSTATS):
+        busy(0.01)
+
+    stats: pstats.Stats = pstats.Stats(str(path))
+
+    assert any(function == "busy" for _, _, function in stats.stats)
+
+
+@pytest.mark.parametrize("profile_format", list(ProfileFormat))
+def test_profile_to_file_writes_the_profile_when_the_body_raises(
+        tmp_path: Path,
+        profile_format: ProfileFormat) -> None:
+    path: Path = tmp_path / f"profile.{profile_format.value}"
+
+    with pytest.raises(ValueError, match="failed run"):
+        with profile_to_file(str(path), profile_format, interval=0.001):
+            busy(0.05)
+            raise ValueError("failed run")
+
+    if profile_format is ProfileFormat.PSTATS:
+        assert pstats.Stats(str(path)).stats
+
+    else:
+        assert read_collapsed(path)
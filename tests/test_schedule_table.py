@@ -0,0 +1,46 @@
+import pytest
+
+import src.lib.scraper.schedule_table as schedule_table
+from src.lib.scraper.schedule import ScheduleGroup
+from src.lib.scraper.schedule_table import ScheduleTable
+
+from benchmarks.utils import make_schedule_group
+
+pytestmark = pytest.mark.skipif(schedule_table.np is None, reason="the vectorized queries need NumPy")
+
+
+def make_table(seed: int) -> ScheduleTable:
+    groups: list[ScheduleGroup] = [
+        make_schedule_group(2, 12, shifts_per_type=4, seed=seed * 10 + i, course_name=f"Licenciatura {i}")
+        for i in range(3)
+    ]
+    return ScheduleTable.from_schedule_groups(*groups)
+
+
+def without_numpy(monkeypatch: pytest.MonkeyPatch, query):
+    with monkeypatch.context() as patch:
+        patch.setattr(schedule_table, "np", None)
+        return query()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_group_by_course_matches_python(monkeypatch: pytest.MonkeyPatch, seed: int) -> None:
+    table: ScheduleTable = make_table(seed)
+
+    assert list(table.group_by_course().items()) == list(without_numpy(monkeypatch, table.group_by_course).items())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_conflicts_match_python(monkeypatch: pytest.MonkeyPatch, seed: int) -> None:
+    table: ScheduleTable = make_table(seed)
+    conflicts: list[tuple[int, int]] = table.conflicts()
+
+    assert conflicts
+    assert conflicts == without_numpy(monkeypatch, table.conflicts)
+
+
+def test_vectorized_queries_of_an_empty_table() -> None:
+    table: ScheduleTable = ScheduleTable()
+
+    assert table.group_by_course() == {}
+    assert table.conflicts() == []
@@ -0,0 +1,44 @@
+import io
+
+import xlsxwriter
+from xlsxwriter.format import Format
+
+from src.lib.builder.xlsx.sheet_writer import XlsxSheetWriter
+from src.lib.scraper.event import ScheduleEvent, WEEKDAY_LABELS
+from src.lib.scraper.schedule import Schedule
+
+MONDAY, TUESDAY = WEEKDAY_LABELS[:2]
+LANES: int = 40  # Events happening at the same time on monday, past the 31 columns of the old letter scheme.
+
+
+def make_wide_schedule() -> Schedule:
+    schedule: Schedule = Schedule([MONDAY, TUESDAY])
+
+    lane: int
+    for lane in range(LANES):
+        schedule.add_event(ScheduleEvent.build(
+            body=f"Unidade Curricular {lane:02} [Gualtar - Edificio 1 - 0.01] T1", start=480, duration=120,
+            weekday=MONDAY
+        ))
+
+    schedule.add_event(ScheduleEvent.build(
+        body="Outra Unidade Curricular [Gualtar - Edificio 2 - 0.01] PL1", start=600, duration=60, weekday=TUESDAY
+    ))
+
+    return schedule
+
+
+def test_every_lane_column_is_sized() -> None:
+    workbook: xlsxwriter.Workbook = xlsxwriter.Workbook(io.BytesIO(), {"in_memory": True})
+    worksheet = workbook.add_worksheet()
+    formats: dict[tuple[str, str], Format] = {}
+
+    writer: XlsxSheetWriter = XlsxSheetWriter(
+        worksheet, make_wide_schedule(), lambda color, role: formats.setdefault((color, role), workbook.add_format())
+    )
+    writer.write({})
+    workbook.close()
+
+    assert writer.layout.column_counter == LANES + 1
+    assert sorted(worksheet.col_info) == list(range(LANES + 2))  # The time column and every lane.
+    assert all(info[0] == 23 for info in worksheet.col_info.values())